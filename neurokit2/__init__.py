@@ -2,32 +2,14 @@
 import datetime
 import platform
 
-# Dependencies
-import numpy as np
-import pandas as pd
-import scipy
-import sklearn
-import matplotlib
-
-# Export functions
-from .benchmark import *
-from .bio import *
-from .complexity import *
-from .data import *
-from .ecg import *
-from .eda import *
-from .eeg import *
-from .emg import *
-from .eog import *
-from .epochs import *
-from .events import *
-from .hrv import *
-from .misc import *
-from .ppg import *
-from .rsp import *
-from .signal import *
-from .stats import *
-from .microstates import *
+from ._exports import EXPORTS, SUBMODULES
+from ._lazy import attach
+
+
+# Export functions (loaded on first access)
+__getattr__, __dir__, __all__ = attach(
+    __name__, {name: "." + submodule for name, submodule in EXPORTS.items()}, submodules=SUBMODULES
+)
 
 
 # Info
@@ -106,6 +88,12 @@ def version(silent=False):
 
     """
     if silent is False:
+        import matplotlib
+        import numpy as np
+        import pandas as pd
+        import scipy
+        import sklearn
+
         print(
             "- OS: " + platform.system(),
             "(" + platform.architecture()[1] + " " + platform.architecture()[0] + ")",
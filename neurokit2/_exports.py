@@ -0,0 +1,222 @@
+"""Export table of the top-level NeuroKit namespace.
+
+This file is generated by ``invoke exports`` from the ``__all__`` of each submodule. Do not edit it
+by hand.
+"""
+
+SUBMODULES = [
+    "benchmark",
+    "bio",
+    "complexity",
+    "data",
+    "ecg",
+    "eda",
+    "eeg",
+    "emg",
+    "eog",
+    "epochs",
+    "events",
+    "hrv",
+    "microstates",
+    "misc",
+    "ppg",
+    "rsp",
+    "signal",
+    "stats",
+]
+
+EXPORTS = {
+    "benchmark_ecg_preprocessing": "benchmark",
+    "benchmark_ecg_speedup": "benchmark",
+    "bio_process": "bio",
+    "bio_analyze": "bio",
+    "complexity_embedding": "complexity",
+    "complexity_delay": "complexity",
+    "complexity_dimension": "complexity",
+    "complexity_optimize": "complexity",
+    "complexity_simulate": "complexity",
+    "complexity_r": "complexity",
+    "entropy_shannon": "complexity",
+    "entropy_approximate": "complexity",
+    "entropy_sample": "complexity",
+    "entropy_fuzzy": "complexity",
+    "entropy_multiscale": "complexity",
+    "fractal_dfa": "complexity",
+    "fractal_correlation": "complexity",
+    "fractal_mandelbrot": "complexity",
+    "complexity_se": "complexity",
+    "complexity_apen": "complexity",
+    "complexity_capen": "complexity",
+    "complexity_sampen": "complexity",
+    "complexity_fuzzyen": "complexity",
+    "complexity_mse": "complexity",
+    "complexity_fuzzymse": "complexity",
+    "complexity_cmse": "complexity",
+    "complexity_fuzzycmse": "complexity",
+    "complexity_rcmse": "complexity",
+    "complexity_fuzzyrcmse": "complexity",
+    "complexity_dfa": "complexity",
+    "fractal_mfdfa": "complexity",
+    "complexity_mfdfa": "complexity",
+    "complexity_d2": "complexity",
+    "complexity_plot": "complexity",
+    "transition_matrix": "complexity",
+    "transition_matrix_simulate": "complexity",
+    "read_acqknowledge": "data",
+    "data": "data",
+    "ecg_simulate": "ecg",
+    "ecg_simulate_batch": "ecg",
+    "ecg_clean": "ecg",
+    "ecg_findpeaks": "ecg",
+    "ecg_peaks": "ecg",
+    "ecg_segment": "ecg",
+    "ecg_process": "ecg",
+    "ecg_plot": "ecg",
+    "ecg_delineate": "ecg",
+    "ecg_rsp": "ecg",
+    "ecg_phase": "ecg",
+    "ecg_quality": "ecg",
+    "ecg_eventrelated": "ecg",
+    "ecg_intervalrelated": "ecg",
+    "ecg_analyze": "ecg",
+    "ECGPeakStream": "ecg",
+    "ecg_rate": "ecg",
+    "eda_simulate": "eda",
+    "eda_clean": "eda",
+    "eda_phasic": "eda",
+    "eda_findpeaks": "eda",
+    "eda_fixpeaks": "eda",
+    "eda_peaks": "eda",
+    "eda_process": "eda",
+    "eda_plot": "eda",
+    "eda_eventrelated": "eda",
+    "eda_intervalrelated": "eda",
+    "eda_analyze": "eda",
+    "eda_autocor": "eda",
+    "eda_changepoints": "eda",
+    "eda_sympathetic": "eda",
+    "mne_data": "eeg",
+    "mne_channel_add": "eeg",
+    "mne_channel_extract": "eeg",
+    "mne_to_df": "eeg",
+    "mne_to_dict": "eeg",
+    "eeg_rereference": "eeg",
+    "eeg_gfp": "eeg",
+    "eeg_diss": "eeg",
+    "eeg_badchannels": "eeg",
+    "emg_simulate": "emg",
+    "emg_clean": "emg",
+    "emg_amplitude": "emg",
+    "emg_process": "emg",
+    "emg_plot": "emg",
+    "emg_activation": "emg",
+    "emg_eventrelated": "emg",
+    "emg_intervalrelated": "emg",
+    "emg_analyze": "emg",
+    "eog_rate": "eog",
+    "eog_clean": "eog",
+    "eog_features": "eog",
+    "eog_findpeaks": "eog",
+    "eog_process": "eog",
+    "eog_plot": "eog",
+    "eog_eventrelated": "eog",
+    "eog_intervalrelated": "eog",
+    "eog_analyze": "eog",
+    "epochs_create": "epochs",
+    "epochs_to_df": "epochs",
+    "epochs_to_array": "epochs",
+    "epochs_plot": "epochs",
+    "events_find": "events",
+    "events_plot": "events",
+    "events_to_mne": "events",
+    "hrv_time": "hrv",
+    "hrv_frequency": "hrv",
+    "hrv_nonlinear": "hrv",
+    "hrv_rsa": "hrv",
+    "hrv": "hrv",
+    "hrv_windowed": "hrv",
+    "hrv_context": "hrv",
+    "hrv_batch": "hrv",
+    "microstates_clean": "microstates",
+    "microstates_peaks": "microstates",
+    "microstates_static": "microstates",
+    "microstates_dynamic": "microstates",
+    "microstates_complexity": "microstates",
+    "microstates_segment": "microstates",
+    "microstates_classify": "microstates",
+    "microstates_plot": "microstates",
+    "microstates_findnumber": "microstates",
+    "listify": "misc",
+    "find_closest": "misc",
+    "find_consecutive": "misc",
+    "find_groups": "misc",
+    "as_vector": "misc",
+    "expspace": "misc",
+    "replace": "misc",
+    "NeuroKitWarning": "misc",
+    "ppg_simulate": "ppg",
+    "ppg_clean": "ppg",
+    "ppg_findpeaks": "ppg",
+    "ppg_rate": "ppg",
+    "ppg_process": "ppg",
+    "ppg_plot": "ppg",
+    "rsp_simulate": "rsp",
+    "rsp_clean": "rsp",
+    "rsp_findpeaks": "rsp",
+    "rsp_fixpeaks": "rsp",
+    "rsp_peaks": "rsp",
+    "rsp_phase": "rsp",
+    "rsp_amplitude": "rsp",
+    "rsp_process": "rsp",
+    "rsp_plot": "rsp",
+    "rsp_eventrelated": "rsp",
+    "rsp_rrv": "rsp",
+    "rsp_intervalrelated": "rsp",
+    "rsp_analyze": "rsp",
+    "rsp_rate": "rsp",
+    "signal_simulate": "signal",
+    "signal_binarize": "signal",
+    "signal_resample": "signal",
+    "signal_zerocrossings": "signal",
+    "signal_smooth": "signal",
+    "signal_filter": "signal",
+    "signal_psd": "signal",
+    "signal_distort": "signal",
+    "signal_interpolate": "signal",
+    "signal_detrend": "signal",
+    "signal_findpeaks": "signal",
+    "signal_fixpeaks": "signal",
+    "signal_formatpeaks": "signal",
+    "signal_rate": "signal",
+    "signal_merge": "signal",
+    "signal_period": "signal",
+    "signal_plot": "signal",
+    "signal_phase": "signal",
+    "signal_power": "signal",
+    "signal_synchrony": "signal",
+    "signal_autocor": "signal",
+    "signal_changepoints": "signal",
+    "signal_decompose": "signal",
+    "signal_recompose": "signal",
+    "signal_timefrequency": "signal",
+    "standardize": "stats",
+    "hdi": "stats",
+    "mad": "stats",
+    "cor": "stats",
+    "density": "stats",
+    "distance": "stats",
+    "rescale": "stats",
+    "fit_loess": "stats",
+    "fit_polynomial": "stats",
+    "fit_polynomial_findorder": "stats",
+    "fit_mixture": "stats",
+    "fit_error": "stats",
+    "fit_mse": "stats",
+    "fit_rmse": "stats",
+    "fit_r2": "stats",
+    "mutual_information": "stats",
+    "summary_plot": "stats",
+    "cluster": "stats",
+    "cluster_quality": "stats",
+    "cluster_findnumber": "stats",
+}
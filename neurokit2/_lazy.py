@@ -0,0 +1,105 @@
+"""Lazy loading of the NeuroKit namespace.
+
+The public functions of NeuroKit are exposed through module-level ``__getattr__`` (PEP 562) rather
+than imported eagerly, so that ``import neurokit2`` stays cheap and heavy dependencies (matplotlib,
+sklearn, scipy...) are only loaded once a function that needs them is first accessed.
+
+Run ``invoke exports`` to regenerate the top-level export table (``_exports.py``) after adding or
+removing a function from a submodule's ``__all__``.
+"""
+import importlib
+import os
+import pkgutil
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Package whose exported functions cannot be shadowed by their homonymous submodules."""
+
+    def __setattr__(self, name, value):
+        # The import system binds every freshly imported submodule to its parent package. As most
+        # submodules are named after the function they define (e.g., 'ecg_peaks'), that binding would
+        # hide the function. We skip it, and let __getattr__ return the function instead.
+        if isinstance(value, types.ModuleType) and name in self.__dict__.get("_lazy_exports", {}):
+            return
+        super().__setattr__(name, value)
+
+
+def attach(package, exports, submodules=None):
+    """Attach lazily-loaded exports to a package.
+
+    Parameters
+    ----------
+    package : str
+        The name of the package (i.e., ``__name__``).
+    exports : dict
+        A dictionary mapping the exported names to the (relative) module in which they are defined,
+        in the form ``".module"`` or ``".module:attribute"`` if the attribute is named differently.
+    submodules : list
+        Names of the submodules that can be accessed as attributes of the package.
+
+    Returns
+    -------
+    __getattr__ : function
+        The module-level ``__getattr__``.
+    __dir__ : function
+        The module-level ``__dir__``.
+    __all__ : list
+        The list of exported names.
+
+    """
+    if submodules is None:
+        submodules = []
+
+    module = sys.modules[package]
+    module.__class__ = _LazyModule
+    module.__dict__["_lazy_exports"] = exports
+
+    def __getattr__(name):
+        if name in exports:
+            path, _, attribute = exports[name].partition(":")
+            value = getattr(importlib.import_module(path, package), attribute or name)
+        elif name in submodules:
+            return importlib.import_module("." + name, package)
+        else:
+            raise AttributeError("module '" + package + "' has no attribute '" + name + "'")
+
+        # Cache it so that __getattr__ is not called anymore
+        module.__dict__[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(exports) | set(submodules))
+
+    return __getattr__, __dir__, list(exports)
+
+
+# =============================================================================
+# Generation of the export table
+# =============================================================================
+def _generate_exports():
+    """Write the export table of the top-level namespace from the ``__all__`` of each submodule."""
+    import neurokit2
+
+    path = os.path.dirname(os.path.abspath(__file__))
+    submodules = sorted(name for _, name, ispkg in pkgutil.iter_modules([path]) if ispkg)
+
+    lines = [
+        '"""Export table of the top-level NeuroKit namespace.',
+        "",
+        "This file is generated by ``invoke exports`` from the ``__all__`` of each submodule. Do not edit it",
+        "by hand.",
+        '"""',
+        "",
+        "SUBMODULES = [",
+    ]
+    lines += ['    "' + name + '",' for name in submodules]
+    lines += ["]", "", "EXPORTS = {"]
+    for name in submodules:
+        submodule = importlib.import_module("." + name, neurokit2.__name__)
+        lines += ['    "' + function + '": "' + name + '",' for function in submodule.__all__]
+    lines += ["}", ""]
+
+    with open(os.path.join(path, "_exports.py"), "w") as file:
+        file.write("\n".join(lines))
@@ -1,8 +1,11 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .benchmark_ecg import benchmark_ecg_preprocessing
 
-
-__all__ = [
-    "benchmark_ecg_preprocessing",
-]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "benchmark_ecg_preprocessing": ".benchmark_ecg",
+        "benchmark_ecg_speedup": ".benchmark_ecg",
+    },
+)
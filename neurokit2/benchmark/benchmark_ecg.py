@@ -1,20 +1,23 @@
 # -*- coding: utf-8 -*-
-import datetime
+import time
+import tracemalloc
 
 import numpy as np
 import pandas as pd
 
+from ..misc.parallel import _parallel_map
 from ..signal import signal_period
 
 
-def benchmark_ecg_preprocessing(function, ecg, rpeaks=None, sampling_rate=1000):
+def benchmark_ecg_preprocessing(function, ecg, rpeaks=None, sampling_rate=1000, n_jobs=1, n_runs=1, memory=True):
     """Benchmark ECG preprocessing pipelines.
 
     Parameters
     ----------
     function : function
         Must be a Python function which first argument is the ECG signal and which has a
-        ``sampling_rate`` argument.
+        ``sampling_rate`` argument. If ``n_jobs`` is not 1, it must be picklable (e.g., defined at the
+        top level of a module).
     ecg : pd.DataFrame or str
         The path to a folder where you have an `ECGs.csv` file or directly its loaded DataFrame.
         Such file can be obtained by running THIS SCRIPT (TO COMPLETE).
@@ -24,11 +27,24 @@ def benchmark_ecg_preprocessing(function, ecg, rpeaks=None, sampling_rate=1000):
     sampling_rate : int
         The sampling frequency of `ecg_signal` (in Hz, i.e., samples/second). Only used if ``ecgs``
         and ``rpeaks`` are single vectors.
+    n_jobs : int
+        The number of processes over which the recordings of a database are distributed. -1 uses as many
+        processes as available. Defaults to 1 (sequential).
+    n_runs : int
+        The number of runs over which the duration is averaged.
+    memory : bool
+        If True, the function is first run once (untimed, which also serves as a warm-up) while tracing
+        the memory allocations, in order to report its peak memory usage.
 
     Returns
     --------
     pd.DataFrame
-        A DataFrame containing the results of the benchmarking
+        A DataFrame containing the results of the benchmarking, i.e., for each recording, the
+        ``Duration`` of the function (in seconds), its ``Throughput`` (in samples per second), its
+        ``Memory`` peak (in MB), the scores of the detected R-peaks (see
+        ``benchmark_ecg_compareRpeaks()``), the ``Score`` (the average absolute difference between the
+        true and the detected heart periods, in seconds, over all the samples of the recording) and the
+        ``Error`` (if any).
 
 
     Examples
@@ -61,9 +77,73 @@ def benchmark_ecg_preprocessing(function, ecg, rpeaks=None, sampling_rate=1000):
         rpeaks = pd.read_csv(rpeaks + "/Rpeaks.csv")
 
     if isinstance(ecg, pd.DataFrame):
-        results = _benchmark_ecg_preprocessing_databases(function, ecg, rpeaks)
+        results = _benchmark_ecg_preprocessing_databases(
+            function, ecg, rpeaks, n_jobs=n_jobs, n_runs=n_runs, memory=memory
+        )
     else:
-        results = _benchmark_ecg_preprocessing(function, ecg, rpeaks, sampling_rate=sampling_rate)
+        results = _benchmark_ecg_preprocessing(
+            function, ecg, rpeaks, sampling_rate=sampling_rate, n_runs=n_runs, memory=memory
+        )
+
+    return results
+
+
+def benchmark_ecg_speedup(functions, ecg, sampling_rate=1000, reference=None, n_runs=3):
+    """Benchmark the execution time of ECG processing functions.
+
+    Runs each function on the same ECG signal and tabulates their speed relative to a reference
+    function, e.g., to compare a new implementation of an R-peak detector against the previous one.
+
+    Parameters
+    ----------
+    functions : dict
+        A dictionary of Python functions (named by the keys) which first argument is the ECG signal and
+        which have a ``sampling_rate`` argument.
+    ecg : Union[list, np.array, pd.Series]
+        The raw ECG channel.
+    sampling_rate : int
+        The sampling frequency of `ecg` (in Hz, i.e., samples/second).
+    reference : str
+        The name of the function against which the speedups are computed. If None, the first one is used.
+    n_runs : int
+        The number of runs over which the durations are averaged.
+
+    Returns
+    --------
+    pd.DataFrame
+        A DataFrame containing, for each function, its average ``Duration`` (in seconds), its
+        ``Speed`` (in seconds of signal per second of computation) and its ``Speedup`` (i.e., the
+        ratio between the duration of the reference and its own).
+
+
+    Examples
+    --------
+    >>> import neurokit2 as nk
+    >>>
+    >>> ecg = nk.ecg_simulate(duration=60, sampling_rate=500)
+    >>> cleaned = nk.ecg_clean(ecg, sampling_rate=500)
+    >>>
+    >>> functions = {method: lambda ecg, sampling_rate, method=method: nk.ecg_findpeaks(
+    ...                  ecg, sampling_rate=sampling_rate, method=method)
+    ...              for method in ["neurokit", "hamilton2002", "christov2004", "engzeemod2012"]}
+    >>> nk.benchmark_ecg_speedup(functions, cleaned, sampling_rate=500) #doctest: +SKIP
+
+    """
+    if reference is None:
+        reference = list(functions.keys())[0]
+
+    ecg = np.asarray(ecg)
+
+    durations = {}
+    for name, function in functions.items():
+        t0 = time.perf_counter()
+        for _ in range(n_runs):
+            function(ecg, sampling_rate=sampling_rate)
+        durations[name] = (time.perf_counter() - t0) / n_runs
+
+    results = pd.DataFrame({"Method": list(durations.keys()), "Duration": list(durations.values())})
+    results["Speed"] = len(ecg) / sampling_rate / results["Duration"]
+    results["Speedup"] = durations[reference] / results["Duration"]
 
     return results
 
@@ -71,46 +151,54 @@ def benchmark_ecg_preprocessing(function, ecg, rpeaks=None, sampling_rate=1000):
 # =============================================================================
 # Utils
 # =============================================================================
-def _benchmark_ecg_preprocessing_databases(function, ecgs, rpeaks):
+def _benchmark_ecg_preprocessing_databases(function, ecgs, rpeaks, n_jobs=1, n_runs=1, memory=True):
     """A wrapper over _benchmark_ecg_preprocessing when the input is a database."""
-    # Run algorithms
-    results = []
-    for participant in ecgs["Participant"].unique():
-        for database in ecgs[ecgs["Participant"] == participant]["Database"].unique():
-
-            # Extract the right slice of data
-            ecg_slice = ecgs[(ecgs["Participant"] == participant) & (ecgs["Database"] == database)]
-            rpeaks_slice = rpeaks[(rpeaks["Participant"] == participant) & (rpeaks["Database"] == database)]
-            sampling_rate = ecg_slice["Sampling_Rate"].unique()[0]
+    # Slice the recordings, ordered by participant (then database)
+    participants = {participant: i for i, participant in enumerate(ecgs["Participant"].unique())}
+    keys = list(ecgs[["Participant", "Database"]].drop_duplicates().itertuples(index=False, name=None))
+    keys = sorted(keys, key=lambda key: participants[key[0]])
+    ecg_slices = ecgs.groupby(["Participant", "Database"], sort=False)
+    rpeaks_slices = dict(list(rpeaks.groupby(["Participant", "Database"], sort=False)))
 
-            # Extract values
-            ecg = ecg_slice["ECG"].values
-            rpeak = rpeaks_slice["Rpeaks"].values
+    # Extract values (one recording at a time)
+    def _tasks():
+        for key in keys:
+            ecg_slice = ecg_slices.get_group(key)
+            rpeaks_slice = rpeaks_slices.get(key, pd.DataFrame({"Rpeaks": []}))
+            rate = ecg_slice["Sampling_Rate"].iloc[0]
+            yield function, ecg_slice["ECG"].values, rpeaks_slice["Rpeaks"].values, rate, n_runs, memory
 
-            # Run benchmark
-            result = _benchmark_ecg_preprocessing(function, ecg, rpeak, sampling_rate)
+    # Run benchmark
+    results = list(_parallel_map(_benchmark_ecg_preprocessing, _tasks(), n_jobs=n_jobs, processes=True))
 
-            # Add info
-            result["Participant"] = participant
-            result["Database"] = database
-
-            results.append(result)
+    # Add info
+    for (participant, database), result in zip(keys, results):
+        result["Participant"] = participant
+        result["Database"] = database
 
     return pd.concat(results)
 
 
-def _benchmark_ecg_preprocessing(function, ecg, rpeak, sampling_rate=1000):
+def _benchmark_ecg_preprocessing(function, ecg, rpeak, sampling_rate=1000, n_runs=1, memory=True):
     # Apply function
-    t0 = datetime.datetime.now()
     try:
-        found_rpeaks = function(ecg, sampling_rate=sampling_rate)
-        duration = (datetime.datetime.now() - t0).total_seconds()
+        # Untimed run (also a warm-up), tracing the memory allocations
+        peak_memory = _benchmark_ecg_memory(function, ecg, sampling_rate) if memory else np.nan
+
+        t0 = time.perf_counter()
+        for _ in range(n_runs):
+            found_rpeaks = function(ecg, sampling_rate=sampling_rate)
+        duration = (time.perf_counter() - t0) / n_runs
     # In case of failure
     except Exception as error:  # pylint: disable=broad-except
+        scores = {key: [np.nan] for key in ["TP", "FP", "FN", "Sensitivity", "PPV", "F1", "Timing_Error"]}
         return pd.DataFrame(
             {
                 "Sampling_Rate": [sampling_rate],
                 "Duration": [np.nan],
+                "Throughput": [np.nan],
+                "Memory": [np.nan],
+                **scores,
                 "Score": [np.nan],
                 "Recording_Length": [len(ecg) / sampling_rate / 60],
                 "Error": str(error),
@@ -118,12 +206,16 @@ def _benchmark_ecg_preprocessing(function, ecg, rpeak, sampling_rate=1000):
         )
 
     # Compare R peaks
-    score, error = benchmark_ecg_compareRpeaks(rpeak, found_rpeaks, sampling_rate=sampling_rate)
+    scores = benchmark_ecg_compareRpeaks(rpeak, found_rpeaks, sampling_rate=sampling_rate)
+    score, error = _benchmark_ecg_score(rpeak, found_rpeaks, sampling_rate=sampling_rate)
 
     return pd.DataFrame(
         {
             "Sampling_Rate": [sampling_rate],
             "Duration": [duration],
+            "Throughput": [len(ecg) / duration if duration > 0 else np.nan],
+            "Memory": [peak_memory],
+            **{key: [value] for key, value in scores.items()},
             "Score": [score],
             "Recording_Length": [len(ecg) / sampling_rate / 60],
             "Error": error,
@@ -131,21 +223,140 @@ def _benchmark_ecg_preprocessing(function, ecg, rpeak, sampling_rate=1000):
     )
 
 
+def _benchmark_ecg_memory(function, ecg, sampling_rate=1000):
+    """Peak memory (in MB) allocated while running the function."""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()  # Python >= 3.9
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        function(ecg, sampling_rate=sampling_rate)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return (peak - baseline) / 1024 ** 2
+
+
 # =============================================================================
 # Comparison methods
 # =============================================================================
-def benchmark_ecg_compareRpeaks(true_rpeaks, found_rpeaks, sampling_rate=250):
+def benchmark_ecg_compareRpeaks(true_rpeaks, found_rpeaks, sampling_rate=250, tolerance=0.05):
+    """Compare detected R-peaks with the true R-peaks.
+
+    Each true R-peak is matched with the closest detected R-peak if it is within ``tolerance`` seconds
+    and if that true R-peak is also the closest to it (so that each R-peak is matched at most once).
+    The matching relies on sorted searches, so that its cost only depends on the number of R-peaks
+    (and not on the length of the recording).
+
+    Parameters
+    ----------
+    true_rpeaks : Union[list, np.array]
+        The samples at which the true R-peaks occur.
+    found_rpeaks : Union[list, np.array]
+        The samples at which the detected R-peaks occur.
+    sampling_rate : int
+        The sampling frequency (in Hz, i.e., samples/second).
+    tolerance : float
+        The maximum distance (in seconds) between two matched R-peaks.
+
+    Returns
+    -------
+    dict
+        The number of true positives (``TP``, i.e., matched R-peaks), false positives (``FP``) and false
+        negatives (``FN``), the ``Sensitivity``, the positive predictive value (``PPV``), the ``F1``
+        score and the ``Timing_Error`` (the average absolute distance between matched R-peaks, in
+        seconds).
+
+    Examples
+    --------
+    >>> from neurokit2.benchmark.benchmark_ecg import benchmark_ecg_compareRpeaks
+    >>>
+    >>> scores = benchmark_ecg_compareRpeaks([100, 350, 600, 850], [102, 349, 500, 851], sampling_rate=250)
+    >>> scores["TP"], scores["FP"], scores["FN"]
+    (3, 1, 1)
+
+    """
+    true_rpeaks = np.sort(np.asarray(true_rpeaks, dtype=float))
+    found_rpeaks = np.sort(np.asarray(found_rpeaks, dtype=float))
+
+    if len(true_rpeaks) > 0 and len(found_rpeaks) > 0:
+        nearest_found = _benchmark_ecg_nearest(true_rpeaks, found_rpeaks)
+        nearest_true = _benchmark_ecg_nearest(found_rpeaks, true_rpeaks)
+        distance = np.abs(true_rpeaks - found_rpeaks[nearest_found])
+        matched = (nearest_true[nearest_found] == np.arange(len(true_rpeaks))) & (
+            distance <= tolerance * sampling_rate
+        )
+    else:
+        distance = np.zeros(len(true_rpeaks))
+        matched = np.zeros(len(true_rpeaks), dtype=bool)
+
+    tp = int(np.sum(matched))
+    fp = len(found_rpeaks) - tp
+    fn = len(true_rpeaks) - tp
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "TP": tp,
+            "FP": fp,
+            "FN": fn,
+            "Sensitivity": np.float64(tp) / (tp + fn),
+            "PPV": np.float64(tp) / (tp + fp),
+            "F1": np.float64(2 * tp) / (2 * tp + fp + fn),
+            "Timing_Error": np.mean(distance[matched]) / sampling_rate if tp > 0 else np.nan,
+        }
+
+
+def _benchmark_ecg_nearest(x, y):
+    """Index of the closest value of (sorted) y to each value of x (the first one in case of ties)."""
+    if len(y) == 1:
+        return np.zeros(len(x), dtype=int)
+    index = np.clip(np.searchsorted(y, x), 1, len(y) - 1)
+    index -= (x - y[index - 1]) <= (y[index] - x)
+    return index
+
+
+def _benchmark_ecg_score(true_rpeaks, found_rpeaks, sampling_rate=250):
+    """Average absolute difference between the true and the detected heart periods, interpolated over
+    all the samples (NaN, with an error message, if 3 R-peaks or less are detected).
+
+    The two periods are linearly interpolated between the R-peaks (and constant beyond them), so that
+    their difference is linear between the R-peaks of both sets. Its absolute value is thus summed
+    exactly over the samples between each pair of consecutive R-peaks, without interpolating all the
+    samples.
+
+    """
     # Failure to find sufficient R-peaks
     if len(found_rpeaks) <= 3:
         return np.nan, "R-peaks detected <= 3"
+    if len(true_rpeaks) <= 3:
+        return np.nan, "None"
 
+    true_rpeaks = np.asarray(true_rpeaks)
+    found_rpeaks = np.asarray(found_rpeaks)
     length = np.max(np.concatenate([true_rpeaks, found_rpeaks]))
 
-    true_interpolated = signal_period(
-        true_rpeaks, sampling_rate=sampling_rate, desired_length=length, interpolation_method="linear"
-    )
-    found_interpolated = signal_period(
-        found_rpeaks, sampling_rate=sampling_rate, desired_length=length, interpolation_method="linear"
-    )
+    # Difference between the periods at each R-peak (and at the first sample)
+    x = np.unique(np.concatenate([[0], true_rpeaks, found_rpeaks]))
+    found_period = np.interp(x, found_rpeaks, signal_period(found_rpeaks, sampling_rate=sampling_rate))
+    true_period = np.interp(x, true_rpeaks, signal_period(true_rpeaks, sampling_rate=sampling_rate))
+    difference = found_period - true_period
+
+    # Sum of |difference[i] + slope * j| over the samples j = 0, ..., n - 1 of each segment
+    n = np.diff(x)
+    slope = np.diff(difference) / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = -difference[:-1] / slope
+    # Number of samples before the sign change (on which the difference has the sign of the first one)
+    before = np.where(slope > 0, np.ceil(root), np.floor(root) + 1)
+    before = np.where(slope == 0, n, np.clip(before, 0, n))
+    sign = np.where(slope > 0, -1, np.where((slope == 0) & (difference[:-1] < 0), -1, 1))
+
+    def cumulative(j):
+        return j * difference[:-1] + slope * j * (j - 1) / 2
+
+    total = np.sum(sign * (2 * cumulative(before) - cumulative(n)))
 
-    return np.mean(np.abs(found_interpolated - true_interpolated)), "None"
+    return total / length, "None"
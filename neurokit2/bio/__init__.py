@@ -1,7 +1,11 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .bio_analyze import bio_analyze
-from .bio_process import bio_process
 
-
-__all__ = ["bio_process", "bio_analyze"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "bio_process": ".bio_process",
+        "bio_analyze": ".bio_analyze",
+    },
+)
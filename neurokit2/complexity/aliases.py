@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Aliases of the complexity functions with preset arguments."""
+import functools
+
+from .complexity_optimize import complexity_optimize
+from .entropy_approximate import entropy_approximate
+from .entropy_multiscale import entropy_multiscale
+from .fractal_dfa import fractal_dfa
+
+
+complexity_capen = functools.partial(entropy_approximate, corrected=True)
+
+complexity_fuzzymse = functools.partial(entropy_multiscale, fuzzy=True)
+complexity_cmse = functools.partial(entropy_multiscale, composite=True)
+complexity_fuzzycmse = functools.partial(entropy_multiscale, composite=True, fuzzy=True)
+complexity_rcmse = functools.partial(entropy_multiscale, refined=True)
+complexity_fuzzyrcmse = functools.partial(entropy_multiscale, refined=True, fuzzy=True)
+
+fractal_mfdfa = functools.partial(fractal_dfa, multifractal=True)
+
+complexity_plot = functools.partial(complexity_optimize, show=True)
@@ -3,7 +3,7 @@
 from .utils import _get_r, _phi, _phi_divide
 
 
-def entropy_fuzzy(signal, delay=1, dimension=2, r="default", **kwargs):
+def entropy_fuzzy(signal, delay=1, dimension=2, r="default", block_size=None, n_jobs=1, **kwargs):
     """Fuzzy entropy (FuzzyEn)
 
     Python implementations of the fuzzy entropy (FuzzyEn) of a signal.
@@ -25,6 +25,14 @@ def entropy_fuzzy(signal, delay=1, dimension=2, r="default", **kwargs):
     r : float
         Tolerance (i.e., filtering level - max absolute difference between segments). If 'default',
         will be set to 0.2 times the standard deviation of the signal (for dimension = 2).
+    block_size : int
+        The similarities between the embedded vectors are computed by blocks of ``block_size`` vectors
+        (against all the others), which bounds the memory used (about ``8 * block_size * len(signal)``
+        bytes per block). If None (default), the blocks take about 64 MB. The result does not depend
+        on it.
+    n_jobs : int
+        The number of threads over which the blocks are computed. -1 uses as many threads as
+        available. Defaults to 1 (sequential).
     **kwargs
         Other arguments.
 
@@ -47,6 +55,16 @@ def entropy_fuzzy(signal, delay=1, dimension=2, r="default", **kwargs):
 
     """
     r = _get_r(signal, r=r, dimension=dimension)
-    phi = _phi(signal, delay=delay, dimension=dimension, r=r, approximate=False, fuzzy=True, **kwargs)
+    phi = _phi(
+        signal,
+        delay=delay,
+        dimension=dimension,
+        r=r,
+        approximate=False,
+        fuzzy=True,
+        block_size=block_size,
+        n_jobs=n_jobs,
+        **kwargs
+    )
 
     return _phi_divide(phi)
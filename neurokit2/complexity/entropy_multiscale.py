@@ -2,12 +2,22 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from ..misc.parallel import _parallel_map
 from .entropy_sample import entropy_sample
-from .utils import _get_coarsegrained, _get_coarsegrained_rolling, _get_r, _get_scale, _phi, _phi_divide
+from .utils import _get_coarsegrained_cumulative, _get_r, _get_scale, _phi, _phi_divide
 
 
 def entropy_multiscale(
-    signal, scale="default", dimension=2, r="default", composite=False, refined=False, fuzzy=False, show=False, **kwargs
+    signal,
+    scale="default",
+    dimension=2,
+    r="default",
+    composite=False,
+    refined=False,
+    fuzzy=False,
+    show=False,
+    n_jobs=1,
+    **kwargs
 ):
     """Multiscale entropy (MSE) and its Composite (CMSE), Refined (RCMSE) or fuzzy version.
 
@@ -44,6 +54,9 @@ def entropy_multiscale(
         Returns the fuzzy (composite) multiscale entropy (FuzzyMSE, FuzzyCMSE or FuzzyRCMSE).
     show : bool
         Show the entropy values for each scale factor.
+    n_jobs : int
+        The number of threads over which the coarse-grained time series (of all scale factors) are
+        distributed. -1 uses as many threads as available. Defaults to 1 (sequential).
     **kwargs
         Optional arguments.
 
@@ -105,6 +118,7 @@ def entropy_multiscale(
         fuzzy=fuzzy,
         refined=refined,
         show=show,
+        n_jobs=n_jobs,
         **kwargs
     )
 
@@ -113,27 +127,54 @@ def entropy_multiscale(
 # Internal
 # =============================================================================
 def _entropy_multiscale(
-    signal, scale="default", dimension=2, r="default", composite=False, fuzzy=False, refined=False, show=False, **kwargs
+    signal,
+    scale="default",
+    dimension=2,
+    r="default",
+    composite=False,
+    fuzzy=False,
+    refined=False,
+    show=False,
+    n_jobs=1,
+    **kwargs
 ):
 
-    r = _get_r(signal, r=r, dimension=dimension)
+    signal = np.asarray(signal, dtype=np.float64)
+    r = _get_r(signal, r=r, dimension=dimension)  # Computed once, for all the scale factors
     scale_factors = _get_scale(signal, scale=scale, dimension=dimension)
 
-    # Initalize mse vector
-    mse = np.full(len(scale_factors), np.nan)
-    for i, tau in enumerate(scale_factors):
+    if refined is True:
+        # Refined Composite MSE: phi of each coarse-grained time series
+        def entropy(y):
+            return _phi(y, delay=1, dimension=dimension, r=r, fuzzy=fuzzy, approximate=False, **kwargs)
+
+    else:
+        # Regular and Composite MSE: sample entropy of each coarse-grained time series
+        def entropy(y):
+            return entropy_sample(y, delay=1, dimension=dimension, r=r, fuzzy=fuzzy, **kwargs)
 
-        # Regular MSE
-        if refined is False and composite is False:
-            mse[i] = _entropy_multiscale_mse(signal, tau, dimension, r, fuzzy, **kwargs)
+    # All the coarse-grained time series (of all scale factors) are computed in the same pool, by
+    # groups of tasks (so as not to hold all the coarse-grained time series at once)
+    tasks = _entropy_multiscale_tasks(signal, scale_factors, dimension, composite=composite or refined)
 
-        # Composite MSE
-        elif refined is False and composite is True:
-            mse[i] = _entropy_multiscale_cmse(signal, tau, dimension, r, fuzzy, **kwargs)
+    def run(i, y):
+        return i, entropy(y)
 
-        # Refined Composite MSE
+    values = [[] for _ in scale_factors]
+    for i, value in _parallel_map(run, tasks, n_jobs=n_jobs):
+        values[i].append(value)
+
+    # Initalize mse vector
+    mse = np.full(len(scale_factors), np.nan)
+    for i, value in enumerate(values):
+        if len(value) == 0:
+            continue
+        if refined is True:
+            # Average all phi of the same dimension, then divide, then log
+            phi_ = np.array(value)
+            mse[i] = _phi_divide([np.mean(phi_[:, 0]), np.mean(phi_[:, 1])])
         else:
-            mse[i] = _entropy_multiscale_rcmse(signal, tau, dimension, r, fuzzy, **kwargs)
+            mse[i] = np.mean(value)
 
     if show is True:
         plt.plot(scale_factors, mse)
@@ -148,38 +189,11 @@ def _entropy_multiscale(
     return np.trapz(mse) / len(mse)
 
 
-# =============================================================================
-# Methods
-# =============================================================================
-def _entropy_multiscale_mse(signal, tau, dimension, r, fuzzy, **kwargs):
-    y = _get_coarsegrained(signal, tau)
-    if len(y) < 10 ** dimension:  # Compute only if enough values (Liu et al., 2012)
-        return np.nan
-
-    return entropy_sample(y, delay=1, dimension=dimension, r=r, fuzzy=fuzzy, **kwargs)
-
-
-def _entropy_multiscale_cmse(signal, tau, dimension, r, fuzzy, **kwargs):
-    y = _get_coarsegrained_rolling(signal, tau)
-    if y.size < 10 ** dimension:  # Compute only if enough values (Liu et al., 2012)
-        return np.nan
-
-    mse_y = np.full(len(y), np.nan)
-    for i in np.arange(len(y)):
-        mse_y[i] = entropy_sample(y[i, :], delay=1, dimension=dimension, r=r, fuzzy=fuzzy, **kwargs)
-
-    return np.mean(mse_y)
-
-
-def _entropy_multiscale_rcmse(signal, tau, dimension, r, fuzzy, **kwargs):
-    y = _get_coarsegrained_rolling(signal, tau)
-    if y.size < 10 ** dimension:  # Compute only if enough values (Liu et al., 2012)
-        return np.nan
-
-    # Get phi for all kth coarse-grained time series
-    phi_ = np.full([len(y), 2], np.nan)
-    for i in np.arange(len(y)):
-        phi_[i] = _phi(y[i, :], delay=1, dimension=dimension, r=r, fuzzy=fuzzy, approximate=False, **kwargs)
-
-    # Average all phi of the same dimension, then divide, then log
-    return _phi_divide([np.mean(phi_[:, 0]), np.mean(phi_[:, 1])])
+def _entropy_multiscale_tasks(signal, scale_factors, dimension, composite=False):
+    """Coarse-grained time series of each scale factor (all of them if composite), with its index."""
+    for i, y in _get_coarsegrained_cumulative(signal, scale_factors, rolling=composite):
+        # Compute only if enough values (Liu et al., 2012)
+        if np.sum([len(row) for row in y]) < 10 ** dimension:
+            continue
+        for row in y:
+            yield i, row
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import matplotlib.pyplot as plt
 import numpy as np
-import sklearn.metrics.pairwise
 
 from .complexity_embedding import complexity_embedding
 
@@ -71,14 +70,13 @@ def fractal_correlation(signal, delay=1, dimension=2, r=64, show=False):
 
     """
     embedded = complexity_embedding(signal, delay=delay, dimension=dimension)
-    dist = sklearn.metrics.pairwise.euclidean_distances(embedded)
 
-    r_vals = _fractal_correlation_get_r(r, signal, dist)
+    r_vals = _fractal_correlation_get_r(r, signal, embedded)
 
-    r_vals, corr = _fractal_correlation(signal, r_vals, dist)
+    r_vals, corr = _fractal_correlation(signal, r_vals, embedded)
 
     # Corr_Dim method: https://github.com/jcvasquezc/Corr_Dim
-    # r_vals, corr = _fractal_correlation_Corr_Dim(embedded, r_vals, dist)
+    # r_vals, corr = _fractal_correlation_Corr_Dim(embedded, r_vals)
 
     # Compute trend
     if len(corr) == 0:
@@ -95,16 +93,16 @@ def fractal_correlation(signal, delay=1, dimension=2, r=64, show=False):
 # =============================================================================
 # Methods
 # =============================================================================
-def _fractal_correlation(signal, r_vals, dist):
+def _fractal_correlation(signal, r_vals, embedded):
     """References
     -----------
     - `nolds <https://github.com/CSchoel/nolds/blob/master/nolds/measures.py>`_
     """
     n = len(signal)
 
-    corr = np.zeros(len(r_vals))
-    for i, r in enumerate(r_vals):
-        corr[i] = 1 / (n * (n - 1)) * np.sum(dist < r)
+    # Number of elements of the distance matrix lower than r (both triangles, and the diagonal)
+    count = 2 * _fractal_correlation_count(embedded, r_vals) + len(embedded) * (r_vals > 0)
+    corr = 1 / (n * (n - 1)) * count
 
     # filter zeros from csums
     nonzero = np.nonzero(corr)[0]
@@ -114,19 +112,17 @@ def _fractal_correlation(signal, r_vals, dist):
     return r_vals, corr
 
 
-def _fractal_correlation_Corr_Dim(embedded, r_vals, dist):
+def _fractal_correlation_Corr_Dim(embedded, r_vals):
     """References
     -----------
     - `Corr_Dim <https://github.com/jcvasquezc/Corr_Dim>`_
     """
-    ED = dist[np.triu_indices_from(dist, k=1)]
+    # Pairs closer than r, but not at the same position (i.e., closer than the smallest float)
+    count = _fractal_correlation_count(embedded, np.append(r_vals, np.nextafter(0, 1)))
+    count = count[:-1] - count[-1] * (r_vals > 0)
 
     Npairs = (len(embedded[1, :])) * ((len(embedded[1, :]) - 1))
-    corr = np.zeros(len(r_vals))
-
-    for i, r in enumerate(r_vals):
-        N = np.where(((ED < r) & (ED > 0)))
-        corr[i] = len(N[0]) / Npairs
+    corr = count / Npairs
 
     omit_pts = 1
     k1 = omit_pts
@@ -140,7 +136,7 @@ def _fractal_correlation_Corr_Dim(embedded, r_vals, dist):
 # =============================================================================
 # Utilities
 # =============================================================================
-def _fractal_correlation_get_r(r, signal, dist):
+def _fractal_correlation_get_r(r, signal, embedded):
     if isinstance(r, str):
         if r == "nolds":
             sd = np.std(signal, ddof=1)
@@ -150,7 +146,8 @@ def _fractal_correlation_get_r(r, signal, dist):
             r_vals = np.array([min_r * (factor ** i) for i in range(r_n + 1)])
 
         elif r == "Corr_Dim":
-            r_min, r_max = np.min(dist[np.where(dist > 0)]), np.exp(np.floor(np.log(np.max(dist))))
+            r_min, r_max = _fractal_correlation_range(embedded)
+            r_max = np.exp(np.floor(np.log(r_max)))
 
             n_r = np.int(np.floor(np.log(r_max / r_min))) + 1
 
@@ -158,17 +155,71 @@ def _fractal_correlation_get_r(r, signal, dist):
             r_vals = r_max * np.exp(ones * np.arange(n_r) - ones)
 
         elif r == "boon2008":
-            r_min, r_max = np.min(dist[np.where(dist > 0)]), np.max(dist)
+            r_min, r_max = _fractal_correlation_range(embedded)
             r_vals = r_min + np.arange(1, 65) * ((r_max - r_min) / 64)
 
-    if isinstance(r, int):
-        dist_range = np.max(dist) - np.min(dist)
-        r_min, r_max = (np.min(dist) + 0.025 * dist_range), (np.min(dist) + 0.5 * dist_range)
+    elif isinstance(r, int):
+        # The smallest distance is that of each vector to itself
+        dist_min, dist_max = 0.0, _fractal_correlation_range(embedded)[1]
+        dist_range = dist_max - dist_min
+        r_min, r_max = (dist_min + 0.025 * dist_range), (dist_min + 0.5 * dist_range)
         r_vals = np.exp2(np.linspace(np.log2(r_min), np.log2(r_max), r, endpoint=True))
 
+    else:
+        r_vals = np.asarray(r, dtype=float)
+
     return r_vals
 
 
+def _fractal_correlation_distances(embedded, block_size=None):
+    """Euclidean distances between all pairs of embedded vectors (i < j), by blocks of rows.
+
+    Only one block of the distance matrix (by default, about 16 MB) is held at once.
+
+    """
+    n = len(embedded)
+    if block_size is None:
+        block_size = max(1, 2 ** 21 // n)
+
+    for start in range(0, n - 1, block_size):
+        rows = embedded[start : start + block_size]
+        columns = embedded[start + 1 :]
+        dist = np.zeros((len(rows), len(columns)))
+        for k in range(embedded.shape[1]):
+            dist += (rows[:, k, np.newaxis] - columns[np.newaxis, :, k]) ** 2
+        dist = np.sqrt(dist)
+        # The first rows of the block are also compared to the following rows of the block
+        yield dist[np.triu_indices(len(rows), m=len(columns))]
+
+
+def _fractal_correlation_count(embedded, r_vals, block_size=None):
+    """Number of pairs of embedded vectors (i < j) whose distance is lower than each of r_vals.
+
+    The distances are binned once (by blocks) into the intervals between the sorted radiuses, whose
+    cumulative counts give the number of pairs below each radius.
+
+    """
+    order = np.argsort(r_vals)
+    bins = np.zeros(len(r_vals) + 1, dtype=np.int64)
+    for dist in _fractal_correlation_distances(embedded, block_size=block_size):
+        bins += np.bincount(np.searchsorted(r_vals[order], dist, side="right"), minlength=len(bins))
+
+    count = np.zeros(len(r_vals))
+    count[order] = np.cumsum(bins)[:-1]
+    return count
+
+
+def _fractal_correlation_range(embedded, block_size=None):
+    """Smallest non-zero and largest distances between the embedded vectors (from the differences of
+    their coordinates, which are more accurate than the dot products of ``euclidean_distances()``)."""
+    dist_min, dist_max = np.inf, 0.0
+    for dist in _fractal_correlation_distances(embedded, block_size=block_size):
+        if np.any(dist > 0):
+            dist_min = min(dist_min, np.min(dist[dist > 0]))
+            dist_max = max(dist_max, np.max(dist))
+    return dist_min, dist_max
+
+
 def _fractal_correlation_plot(r_vals, corr, d2):
     fit = 2 ** np.polyval(d2, np.log2(r_vals))
     plt.loglog(r_vals, corr, "bo")
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import functools
+
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -77,6 +79,7 @@ def fractal_dfa(signal, windows="default", overlap=True, integrate=True, order=1
 
     """
     # Sanity checks
+    signal = np.asarray(signal, dtype=float)
     n = len(signal)
     windows = _fractal_dfa_findwindows(n, windows)
 
@@ -153,7 +156,12 @@ def _fractal_dfa_findwindows(n, windows="default"):
 
 def _fractal_dfa_getwindow(signal, n, window, overlap=True):
     if overlap:
-        segments = np.array([signal[i : i + window] for i in np.arange(0, n - window, window // 2)])
+        # Segments starting every half window (views on the signal rather than copies)
+        step = window // 2
+        n_segments = len(np.arange(0, n - window, step))
+        segments = np.lib.stride_tricks.as_strided(
+            signal, shape=(n_segments, window), strides=(step * signal.strides[0], signal.strides[0]), writeable=False
+        )
     else:
         segments = signal[: n - (n % window)]
         segments = segments.reshape((signal.shape[0] // window, window))
@@ -161,29 +169,38 @@ def _fractal_dfa_getwindow(signal, n, window, overlap=True):
 
 
 def _fractal_dfa_trends(segments, window, order=1):
-    x = np.arange(window)
+    # Least-squares polynomial fit of all the segments at once
+    vandermonde, pseudoinverse = _fractal_dfa_vandermonde(window, order)
+    coefs = segments @ pseudoinverse.T
+    trends = coefs @ vandermonde.T
 
-    coefs = np.polyfit(x[:window], segments.T, order).T
+    return trends
 
-    # TODO: Could this be optimized? Something like np.polyval(x[:window], coefs)
-    trends = np.array([np.polyval(coefs[j], x) for j in np.arange(len(segments))])
 
-    return trends
+@functools.lru_cache(maxsize=256)
+def _fractal_dfa_vandermonde(window, order=1):
+    """Vandermonde matrix of a window and its pseudo-inverse (kept for the next calls)."""
+    vandermonde = np.vander(np.arange(window, dtype=float), order + 1)
+    pseudoinverse = np.linalg.pinv(vandermonde)
+    vandermonde.flags.writeable = False
+    pseudoinverse.flags.writeable = False
+    return vandermonde, pseudoinverse
 
 
 def _fractal_dfa_fluctuation(segments, trends, multifractal=False, q=2):
 
     detrended = segments - trends
+    # Mean square of each detrended segment (i.e., its variance, as the fit removes the mean)
+    var = np.einsum("ij,ij->i", detrended, detrended) / detrended.shape[1]
 
     if multifractal is True:
-        var = np.var(detrended, axis=1)
+        # All qs at once, from the same variances
         fluctuation = np.float_power(np.mean(np.float_power(var, q / 2), axis=1) / 2, 1 / q.T)
         fluctuation = np.mean(fluctuation)  # Average over qs (not sure of that!)
 
     else:
         # Compute Root Mean Square (RMS)
-        fluctuation = np.sum(detrended ** 2, axis=1) / detrended.shape[1]
-        fluctuation = np.sqrt(np.sum(fluctuation) / len(fluctuation))
+        fluctuation = np.sqrt(np.sum(var) / len(var))
 
     return fluctuation
 
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import numpy as np
+import sklearn.metrics
 import sklearn.neighbors
 
+from ..misc.parallel import _parallel_map
 from .complexity_embedding import complexity_embedding
 
 
@@ -10,7 +12,17 @@ from .complexity_embedding import complexity_embedding
 # =============================================================================
 
 
-def _phi(signal, delay=1, dimension=2, r="default", distance="chebyshev", approximate=True, fuzzy=False):
+def _phi(
+    signal,
+    delay=1,
+    dimension=2,
+    r="default",
+    distance="chebyshev",
+    approximate=True,
+    fuzzy=False,
+    block_size=None,
+    n_jobs=1,
+):
     """Common internal for `entropy_approximate` and `entropy_sample`.
 
     Adapted from `EntroPy <https://github.com/raphaelvallat/entropy>`_, check it out!
@@ -19,18 +31,24 @@ def _phi(signal, delay=1, dimension=2, r="default", distance="chebyshev", approx
     # Initialize phi
     phi = np.zeros(2)
 
-    embedded1, count1 = _get_embedded(
-        signal, delay, dimension, r, distance=distance, approximate=approximate, fuzzy=fuzzy
+    count1, count2 = _get_count_pair(
+        signal,
+        delay,
+        dimension,
+        r,
+        distance=distance,
+        approximate=approximate,
+        fuzzy=fuzzy,
+        block_size=block_size,
+        n_jobs=n_jobs,
     )
 
-    embedded2, count2 = _get_embedded(signal, delay, dimension + 1, r, distance=distance, approximate=True, fuzzy=fuzzy)
-
     if approximate is True:
-        phi[0] = np.mean(np.log(count1 / embedded1.shape[0]))
-        phi[1] = np.mean(np.log(count2 / embedded2.shape[0]))
+        phi[0] = np.mean(np.log(count1 / len(count1)))
+        phi[1] = np.mean(np.log(count2 / len(count2)))
     else:
-        phi[0] = np.mean((count1 - 1) / (embedded1.shape[0] - 1))
-        phi[1] = np.mean((count2 - 1) / (embedded2.shape[0] - 1))
+        phi[0] = np.mean((count1 - 1) / (len(count1) - 1))
+        phi[1] = np.mean((count2 - 1) / (len(count2) - 1))
     return phi
 
 
@@ -48,7 +66,17 @@ def _phi_divide(phi):
 # =============================================================================
 
 
-def _get_embedded(signal, delay=1, dimension=2, r="default", distance="chebyshev", approximate=True, fuzzy=False):
+def _get_embedded(
+    signal,
+    delay=1,
+    dimension=2,
+    r="default",
+    distance="chebyshev",
+    approximate=True,
+    fuzzy=False,
+    block_size=None,
+    n_jobs=1,
+):
     """Examples
     ----------
     >>> import neurokit2 as nk
@@ -77,7 +105,7 @@ def _get_embedded(signal, delay=1, dimension=2, r="default", distance="chebyshev
     else:
         # FuzzyEn: Remove the local baselines of vectors
         embedded -= np.mean(embedded, axis=1, keepdims=True)
-        count = _get_count_fuzzy(embedded, r=r, distance=distance, n=1)
+        count = _get_count_fuzzy(embedded, r=r, distance=distance, n=1, block_size=block_size, n_jobs=n_jobs)
 
     return embedded, count
 
@@ -85,22 +113,178 @@ def _get_embedded(signal, delay=1, dimension=2, r="default", distance="chebyshev
 # =============================================================================
 # Get Count
 # =============================================================================
+def _get_count_pair(
+    signal,
+    delay=1,
+    dimension=2,
+    r="default",
+    distance="chebyshev",
+    approximate=True,
+    fuzzy=False,
+    block_size=None,
+    n_jobs=1,
+):
+    """Neighbors counts of the embedded vectors of dimension m and m + 1.
+
+    For the Chebyshev distance, both are obtained at once with ``_get_count_chebyshev()``. The
+    vectors of dimension m are all those of the embedding if ``approximate`` is True, and all but the
+    last one otherwise (as in SampEn). ``block_size`` and ``n_jobs`` are passed to
+    ``_get_count_fuzzy()``.
+
+    """
+    if fuzzy is False and distance == "chebyshev":
+        count_all, count1, count2 = _get_count_chebyshev(signal, delay=delay, dimension=dimension, r=r)
+        if approximate is True:
+            count1 = count_all
+        return count1, count2
+
+    kwargs = {"distance": distance, "fuzzy": fuzzy, "block_size": block_size, "n_jobs": n_jobs}
+    _, count1 = _get_embedded(signal, delay, dimension, r, approximate=approximate, **kwargs)
+    _, count2 = _get_embedded(signal, delay, dimension + 1, r, approximate=True, **kwargs)
+    return count1, count2
+
+
 def _get_count(embedded, r, distance="chebyshev"):
     kdtree = sklearn.neighbors.KDTree(embedded, metric=distance)
     # Return the count
     return kdtree.query_radius(embedded, r, count_only=True).astype(np.float64)
 
 
-def _get_count_fuzzy(embedded, r, distance="chebyshev", n=1):
-    dist = sklearn.neighbors.DistanceMetric.get_metric(distance)
-    dist = dist.pairwise(embedded)
+def _get_count_chebyshev(signal, delay=1, dimension=2, r=0.2, blocksize=2 ** 16):
+    """Template counting for the Chebyshev distance, for the dimensions m and m + 1 at once.
+
+    The vectors are put in buckets of width r on their first coordinate, and sorted on their second
+    coordinate within each bucket. The candidate neighbors of each vector (within r on these two
+    coordinates) are thus two contiguous ranges of the sorted vectors: the following ones in its own
+    bucket, and those of the next bucket. The candidate pairs are then checked on all the coordinates
+    by blocks of ``blocksize`` pairs, and each pair close in dimension m is extended to the dimension
+    m + 1 by checking a single coordinate. The memory used is thus O(n), without any tree.
+
+    Returns the neighbors count (including the vector itself) of all the vectors of dimension m, of
+    all but the last one (as used by SampEn), and of the vectors of dimension m + 1. They are the same
+    as those of ``_get_embedded()``.
 
-    if n > 1:
-        sim = np.exp(-(dist ** n) / r)
+    >>> import neurokit2 as nk
+    >>>
+    >>> signal = nk.signal_simulate(duration=2, frequency=5)
+    >>> count_all, count1, count2 = _get_count_chebyshev(signal, delay=1, dimension=2, r=0.1)
+
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    n_all = len(signal) - (dimension - 1) * delay  # Vectors of dimension m
+    n = n_all - delay  # Vectors of dimension m + 1
+    if n < 1 or delay < 1:
+        raise ValueError(
+            "NeuroKit error: _get_count_chebyshev(): the signal is too short for this dimension and delay."
+        )
+
+    # Sorting key: bucket on the first coordinate, then second coordinate (spaced so that the
+    # buckets do not overlap)
+    if dimension == 1:
+        bucket = np.zeros(n_all)
+        key = signal[:n_all]
     else:
-        sim = np.exp(-dist / r)
+        first = signal[:n_all]
+        width = r * (1 + 1e-9) if r > 0 else 1.0
+        bucket = np.floor((first - np.min(first)) / width)
+        key = signal[delay : delay + n_all]
+    key = key - np.min(key)
+    spacing = 2 * (np.max(key) + 2 * r) or 1.0
+    z = bucket * spacing + key
+
+    order = np.argsort(z, kind="stable")
+    z = z[order]
+    tolerance = 1e-9 * r + 8 * np.spacing(np.max(np.abs(z)))  # The exact distances are checked below
+
+    # Candidates: following vectors of the same bucket, and vectors of the next bucket
+    position = np.arange(n_all)
+    starts = np.concatenate([position + 1, np.searchsorted(z, z + spacing - r - tolerance, side="left")])
+    ends = np.concatenate(
+        [
+            np.searchsorted(z, z + r + tolerance, side="right"),
+            np.searchsorted(z, z + spacing + r + tolerance, side="right"),
+        ]
+    )
+    owners = np.concatenate([position, position])
+    sizes = np.maximum(ends - starts, 0)
+    cumulative = np.concatenate([[0], np.cumsum(sizes)])
+    starts -= cumulative[:-1]  # So that the candidates of a block are at np.arange(...) + starts
+
+    # Coordinates of the sorted vectors (the last one being NaN for the vectors that cannot be extended)
+    coordinates = [signal[order + k * delay] for k in range(dimension)]
+    extension = np.full(n_all, np.nan)
+    extension[order < n] = signal[order[order < n] + dimension * delay]
+
+    count_all = np.ones(n_all)  # Each vector is its own neighbor
+    count2 = np.ones(n_all)
+    start = 0
+    while start < len(sizes):
+        end = max(start + 1, np.searchsorted(cumulative, cumulative[start] + blocksize, side="right") - 1)
+
+        # Pairs of sorted vectors (the candidate ranges start:end)
+        a = np.repeat(owners[start:end], sizes[start:end])
+        b = np.arange(cumulative[start], cumulative[end]) + np.repeat(starts[start:end], sizes[start:end])
+
+        # Close in dimension m
+        close = np.abs(coordinates[0][a] - coordinates[0][b]) <= r
+        for coordinate in coordinates[1:]:
+            close &= np.abs(coordinate[a] - coordinate[b]) <= r
+        a, b = a[close], b[close]
+        count_all += np.bincount(a, minlength=n_all) + np.bincount(b, minlength=n_all)
+
+        # Close in dimension m + 1
+        close = np.abs(extension[a] - extension[b]) <= r
+        a, b = a[close], b[close]
+        count2 += np.bincount(a, minlength=n_all) + np.bincount(b, minlength=n_all)
+
+        start = end
+
+    # Back to the original order
+    count_all[order] = count_all.copy()
+    count2[order] = count2.copy()
+    count2 = count2[:n]
+
+    # Without the last vector (that is its own neighbor)
+    embedded = complexity_embedding(signal, delay=delay, dimension=dimension)
+    count1 = count_all[:-1] - (np.max(np.abs(embedded[:-1] - embedded[-1]), axis=1) <= r)
+
+    return count_all, count1, count2
+
+
+def _get_count_fuzzy(embedded, r, distance="chebyshev", n=1, block_size=None, n_jobs=1):
+    """Sum of the fuzzy similarities of each vector to all the vectors.
+
+    The similarity matrix is computed by blocks of ``block_size`` rows (by default, about 64 MB per
+    block), possibly in a pool of ``n_jobs`` threads, rather than at once. Its rows are added in the
+    same order as when summing the whole matrix, so that the result is exactly the same.
+
+    """
+    metric = _get_distance_metric(distance)
+    if block_size is None:
+        block_size = max(1, 2 ** 23 // len(embedded))
+    blocks = [slice(i, i + block_size) for i in range(0, len(embedded), block_size)]
+
+    def similarity(block):
+        dist = metric.pairwise(embedded[block], embedded)
+        if n > 1:
+            return np.exp(-(dist ** n) / r)
+        return np.exp(-dist / r)
+
+    # At most one block per worker at once, to bound the memory
+    count = np.zeros(len(embedded))
+    for sim in _parallel_map(similarity, [(block,) for block in blocks], n_jobs=n_jobs, group=1):
+        for row in sim:
+            count += row
+
     # Return the count
-    return np.sum(sim, axis=0)
+    return count
+
+
+def _get_distance_metric(distance="chebyshev"):
+    try:
+        return sklearn.metrics.DistanceMetric.get_metric(distance)
+    except AttributeError:  # scikit-learn < 1.0
+        return sklearn.neighbors.DistanceMetric.get_metric(distance)
 
 
 # =============================================================================
@@ -164,6 +348,32 @@ def _get_coarsegrained_rolling(signal, scale=2):
     return coarsed
 
 
+def _get_coarsegrained_cumulative(signal, scale_factors, rolling=False):
+    """Coarse-grained time series of several scale factors, from a single cumulative sum.
+
+    Yields, for each scale factor, its index and the list of its coarse-grained time series: that of
+    ``_get_coarsegrained()``, or the rows of ``_get_coarsegrained_rolling()`` if ``rolling`` is True.
+    The mean of each window is obtained as the difference of the cumulative sum of the signal (extended
+    by repeating its last value) at its bounds, rather than by averaging the window.
+
+    >>> signal = [0, 2, 4, 6, 8, 10]
+    >>> coarsegrained = dict(_get_coarsegrained_cumulative(signal, scale_factors=[1, 2, 3], rolling=True))
+
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    n = len(signal)
+    padding = max([0] + [int(scale) - 1 for scale in scale_factors])
+    cumulative = np.concatenate([[0], np.cumsum(np.concatenate([signal, np.repeat(signal[-1:], padding)]))])
+
+    for i, scale in enumerate(scale_factors):
+        if scale in [0, 1]:
+            yield i, [signal]
+            continue
+        j = n // scale
+        offsets = range(scale) if rolling is True else [0]
+        yield i, [np.diff(cumulative[k : k + j * scale + 1 : scale]) / scale for k in offsets if j > 0]
+
+
 def _get_coarsegrained(signal, scale=2, force=False):
     """Extract coarse-grained time series.
 
@@ -1,7 +1,11 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .data import data
-from .read_acqknowledge import read_acqknowledge
 
-
-__all__ = ["read_acqknowledge", "data"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "read_acqknowledge": ".read_acqknowledge",
+        "data": ".data",
+    },
+)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
+import pandas as pd
 import scipy.signal
 
 from ..misc import as_vector
@@ -13,8 +14,9 @@ def ecg_clean(ecg_signal, sampling_rate=1000, method="neurokit"):
 
     Parameters
     ----------
-    ecg_signal : Union[list, np.array, pd.Series]
-        The raw ECG channel.
+    ecg_signal : Union[list, np.array, pd.Series, pd.DataFrame]
+        The raw ECG channel. Several leads can be passed as a 2D array or DataFrame of shape
+        (n_samples, n_leads), in which case they are all cleaned at once.
     sampling_rate : int
         The sampling frequency of `ecg_signal` (in Hz, i.e., samples/second).
         Defaults to 1000.
@@ -25,7 +27,8 @@ def ecg_clean(ecg_signal, sampling_rate=1000, method="neurokit"):
     Returns
     -------
     array
-        Vector containing the cleaned ECG signal.
+        Vector containing the cleaned ECG signal (or, if several leads were passed, array of the same
+        shape as the input, or DataFrame if a DataFrame was passed).
 
     See Also
     --------
@@ -58,8 +61,19 @@ def ecg_clean(ecg_signal, sampling_rate=1000, method="neurokit"):
     - Hamilton, Open Source ECG Analysis Software Documentation, E.P.Limited, 2002.
 
     """
+    # Several leads (one per column): filtered all at once along the time axis
+    if np.ndim(ecg_signal) == 2:
+        clean = _ecg_clean(np.asarray(ecg_signal, dtype=float).T, sampling_rate=sampling_rate, method=method).T
+        if isinstance(ecg_signal, pd.DataFrame):
+            clean = pd.DataFrame(clean, index=ecg_signal.index, columns=ecg_signal.columns)
+        return clean
+
     ecg_signal = as_vector(ecg_signal)
+    return _ecg_clean(ecg_signal, sampling_rate=sampling_rate, method=method)
+
 
+def _ecg_clean(ecg_signal, sampling_rate=1000, method="neurokit"):
+    """Clean the signal along its last axis."""
     method = method.lower()  # remove capitalised letters
     if method in ["nk", "nk2", "neurokit", "neurokit2"]:
         clean = _ecg_clean_nk(ecg_signal, sampling_rate)
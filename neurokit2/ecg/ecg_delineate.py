@@ -3,16 +3,17 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import scipy.signal
+import scipy.stats
 
 from ..epochs import epochs_create, epochs_to_df
 from ..signal import signal_findpeaks, signal_formatpeaks, signal_resample, signal_smooth, signal_zerocrossings
 from ..stats import standardize
 from .ecg_peaks import ecg_peaks
-from .ecg_segment import ecg_segment
+from .ecg_segment import _ecg_segment_heartbeats
 
 
 def ecg_delineate(
-    ecg_cleaned, rpeaks=None, sampling_rate=1000, method="peak", show=False, show_type="peaks", check=False
+    ecg_cleaned, rpeaks=None, sampling_rate=1000, method="peak", show=False, show_type="peaks", check=False, **kwargs
 ):
     """Delineate QRS complex.
 
@@ -28,8 +29,11 @@ def ecg_delineate(
 
     Parameters
     ----------
-    ecg_cleaned : Union[list, np.array, pd.Series]
-        The cleaned ECG channel as returned by `ecg_clean()`.
+    ecg_cleaned : Union[list, np.array, pd.Series, pd.DataFrame]
+        The cleaned ECG channel as returned by `ecg_clean()`. Several leads can be passed as a 2D array
+        or DataFrame of shape (n_samples, n_leads) (or a DataFrame with several "ECG_Clean" columns), in
+        which case each lead is delineated around the same R-peaks (detected on all the leads if
+        ``rpeaks`` is None, see `ecg_findpeaks()`).
     rpeaks : Union[list, np.array, pd.Series]
         The samples at which R-peaks occur. Accessible with the key "ECG_R_Peaks" in the info dictionary
         returned by `ecg_findpeaks()`.
@@ -46,6 +50,13 @@ def ecg_delineate(
         The type of delineated waves information showed in the plot.
     check : bool
         Defaults to False.
+    **kwargs
+        Other arguments passed to the delineation method. For the 'cwt' method, ``windowed=True`` only
+        computes the wavelet transform around the detected beats, so that the memory used depends on the
+        number of beats rather than on the length of the signal (the waves are the same, except for
+        the ones whose search region would start before the signal). For the 'dwt' method,
+        ``analysis_sampling_rate`` is the sampling rate at which the signal is analysed (by default, its own
+        sampling rate if it is 250 Hz times a power of two, and 2000 Hz otherwise).
 
     Returns
     -------
@@ -64,6 +75,10 @@ def ecg_delineate(
         A DataFrame of same length as the input signal in which occurences of
         peaks, onsets and offsets marked as "1" in a list of zeros.
 
+        If several leads are passed, ``waves`` contains the dictionary of each lead (accessible with the
+        name of the column, or its index for arrays), and the name of the lead is appended to the columns
+        of ``signals`` (e.g., "ECG_P_Peaks_II").
+
     See Also
     --------
     ecg_clean, signal_fixpeaks, ecg_peaks, signal_rate, ecg_process, ecg_plot
@@ -91,9 +106,11 @@ def ecg_delineate(
     # Sanitize input for ecg_cleaned
     if isinstance(ecg_cleaned, pd.DataFrame):
         cols = [col for col in ecg_cleaned.columns if "ECG_Clean" in col]
-        if cols:
+        if len(cols) == 1:
             ecg_cleaned = ecg_cleaned[cols[0]].values
-        else:
+        elif len(cols) > 1:
+            ecg_cleaned = ecg_cleaned[cols]
+        elif ecg_cleaned.shape[1] < 2:
             raise ValueError("NeuroKit error: ecg_delineate(): Wrong input, we couldn't extract" "cleaned signal.")
 
     elif isinstance(ecg_cleaned, dict):
@@ -114,13 +131,26 @@ def ecg_delineate(
     if isinstance(rpeaks, dict):
         rpeaks = rpeaks["ECG_R_Peaks"]
 
+    # Several leads (one per column): each lead is delineated around the same R-peaks
+    if np.ndim(ecg_cleaned) == 2:
+        return _ecg_delineate_leads(
+            ecg_cleaned,
+            rpeaks,
+            sampling_rate=sampling_rate,
+            method=method,
+            show=show,
+            show_type=show_type,
+            check=check,
+            **kwargs,
+        )
+
     method = method.lower()  # remove capitalised letters
     if method in ["peak", "peaks", "derivative", "gradient"]:
         waves = _ecg_delineator_peak(ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate)
     elif method in ["cwt", "continuous wavelet transform"]:
-        waves = _ecg_delineator_cwt(ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate)
+        waves = _ecg_delineator_cwt(ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate, **kwargs)
     elif method in ["dwt", "discrete wavelet transform"]:
-        waves = _dwt_ecg_delineator(ecg_cleaned, rpeaks, sampling_rate=sampling_rate)
+        waves = _dwt_ecg_delineator(ecg_cleaned, rpeaks, sampling_rate=sampling_rate, **kwargs)
 
     else:
         raise ValueError("NeuroKit error: ecg_delineate(): 'method' should be one of 'peak'," "'cwt' or 'dwt'.")
@@ -144,6 +174,31 @@ def ecg_delineate(
     return signals, waves
 
 
+def _ecg_delineate_leads(ecg_cleaned, rpeaks, sampling_rate=1000, **kwargs):
+    """Delineate each lead (column) of the signal, with the same R-peaks.
+
+    Leads whose QRS complexes point downwards (negative skewness, such as aVR) are flipped beforehand,
+    as for the detection of the R-peaks (see ``ecg_findpeaks()``). Returns a DataFrame in which the name
+    of the lead is appended to the name of each column, and a dict containing the waves of each lead.
+
+    """
+    if isinstance(ecg_cleaned, pd.DataFrame):
+        leads = list(ecg_cleaned.columns)
+        ecg_cleaned = ecg_cleaned.values
+    else:
+        leads = list(range(np.shape(ecg_cleaned)[1]))
+    ecg_cleaned = np.asarray(ecg_cleaned, dtype=float)
+    ecg_cleaned = ecg_cleaned * np.where(scipy.stats.skew(ecg_cleaned, axis=0) < 0, -1, 1)
+
+    signals = []
+    waves = {}
+    for i, lead in enumerate(leads):
+        signals_lead, waves[lead] = ecg_delineate(ecg_cleaned[:, i], rpeaks, sampling_rate=sampling_rate, **kwargs)
+        signals.append(signals_lead.add_suffix("_" + str(lead)))
+
+    return pd.concat(signals, axis=1), waves
+
+
 # =============================================================================
 # WAVELET METHOD (DWT)
 # =============================================================================
@@ -154,7 +209,7 @@ def _dwt_resample_points(peaks, sampling_rate, desired_sampling_rate):
     return peaks_resample
 
 
-def _dwt_ecg_delineator(ecg, rpeaks, sampling_rate, analysis_sampling_rate=2000):
+def _dwt_ecg_delineator(ecg, rpeaks, sampling_rate, analysis_sampling_rate=None):
     """Delinate ecg signal using discrete wavelet transforms.
 
     Parameters
@@ -167,7 +222,10 @@ def _dwt_ecg_delineator(ecg, rpeaks, sampling_rate, analysis_sampling_rate=2000)
     sampling_rate : int
         The sampling frequency of `ecg_signal` (in Hz, i.e., samples/second).
     analysis_sampling_rate : int
-        The sampling frequency for analysis (in Hz, i.e., samples/second).
+        The sampling frequency for analysis (in Hz, i.e., samples/second). If None (default), the signal is
+        analysed at its own sampling rate when it is a power-of-two multiple of 250 Hz for which all the
+        wavelet scales used are computed (i.e., 250, 500, 1000, 2000, 4000 or 8000 Hz), and resampled to
+        2000 Hz otherwise.
 
     Returns
     --------
@@ -175,8 +233,15 @@ def _dwt_ecg_delineator(ecg, rpeaks, sampling_rate, analysis_sampling_rate=2000)
         Dictionary of the points.
 
     """
+    max_degree = 9
+    if analysis_sampling_rate is None:
+        # The highest scale used is that of the T-peaks (3), shifted by the degree of the sampling rate
+        degree = np.log2(sampling_rate / 250)
+        native = degree >= 0 and degree == int(degree) and 3 + int(degree) < max_degree
+        analysis_sampling_rate = sampling_rate if native else 2000
+
     ecg = signal_resample(ecg, sampling_rate=sampling_rate, desired_sampling_rate=analysis_sampling_rate)
-    dwtmatr = _dwt_compute_multiscales(ecg, 9)
+    dwtmatr = _dwt_compute_multiscales(ecg, max_degree)
 
     # # only for debugging
     # for idx in [0, 1, 2, 3]:
@@ -227,91 +292,76 @@ def _dwt_delineate_tp_peaks(
 ):
     srch_bndry = int(0.5 * qrs_width * sampling_rate)
     degree_add = _dwt_compensate_degree(sampling_rate)
+    rpeaks = np.array(rpeaks, dtype=float)
 
-    tpeaks = []
-    for rpeak_ in rpeaks:
-        if np.isnan(rpeak_):
-            tpeaks.append(np.nan)
-            continue
-        # search for T peaks from R peaks
-        srch_idx_start = rpeak_ + srch_bndry
-        srch_idx_end = rpeak_ + 2 * int(rt_duration * sampling_rate)
-        dwt_local = dwtmatr[degree_tpeak + degree_add, srch_idx_start:srch_idx_end]
-        height = epsilon_T_weight * np.sqrt(np.mean(np.square(dwt_local)))
-
-        if len(dwt_local) == 0:
-            tpeaks.append(np.nan)
-            continue
+    # search for T peaks from R peaks
+    srch_idx_start = rpeaks + srch_bndry
+    srch_idx_end = rpeaks + 2 * int(rt_duration * sampling_rate)
+    idx_zero, scores, rows = _dwt_delineate_tp_peaks_candidates(
+        ecg, dwtmatr[degree_tpeak + degree_add], srch_idx_start, srch_idx_end, epsilon_weight=epsilon_T_weight
+    )
+    # This is the score assigned to each peak. The peak with the highest score will be selected.
+    scores = scores - (idx_zero / sampling_rate - (rt_duration - 0.5 * qrs_width))
+    tpeaks = _dwt_delineate_tp_peaks_select(idx_zero, scores, rows, srch_idx_start)
+
+    # search for P peaks from Rpeaks
+    srch_idx_start = rpeaks - 2 * int(p2r_duration * sampling_rate)
+    srch_idx_end = rpeaks - srch_bndry
+    idx_zero, scores, rows = _dwt_delineate_tp_peaks_candidates(
+        ecg, dwtmatr[degree_ppeak + degree_add], srch_idx_start, srch_idx_end, epsilon_weight=epsilon_P_weight
+    )
+    # Minus p2r because of the srch_idx_start
+    scores = scores - np.abs(idx_zero / sampling_rate - p2r_duration)
+    ppeaks = _dwt_delineate_tp_peaks_select(idx_zero, scores, rows, srch_idx_start)
 
-        ecg_local = ecg[srch_idx_start:srch_idx_end]
-        peaks, __ = scipy.signal.find_peaks(np.abs(dwt_local), height=height)
-        peaks = list(filter(lambda p: np.abs(dwt_local[p]) > 0.025 * max(dwt_local), peaks))  # pylint: disable=W0640
-        if dwt_local[0] > 0:  # just append
-            peaks = [0] + peaks
-
-        # detect morphology
-        candidate_peaks = []
-        candidate_peaks_scores = []
-        for idx_peak, idx_peak_nxt in zip(peaks[:-1], peaks[1:]):
-            correct_sign = dwt_local[idx_peak] > 0 and dwt_local[idx_peak_nxt] < 0  # pylint: disable=R1716
-            if correct_sign:
-                idx_zero = signal_zerocrossings(dwt_local[idx_peak:idx_peak_nxt])[0] + idx_peak
-                # This is the score assigned to each peak. The peak with the highest score will be
-                # selected.
-                score = ecg_local[idx_zero] - (float(idx_zero) / sampling_rate - (rt_duration - 0.5 * qrs_width))
-                candidate_peaks.append(idx_zero)
-                candidate_peaks_scores.append(score)
-
-        if not candidate_peaks:
-            tpeaks.append(np.nan)
-            continue
+    return tpeaks, ppeaks
 
-        tpeaks.append(candidate_peaks[np.argmax(candidate_peaks_scores)] + srch_idx_start)
 
-    ppeaks = []
-    for rpeak in rpeaks:
-        if np.isnan(rpeak):
-            ppeaks.append(np.nan)
-            continue
+def _dwt_delineate_tp_peaks_candidates(ecg, dwt, srch_idx_start, srch_idx_end, epsilon_weight=0.25):
+    """Find the zero-crossings of the wavelet transform between a positive and a negative peak, in all the
+    search windows at once.
 
-        # search for P peaks from Rpeaks
-        srch_idx_start = rpeak - 2 * int(p2r_duration * sampling_rate)
-        srch_idx_end = rpeak - srch_bndry
-        dwt_local = dwtmatr[degree_ppeak + degree_add, srch_idx_start:srch_idx_end]
-        height = epsilon_P_weight * np.sqrt(np.mean(np.square(dwt_local)))
+    Returns the position of the zero-crossings in their window, the value of the ECG at that position and
+    the index of their window.
 
-        if len(dwt_local) == 0:
-            ppeaks.append(np.nan)
-            continue
+    """
+    dwt_local = _dwt_windows(dwt, srch_idx_start, srch_idx_end)
+    ecg_local = _dwt_windows(ecg, srch_idx_start, srch_idx_end)
+    valid = ~np.isnan(dwt_local)
 
-        ecg_local = ecg[srch_idx_start:srch_idx_end]
-        peaks, __ = scipy.signal.find_peaks(np.abs(dwt_local), height=height)
-        peaks = list(filter(lambda p: np.abs(dwt_local[p]) > 0.025 * max(dwt_local), peaks))
-        if dwt_local[0] > 0:  # just append
-            peaks = [0] + peaks
-
-        # detect morphology
-        candidate_peaks = []
-        candidate_peaks_scores = []
-        for idx_peak, idx_peak_nxt in zip(peaks[:-1], peaks[1:]):
-            correct_sign = dwt_local[idx_peak] > 0 and dwt_local[idx_peak_nxt] < 0  # pylint: disable=R1716
-            if correct_sign:
-                idx_zero = signal_zerocrossings(dwt_local[idx_peak:idx_peak_nxt])[0] + idx_peak
-                # This is the score assigned to each peak. The peak with the highest score will be
-                # selected.
-                score = ecg_local[idx_zero] - abs(
-                    float(idx_zero) / sampling_rate - p2r_duration
-                )  # Minus p2r because of the srch_idx_start
-                candidate_peaks.append(idx_zero)
-                candidate_peaks_scores.append(score)
-
-        if not candidate_peaks:
-            ppeaks.append(np.nan)
-            continue
+    with np.errstate(invalid="ignore", divide="ignore"):
+        height = epsilon_weight * np.sqrt(
+            np.sum(np.where(valid, np.square(dwt_local), 0), axis=1) / np.sum(valid, axis=1)
+        )
+        maximum = np.max(np.where(valid, dwt_local, -np.inf), axis=1)
+        peaks = _dwt_find_peaks(np.abs(dwt_local))
+        peaks &= np.abs(dwt_local) >= height[:, np.newaxis]
+        peaks &= np.abs(dwt_local) > 0.025 * maximum[:, np.newaxis]
+        peaks[:, 0] = dwt_local[:, 0] > 0  # just append
 
-        ppeaks.append(candidate_peaks[np.argmax(candidate_peaks_scores)] + srch_idx_start)
+    # detect morphology: a positive peak followed by a negative one
+    rows, cols = np.nonzero(peaks)
+    pairs = (rows[:-1] == rows[1:]) & (dwt_local[rows[:-1], cols[:-1]] > 0) & (dwt_local[rows[1:], cols[1:]] < 0)
+    rows = rows[:-1][pairs]
+    cols = cols[:-1][pairs]
 
-    return tpeaks, ppeaks
+    # The zero-crossing is the last sample before the wavelet transform stops being positive
+    positive = dwt_local > 0
+    next_nonpositive = np.where(positive, dwt_local.shape[1], np.arange(dwt_local.shape[1]))
+    next_nonpositive = np.minimum.accumulate(next_nonpositive[:, ::-1], axis=1)[:, ::-1]
+    idx_zero = next_nonpositive[rows, cols + 1] - 1
+
+    return idx_zero, ecg_local[rows, idx_zero], rows
+
+
+def _dwt_delineate_tp_peaks_select(idx_zero, scores, rows, srch_idx_start):
+    """Select the candidate with the highest score (the first one in case of ties) in each window."""
+    order = np.lexsort((idx_zero, -scores, rows))
+    rows, first = np.unique(rows[order], return_index=True)
+
+    peaks = np.full(len(srch_idx_start), np.nan)
+    peaks[rows] = idx_zero[order][first] + srch_idx_start[rows]
+    return [np.nan if np.isnan(peak) else int(peak) for peak in peaks]
 
 
 def _dwt_delineate_tp_onsets_offsets(
@@ -326,164 +376,178 @@ def _dwt_delineate_tp_onsets_offsets(
     degree_offset=2,
 ):
     degree = _dwt_compensate_degree(sampling_rate)
-    onsets = []
-    offsets = []
-    for i in range(len(peaks)):  # pylint: disable=C0200
-        # look for onsets
-        srch_idx_start = peaks[i] - int(duration * sampling_rate)
-        srch_idx_end = peaks[i]
-        if srch_idx_start is np.nan or srch_idx_end is np.nan:
-            onsets.append(np.nan)
-            continue
-        dwt_local = dwtmatr[degree_onset + degree, srch_idx_start:srch_idx_end]
-        onset_slope_peaks, __ = scipy.signal.find_peaks(dwt_local)
-        if len(onset_slope_peaks) == 0:
-            onsets.append(np.nan)
-            continue
-        epsilon_onset = onset_weight * dwt_local[onset_slope_peaks[-1]]
-        if not (dwt_local[: onset_slope_peaks[-1]] < epsilon_onset).any():
-            onsets.append(np.nan)
-            continue
-        candidate_onsets = np.where(dwt_local[: onset_slope_peaks[-1]] < epsilon_onset)[0]
-        onsets.append(candidate_onsets[-1] + srch_idx_start)
-
-        # # only for debugging
-        # events_plot([candidate_onsets, onset_slope_peaks], dwt_local)
-        # plt.plot(ecg[srch_idx_start: srch_idx_end], '--', label='ecg')
-        # plt.show()
-
-    for i in range(len(peaks)):  # pylint: disable=C0200
-        # look for offset
-        srch_idx_start = peaks[i]
-        srch_idx_end = peaks[i] + int(duration_offset * sampling_rate)
-        if srch_idx_start is np.nan or srch_idx_end is np.nan:
-            offsets.append(np.nan)
-            continue
-        dwt_local = dwtmatr[degree_offset + degree, srch_idx_start:srch_idx_end]
-        offset_slope_peaks, __ = scipy.signal.find_peaks(-dwt_local)
-        if len(offset_slope_peaks) == 0:
-            offsets.append(np.nan)
-            continue
-        epsilon_offset = -offset_weight * dwt_local[offset_slope_peaks[0]]
-        if not (-dwt_local[onset_slope_peaks[0] :] < epsilon_offset).any():
-            offsets.append(np.nan)
-            continue
-        candidate_offsets = np.where(-dwt_local[offset_slope_peaks[0] :] < epsilon_offset)[0] + offset_slope_peaks[0]
-        offsets.append(candidate_offsets[0] + srch_idx_start)
-
-        # # only for debugging
-        # events_plot([candidate_offsets, offset_slope_peaks], dwt_local)
-        # plt.plot(ecg[srch_idx_start: srch_idx_end], '--', label='ecg')
-        # plt.show()
+    peaks = np.array(peaks, dtype=float)
+
+    # look for onsets
+    srch_idx_start = peaks - int(duration * sampling_rate)
+    dwt_local = _dwt_windows(dwtmatr[degree_onset + degree], srch_idx_start, peaks)
+    onset_slope_peaks = _dwt_last(_dwt_find_peaks(dwt_local))
+    epsilon_onset = onset_weight * _dwt_take(dwt_local, onset_slope_peaks)
+    with np.errstate(invalid="ignore"):
+        candidate_onsets = dwt_local < epsilon_onset[:, np.newaxis]
+    candidate_onsets &= np.arange(dwt_local.shape[1]) < onset_slope_peaks[:, np.newaxis]
+    onsets = _dwt_points(_dwt_last(candidate_onsets), srch_idx_start)
+
+    # look for offsets
+    dwt_local = _dwt_windows(dwtmatr[degree_offset + degree], peaks, peaks + int(duration_offset * sampling_rate))
+    offset_slope_peaks = _dwt_first(_dwt_find_peaks(-dwt_local))
+    epsilon_offset = -offset_weight * _dwt_take(dwt_local, offset_slope_peaks)
+    with np.errstate(invalid="ignore"):
+        candidate_offsets = -dwt_local < epsilon_offset[:, np.newaxis]
+    candidate_offsets &= np.arange(dwt_local.shape[1]) >= offset_slope_peaks[:, np.newaxis]
+    candidate_offsets &= (offset_slope_peaks >= 0)[:, np.newaxis]
+    offsets = _dwt_points(_dwt_first(candidate_offsets), peaks)
 
     return onsets, offsets
 
 
 def _dwt_delineate_qrs_bounds(rpeaks, dwtmatr, ppeaks, tpeaks, sampling_rate=250):
     degree = int(np.log2(sampling_rate / 250))
-    onsets = []
-    for i in range(len(rpeaks)):  # pylint: disable=C0200
-        # look for onsets
-        srch_idx_start = ppeaks[i]
-        srch_idx_end = rpeaks[i]
-        if srch_idx_start is np.nan or srch_idx_end is np.nan:
-            onsets.append(np.nan)
-            continue
-        dwt_local = dwtmatr[2 + degree, srch_idx_start:srch_idx_end]
-        onset_slope_peaks, __ = scipy.signal.find_peaks(-dwt_local)
-        if len(onset_slope_peaks) == 0:
-            onsets.append(np.nan)
-            continue
-        epsilon_onset = 0.5 * -dwt_local[onset_slope_peaks[-1]]
-        if not (-dwt_local[: onset_slope_peaks[-1]] < epsilon_onset).any():
-            onsets.append(np.nan)
-            continue
-        candidate_onsets = np.where(-dwt_local[: onset_slope_peaks[-1]] < epsilon_onset)[0]
-        onsets.append(candidate_onsets[-1] + srch_idx_start)
+    rpeaks = np.array(rpeaks, dtype=float)
+
+    # look for onsets
+    srch_idx_start = np.array(ppeaks, dtype=float)
+    dwt_local = _dwt_windows(dwtmatr[2 + degree], srch_idx_start, rpeaks)
+    onset_slope_peaks = _dwt_last(_dwt_find_peaks(-dwt_local))
+    epsilon_onset = 0.5 * -_dwt_take(dwt_local, onset_slope_peaks)
+    with np.errstate(invalid="ignore"):
+        candidate_onsets = -dwt_local < epsilon_onset[:, np.newaxis]
+    candidate_onsets &= np.arange(dwt_local.shape[1]) < onset_slope_peaks[:, np.newaxis]
+    onsets = _dwt_points(_dwt_last(candidate_onsets), srch_idx_start)
+
+    # look for offsets
+    dwt_local = _dwt_windows(dwtmatr[2 + degree], rpeaks, np.array(tpeaks, dtype=float))
+    offset_slope_peaks = _dwt_first(_dwt_find_peaks(dwt_local))
+    epsilon_offset = 0.5 * _dwt_take(dwt_local, offset_slope_peaks)
+    with np.errstate(invalid="ignore"):
+        candidate_offsets = dwt_local < epsilon_offset[:, np.newaxis]
+    candidate_offsets &= np.arange(dwt_local.shape[1]) >= offset_slope_peaks[:, np.newaxis]
+    candidate_offsets &= (offset_slope_peaks >= 0)[:, np.newaxis]
+    offsets = _dwt_points(_dwt_first(candidate_offsets), rpeaks)
 
-        # # only for debugging
-        # events_plot(candidate_onsets, -dwt_local)
-        # plt.plot(ecg[srch_idx_start: srch_idx_end], '--', label='ecg')
-        # plt.legend()
-        # plt.show()
+    return onsets, offsets
 
-    offsets = []
-    for i in range(len(rpeaks)):  # pylint: disable=C0200
-        # look for offsets
-        srch_idx_start = rpeaks[i]
-        srch_idx_end = tpeaks[i]
-        if srch_idx_start is np.nan or srch_idx_end is np.nan:
-            offsets.append(np.nan)
-            continue
-        dwt_local = dwtmatr[2 + degree, srch_idx_start:srch_idx_end]
-        onset_slope_peaks, __ = scipy.signal.find_peaks(dwt_local)
-        if len(onset_slope_peaks) == 0:
-            offsets.append(np.nan)
-            continue
-        epsilon_offset = 0.5 * dwt_local[onset_slope_peaks[0]]
-        if not (dwt_local[onset_slope_peaks[0] :] < epsilon_offset).any():
-            offsets.append(np.nan)
-            continue
-        candidate_offsets = np.where(dwt_local[onset_slope_peaks[0] :] < epsilon_offset)[0] + onset_slope_peaks[0]
-        offsets.append(candidate_offsets[0] + srch_idx_start)
 
-        # # only for debugging
-        # events_plot(candidate_offsets, dwt_local)
-        # plt.plot(ecg[srch_idx_start: srch_idx_end], '--', label='ecg')
-        # plt.legend()
-        # plt.show()
+def _dwt_windows(signal, starts, ends):
+    """Stack the search windows [start, end) of the signal as the rows of a matrix, padded with NaNs.
 
-    return onsets, offsets
+    Windows starting before the signal or at a missing point (NaN) are empty, and windows are cut at the
+    end of the signal.
+
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    valid = ~np.isnan(starts) & ~np.isnan(ends) & (starts >= 0)
+    starts = np.where(valid, starts, 0).astype(int)
+    lengths = np.where(valid, np.minimum(np.where(valid, ends, 0), len(signal)) - starts, 0).astype(int)
+    lengths = np.maximum(lengths, 0)
+
+    indices = starts[:, np.newaxis] + np.arange(max(1, np.max(lengths, initial=0)))
+    windows = np.asarray(signal, dtype=float)[np.minimum(indices, len(signal) - 1)]
+    windows[np.arange(indices.shape[1]) >= lengths[:, np.newaxis]] = np.nan
+    return windows
+
+
+def _dwt_find_peaks(windows):
+    """Local maxima of each row (as in ``scipy.signal.find_peaks()``, for signals without plateaus)."""
+    peaks = np.zeros(windows.shape, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        peaks[:, 1:-1] = (windows[:, 1:-1] > windows[:, :-2]) & (windows[:, 1:-1] > windows[:, 2:])
+    return peaks
+
+
+def _dwt_first(mask):
+    """Index of the first True value of each row (-1 if none)."""
+    return np.where(mask.any(axis=1), np.argmax(mask, axis=1), -1)
+
+
+def _dwt_last(mask):
+    """Index of the last True value of each row (-1 if none)."""
+    return np.where(mask.any(axis=1), mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1), -1)
+
+
+def _dwt_take(windows, indices):
+    """Value of each row at the given index (NaN if the index is -1)."""
+    return np.where(indices >= 0, windows[np.arange(len(windows)), indices], np.nan)
+
+
+def _dwt_points(indices, srch_idx_start):
+    """Convert the indices within the search windows to samples (NaN if the index is -1)."""
+    return [np.nan if index < 0 else int(index + start) for index, start in zip(indices, srch_idx_start)]
 
 
 def _dwt_compute_multiscales(ecg: np.ndarray, max_degree):
-    """Return multiscales wavelet transforms."""
-
-    def _apply_H_filter(signal_i, power=0):
-        zeros = np.zeros(2 ** power - 1)
-        timedelay = 2 ** power
-        banks = np.r_[
-            1.0 / 8, zeros, 3.0 / 8, zeros, 3.0 / 8, zeros, 1.0 / 8,
-        ]
-        signal_f = scipy.signal.convolve(signal_i, banks, mode="full")
-        signal_f[:-timedelay] = signal_f[timedelay:]  # timeshift: 2 steps
-        return signal_f
-
-    def _apply_G_filter(signal_i, power=0):
-        zeros = np.zeros(2 ** power - 1)
-        timedelay = 2 ** power
-        banks = np.r_[2, zeros, -2]
-        signal_f = scipy.signal.convolve(signal_i, banks, mode="full")
-        signal_f[:-timedelay] = signal_f[timedelay:]  # timeshift: 1 step
-        return signal_f
-
-    dwtmatr = []
-    intermediate_ret = np.array(ecg)
+    """Return multiscales wavelet transforms.
+
+    Stationary wavelet transform ("algorithme a trous"): the transform at each degree is obtained by applying
+    the G filter, upsampled by 2^degree, to the output of the H filters of the previous degrees. As the
+    filters only have a few non-zero taps, they are applied as sums of shifted copies of the signal.
+
+    """
+    # Zero-padding beyond the support of the filters of all the degrees
+    padding = 2 ** (max_degree + 2)
+    signal = np.concatenate([np.zeros(padding), np.asarray(ecg, dtype=float), np.zeros(padding)])
+
+    def _shift(signal_i, steps=0):
+        shifted = np.zeros(len(signal_i))
+        if steps >= 0:
+            shifted[: len(signal_i) - steps] = signal_i[steps:]
+        else:
+            shifted[-steps:] = signal_i[:steps]
+        return shifted
+
+    dwtmatr = np.zeros((max_degree, len(ecg)))
     for deg in range(max_degree):
-        S_deg = _apply_G_filter(intermediate_ret, power=deg)
-        T_deg = _apply_H_filter(intermediate_ret, power=deg)
-        dwtmatr.append(S_deg)
-        intermediate_ret = np.array(T_deg)
-    dwtmatr = [arr[: len(ecg)] for arr in dwtmatr]  # rescale transforms to the same length
-    return np.array(dwtmatr)
+        timedelay = 2 ** deg
+        # G filter (2, -2) and H filter (1/8, 3/8, 3/8, 1/8), including their timeshift of 2^deg steps
+        dwtmatr[deg] = 2 * _shift(signal, timedelay)[padding:-padding] - 2 * signal[padding:-padding]
+        signal = (
+            _shift(signal, timedelay) + 3 * signal + 3 * _shift(signal, -timedelay) + _shift(signal, -2 * timedelay)
+        ) / 8
+    return dwtmatr
 
 
 # =============================================================================
 # WAVELET METHOD (CWT)
 # =============================================================================
-def _ecg_delineator_cwt(ecg, rpeaks=None, sampling_rate=1000):
+def _ecg_delineator_cwt(ecg, rpeaks=None, sampling_rate=1000, windowed=False):
+
+    # Try loading pywt
+    try:
+        import pywt
+    except ImportError:
+        raise ImportError(
+            "NeuroKit error: ecg_delineator(): the 'PyWavelets' module is required for this method to run. ",
+            "Please install it first (`pip install PyWavelets`).",
+        )
+
+    ecg = np.asarray(ecg)
+
+    # first derivative of the Gaissian signal
+    scales = np.array([1, 2, 4, 8, 16])
+    if windowed is True:
+        # The transforms are computed around the peaks by each step
+        cwtmatr = None
+    else:
+        cwtmatr, __ = pywt.cwt(ecg, scales, "gaus1", sampling_period=1.0 / sampling_rate)
 
     # P-Peaks and T-Peaks
-    tpeaks, ppeaks = _peaks_delineator(ecg, rpeaks, sampling_rate=sampling_rate)
+    tpeaks, ppeaks = _peaks_delineator(ecg, rpeaks, cwtmatr=cwtmatr, sampling_rate=sampling_rate)
 
     # qrs onsets and offsets
-    qrs_onsets, qrs_offsets = _onset_offset_delineator(ecg, rpeaks, peak_type="rpeaks", sampling_rate=sampling_rate)
+    qrs_onsets, qrs_offsets = _onset_offset_delineator(
+        ecg, rpeaks, peak_type="rpeaks", cwtmatr=cwtmatr, sampling_rate=sampling_rate
+    )
 
     # ppeaks onsets and offsets
-    p_onsets, p_offsets = _onset_offset_delineator(ecg, ppeaks, peak_type="ppeaks", sampling_rate=sampling_rate)
+    p_onsets, p_offsets = _onset_offset_delineator(
+        ecg, ppeaks, peak_type="ppeaks", cwtmatr=cwtmatr, sampling_rate=sampling_rate
+    )
 
     # tpeaks onsets and offsets
-    t_onsets, t_offsets = _onset_offset_delineator(ecg, tpeaks, peak_type="tpeaks", sampling_rate=sampling_rate)
+    t_onsets, t_offsets = _onset_offset_delineator(
+        ecg, tpeaks, peak_type="tpeaks", cwtmatr=cwtmatr, sampling_rate=sampling_rate
+    )
 
     # Return info dictionary
     return {
@@ -502,36 +566,45 @@ def _ecg_delineator_cwt(ecg, rpeaks=None, sampling_rate=1000):
 # ---------------------
 
 
-def _onset_offset_delineator(ecg, peaks, peak_type="rpeaks", sampling_rate=1000):
-    # Try loading pywt
-    try:
-        import pywt
-    except ImportError:
-        raise ImportError(
-            "NeuroKit error: ecg_delineator(): the 'PyWavelets' module is required for this method to run. ",
-            "Please install it first (`pip install PyWavelets`).",
-        )
-    # first derivative of the Gaissian signal
-    scales = np.array([1, 2, 4, 8, 16])
-    cwtmatr, __ = pywt.cwt(ecg, scales, "gaus1", sampling_period=1.0 / sampling_rate)
+def _onset_offset_delineator(ecg, peaks, peak_type="rpeaks", cwtmatr=None, sampling_rate=1000):
+
+    # The QRS bounds are found on the wavelet transform at scale 2^2, the P and T waves bounds at 2^4
+    scale = 2 if peak_type == "rpeaks" else 4
 
     half_wave_width = int(0.1 * sampling_rate)  # NEED TO CHECK
+    # Search regions of each peak, within which the wavelet transform is needed
+    if cwtmatr is None:
+        valid = [i for i, index_peak in enumerate(peaks) if not np.isnan(index_peak)]
+        origins = np.zeros(len(peaks), dtype=int)
+        origins[valid] = np.array([peaks[i] for i in valid], dtype=int) - half_wave_width - 100
+        transforms = [None] * len(peaks)
+        ends = origins[valid] + 2 * (half_wave_width + 100)
+        for i, transform in zip(valid, _cwt_windows(ecg, origins[valid], ends, [2 ** scale], sampling_rate)):
+            transforms[i] = transform[0]
+
     onsets = []
     offsets = []
-    for index_peak in peaks:
+    for i, index_peak in enumerate(peaks):
         # find onset
         if np.isnan(index_peak):
             onsets.append(np.nan)
             offsets.append(np.nan)
             continue
+
+        # Wavelet transform (wt) and its starting sample (origin)
+        if cwtmatr is None:
+            wt, origin = transforms[i], origins[i]
+        else:
+            wt, origin = cwtmatr[scale, :], 0
+
         if peak_type == "rpeaks":
-            search_window = cwtmatr[2, index_peak - half_wave_width : index_peak]
+            search_window = wt[index_peak - half_wave_width - origin : index_peak - origin]
             prominence = 0.20 * max(search_window)
             height = 0.0
             wt_peaks, wt_peaks_data = scipy.signal.find_peaks(search_window, height=height, prominence=prominence)
 
         elif peak_type in ["tpeaks", "ppeaks"]:
-            search_window = -cwtmatr[4, index_peak - half_wave_width : index_peak]
+            search_window = -wt[index_peak - half_wave_width - origin : index_peak - origin]
 
             prominence = 0.10 * max(search_window)
             height = 0.0
@@ -552,9 +625,9 @@ def _onset_offset_delineator(ecg, peaks, peak_type="rpeaks", sampling_rate=1000)
                 epsilon_onset = 0.25 * wt_peaks_data["peak_heights"][-1]
             leftbase = wt_peaks_data["left_bases"][-1] + index_peak - half_wave_width
             if peak_type == "rpeaks":
-                candidate_onsets = np.where(cwtmatr[2, nfirst - 100 : nfirst] < epsilon_onset)[0] + nfirst - 100
+                candidate_onsets = np.where(wt[nfirst - 100 - origin : nfirst - origin] < epsilon_onset)[0] + nfirst - 100
             elif peak_type in ["tpeaks", "ppeaks"]:
-                candidate_onsets = np.where(-cwtmatr[4, nfirst - 100 : nfirst] < epsilon_onset)[0] + nfirst - 100
+                candidate_onsets = np.where(-wt[nfirst - 100 - origin : nfirst - origin] < epsilon_onset)[0] + nfirst - 100
 
             candidate_onsets = candidate_onsets.tolist() + [leftbase]
             if len(candidate_onsets) == 0:
@@ -564,12 +637,12 @@ def _onset_offset_delineator(ecg, peaks, peak_type="rpeaks", sampling_rate=1000)
 
         # find offset
         if peak_type == "rpeaks":
-            search_window = -cwtmatr[2, index_peak : index_peak + half_wave_width]
+            search_window = -wt[index_peak - origin : index_peak + half_wave_width - origin]
             prominence = 0.50 * max(search_window)
             wt_peaks, wt_peaks_data = scipy.signal.find_peaks(search_window, height=height, prominence=prominence)
 
         elif peak_type in ["tpeaks", "ppeaks"]:
-            search_window = cwtmatr[4, index_peak : index_peak + half_wave_width]
+            search_window = wt[index_peak - origin : index_peak + half_wave_width - origin]
             prominence = 0.10 * max(search_window)
             wt_peaks, wt_peaks_data = scipy.signal.find_peaks(search_window, height=height, prominence=prominence)
 
@@ -587,9 +660,9 @@ def _onset_offset_delineator(ecg, peaks, peak_type="rpeaks", sampling_rate=1000)
                 epsilon_offset = 0.4 * wt_peaks_data["peak_heights"][0]
             rightbase = wt_peaks_data["right_bases"][0] + index_peak
             if peak_type == "rpeaks":
-                candidate_offsets = np.where((-cwtmatr[2, nlast : nlast + 100]) < epsilon_offset)[0] + nlast
+                candidate_offsets = np.where((-wt[nlast - origin : nlast + 100 - origin]) < epsilon_offset)[0] + nlast
             elif peak_type in ["tpeaks", "ppeaks"]:
-                candidate_offsets = np.where((cwtmatr[4, nlast : nlast + 100]) < epsilon_offset)[0] + nlast
+                candidate_offsets = np.where((wt[nlast - origin : nlast + 100 - origin]) < epsilon_offset)[0] + nlast
 
             candidate_offsets = candidate_offsets.tolist() + [rightbase]
             if len(candidate_offsets) == 0:
@@ -602,28 +675,30 @@ def _onset_offset_delineator(ecg, peaks, peak_type="rpeaks", sampling_rate=1000)
     return onsets, offsets
 
 
-def _peaks_delineator(ecg, rpeaks, sampling_rate=1000):
-    # Try loading pywt
-    try:
-        import pywt
-    except ImportError:
-        raise ImportError(
-            "NeuroKit error: ecg_delineator(): the 'PyWavelets' module is required for this method to run. ",
-            "Please install it first (`pip install PyWavelets`).",
-        )
-    # first derivative of the Gaissian signal
-    scales = np.array([1, 2, 4, 8, 16])
-    cwtmatr, __ = pywt.cwt(ecg, scales, "gaus1", sampling_period=1.0 / sampling_rate)
+def _peaks_delineator(ecg, rpeaks, cwtmatr=None, sampling_rate=1000):
 
     qrs_duration = 0.1
 
     search_boundary = int(0.9 * qrs_duration * sampling_rate / 2)
+    starts = np.asarray(rpeaks[:-1]) + search_boundary
+    ends = np.asarray(rpeaks[1:]) - search_boundary
+
+    # The wavelet transform at scale 2^4 is only needed between the R-peaks
+    if cwtmatr is None:
+        transforms = [transform[0] for transform in _cwt_windows(ecg, starts, ends, [2 ** 4], sampling_rate)]
+
     significant_peaks_groups = []
     for i in range(len(rpeaks) - 1):
+        # Wavelet transform (wt) and its starting sample (origin)
+        if cwtmatr is None:
+            wt, origin = transforms[i], starts[i]
+        else:
+            wt, origin = cwtmatr[4, :], 0
+
         # search for T peaks and P peaks from R peaks
-        start = rpeaks[i] + search_boundary
-        end = rpeaks[i + 1] - search_boundary
-        search_window = cwtmatr[4, start:end]
+        start = starts[i]
+        end = ends[i]
+        search_window = wt[start - origin : end - origin]
         height = 0.25 * np.sqrt(np.mean(np.square(search_window)))
         peaks_tp, heights_tp = scipy.signal.find_peaks(np.abs(search_window), height=height)
         peaks_tp = peaks_tp + rpeaks[i] + search_boundary
@@ -632,7 +707,9 @@ def _peaks_delineator(ecg, rpeaks, sampling_rate=1000):
         significant_peaks_tp = []
         significant_peaks_tp = [peaks_tp[j] for j in range(len(peaks_tp)) if heights_tp["peak_heights"][j] > threshold]
 
-        significant_peaks_groups.append(_find_tppeaks(ecg, significant_peaks_tp, sampling_rate=sampling_rate))
+        significant_peaks_groups.append(
+            _find_tppeaks(ecg, significant_peaks_tp, wt=wt, origin=origin, sampling_rate=sampling_rate)
+        )
 
     tpeaks, ppeaks = zip(*[(g[0], g[-1]) for g in significant_peaks_groups])
 
@@ -641,27 +718,17 @@ def _peaks_delineator(ecg, rpeaks, sampling_rate=1000):
     return tpeaks, ppeaks
 
 
-def _find_tppeaks(ecg, keep_tp, sampling_rate=1000):
-    # Try loading pywt
-    try:
-        import pywt
-    except ImportError:
-        raise ImportError(
-            "NeuroKit error: ecg_delineator(): the 'PyWavelets' module is required for this method to run. ",
-            "Please install it first (`pip install PyWavelets`).",
-        )
-    # first derivative of the Gaissian signal
-    scales = np.array([1, 2, 4, 8, 16])
-    cwtmatr, __ = pywt.cwt(ecg, scales, "gaus1", sampling_period=1.0 / sampling_rate)
+def _find_tppeaks(ecg, keep_tp, wt, origin=0, sampling_rate=1000):
+    """`wt` is the wavelet transform at scale 2^4, starting at sample `origin` of the ECG."""
     max_search_duration = 0.05
     tppeaks = []
     for index_cur, index_next in zip(keep_tp[:-1], keep_tp[1:]):
         # limit 1
-        correct_sign = cwtmatr[4, :][index_cur] < 0 and cwtmatr[4, :][index_next] > 0  # pylint: disable=R1716
+        correct_sign = wt[index_cur - origin] < 0 and wt[index_next - origin] > 0  # pylint: disable=R1716
         #    near = (index_next - index_cur) < max_wv_peak_dist #limit 2
         #    if near and correct_sign:
         if correct_sign:
-            index_zero_cr = signal_zerocrossings(cwtmatr[4, :][index_cur:index_next])[0] + index_cur
+            index_zero_cr = signal_zerocrossings(wt[index_cur - origin : index_next - origin])[0] + index_cur
             nb_idx = int(max_search_duration * sampling_rate)
             index_max = np.argmax(ecg[index_zero_cr - nb_idx : index_zero_cr + nb_idx]) + (index_zero_cr - nb_idx)
             tppeaks.append(index_max)
@@ -670,13 +737,49 @@ def _find_tppeaks(ecg, keep_tp, sampling_rate=1000):
     return tppeaks
 
 
+def _cwt_windows(ecg, starts, ends, scales, sampling_rate=1000):
+    """Continuous wavelet transform ('gaus1') of the ECG within each window [start, end).
+
+    The windows are padded with the neighbouring samples (or zeros, beyond the signal) over the support of
+    the wavelet, so that the coefficients are the same as those of the transform of the whole signal. All
+    the windows are then concatenated and transformed at once. Returns a list of arrays of shape
+    (len(scales), end - start).
+
+    """
+    import pywt
+
+    wavelet = pywt.ContinuousWavelet("gaus1")
+    padding = int(np.ceil(np.max(scales) * (wavelet.upper_bound - wavelet.lower_bound) / 2)) + 1
+
+    starts = np.asarray(starts, dtype=int)
+    ends = np.maximum(np.asarray(ends, dtype=int), starts)
+    if len(starts) == 0:
+        return []
+
+    # Signal extended with zeros, so that all the padded windows fall within it
+    offset = padding + max(0, -np.min(starts))
+    extended = np.zeros(offset + max(len(ecg), np.max(ends)) + padding)
+    extended[offset : offset + len(ecg)] = ecg
+
+    segments = [extended[start + offset - padding : end + offset + padding] for start, end in zip(starts, ends)]
+    cwtmatr, __ = pywt.cwt(np.concatenate(segments), scales, "gaus1", sampling_period=1.0 / sampling_rate)
+
+    bounds = np.cumsum([0] + [len(segment) for segment in segments])
+    return [cwtmatr[:, bounds[i] + padding : bounds[i + 1] - padding] for i in range(len(segments))]
+
+
 # =============================================================================
 #                              PEAK METHOD
 # =============================================================================
 def _ecg_delineator_peak(ecg, rpeaks=None, sampling_rate=1000):
 
     # Initialize
-    heartbeats = ecg_segment(ecg, rpeaks, sampling_rate)
+    heartbeats, lengths, R, left, right = _ecg_delineator_peak_heartbeats(ecg, rpeaks, sampling_rate)
+
+    # Minimum height (prominence) of the waves on each side of the R-peak
+    with np.errstate(invalid="ignore"):
+        height_left = 0.05 * _ecg_delineator_peak_range(heartbeats, 0, left)
+        height_right = 0.05 * _ecg_delineator_peak_range(heartbeats, right, lengths)
 
     Q_list = []
     P_list = []
@@ -687,31 +790,28 @@ def _ecg_delineator_peak(ecg, rpeaks=None, sampling_rate=1000):
     T_offsets = []
 
     for i, rpeak in enumerate(rpeaks):
-        heartbeat = heartbeats[str(i + 1)]
-
-        # Get index of heartbeat
-        R = heartbeat.index.get_loc(np.min(heartbeat.index.values[heartbeat.index.values > 0]))
+        heartbeat = heartbeats[i, : lengths[i]]
 
         # Peaks ------
         # Q wave
-        Q_index, Q = _ecg_delineator_peak_Q(rpeak, heartbeat, R)
+        Q_index, Q = _ecg_delineator_peak_Q(rpeak, heartbeat, R[i], left[i], height_left[i])
         Q_list.append(Q_index)
 
         # P wave
-        P_index, P = _ecg_delineator_peak_P(rpeak, heartbeat, R, Q)
+        P_index, P = _ecg_delineator_peak_P(rpeak, heartbeat, R[i], Q)
         P_list.append(P_index)
 
         # S wave
-        S_index, S = _ecg_delineator_peak_S(rpeak, heartbeat)
+        S_index, S = _ecg_delineator_peak_S(rpeak, heartbeat, right[i], height_right[i])
         S_list.append(S_index)
 
         # T wave
-        T_index, T = _ecg_delineator_peak_T(rpeak, heartbeat, R, S)
+        T_index, T = _ecg_delineator_peak_T(rpeak, heartbeat, R[i], S)
         T_list.append(T_index)
 
         # Onsets/Offsets ------
-        P_onsets.append(_ecg_delineator_peak_P_onset(rpeak, heartbeat, R, P))
-        T_offsets.append(_ecg_delineator_peak_T_offset(rpeak, heartbeat, R, T))
+        P_onsets.append(_ecg_delineator_peak_P_onset(rpeak, heartbeat, R[i], P))
+        T_offsets.append(_ecg_delineator_peak_T_offset(rpeak, heartbeat, R[i], T))
 
     # Return info dictionary
     return {
@@ -726,15 +826,64 @@ def _ecg_delineator_peak(ecg, rpeaks=None, sampling_rate=1000):
 
 # Internal
 # --------------------------
+def _ecg_delineator_peak_heartbeats(ecg, rpeaks, sampling_rate=1000):
+    """Heartbeats as a (n_beats, n_samples) array, with the same windows as `ecg_segment()`.
+
+    The array is a copy of the rows of the view returned by `_ecg_segment_heartbeats()` (one per R-peak),
+    as the ranges of all the heartbeats are computed at once. Also returns the length of each heartbeat
+    (the windows can differ by one sample because of rounding), the position of the R-peak (first sample
+    after 0s) and the end (respectively, start) of the part of each heartbeat before (respectively,
+    after) the R-peak, 0s included.
+
+    """
+    windows, starts, lengths, epochs_start, epochs_end = _ecg_segment_heartbeats(
+        ecg, rpeaks, sampling_rate=sampling_rate
+    )
+    heartbeats = windows[starts]
 
+    # Time of each sample of the heartbeats
+    R = np.zeros(len(rpeaks), dtype=int)
+    left = np.zeros(len(rpeaks), dtype=int)
+    right = np.zeros(len(rpeaks), dtype=int)
+    for length in np.unique(lengths):
+        time = np.linspace(epochs_start, epochs_end, num=length, endpoint=True)
+        R[lengths == length] = np.argmax(time > 0)
+        left[lengths == length] = np.sum(time <= 0)
+        right[lengths == length] = np.argmax(time >= 0)
 
-def _ecg_delineator_peak_Q(rpeak, heartbeat, R):
-    segment = heartbeat[:0]  # Select left hand side
+    return heartbeats, lengths, R, left, right
 
-    Q = signal_findpeaks(-1 * segment["Signal"], height_min=0.05 * (segment["Signal"].max() - segment["Signal"].min()))
-    if len(Q["Peaks"]) == 0:
+
+def _ecg_delineator_peak_range(heartbeats, start, end):
+    """Range (max - min) of each heartbeat between start and end, ignoring NaNs."""
+    columns = np.arange(heartbeats.shape[1])
+    mask = (columns >= np.reshape(start, (-1, 1))) & (columns < np.reshape(end, (-1, 1))) & ~np.isnan(heartbeats)
+
+    empty = ~np.any(mask, axis=1)
+    maximum = np.max(np.where(mask, heartbeats, -np.inf), axis=1)
+    minimum = np.min(np.where(mask, heartbeats, np.inf), axis=1)
+
+    heights = maximum - minimum
+    heights[empty] = np.nan
+    return heights
+
+
+def _ecg_delineator_peak_find(signal, height_min):
+    """Local maxima and their prominence (as in `signal_findpeaks()`), above a minimum prominence."""
+    peaks, _ = scipy.signal.find_peaks(signal)
+    heights, _, __ = scipy.signal.peak_prominences(signal, peaks)
+
+    keep = ~(heights < height_min)
+    return peaks[keep], heights[keep]
+
+
+def _ecg_delineator_peak_Q(rpeak, heartbeat, R, left, height_min):
+    segment = heartbeat[:left]  # Select left hand side
+
+    Q, _ = _ecg_delineator_peak_find(-1 * segment, height_min)
+    if len(Q) == 0:
         return np.nan, None
-    Q = Q["Peaks"][-1]  # Select most right-hand side
+    Q = Q[-1]  # Select most right-hand side
     from_R = R - Q  # Relative to R
     return rpeak - from_R, Q
 
@@ -743,23 +892,23 @@ def _ecg_delineator_peak_P(rpeak, heartbeat, R, Q):
     if Q is None:
         return np.nan, None
 
-    segment = heartbeat.iloc[:Q]  # Select left of Q wave
-    P = signal_findpeaks(segment["Signal"], height_min=0.05 * (segment["Signal"].max() - segment["Signal"].min()))
+    segment = heartbeat[:Q]  # Select left of Q wave
+    P, heights = _ecg_delineator_peak_find(segment, 0.05 * _ecg_delineator_peak_range(segment[np.newaxis], 0, Q)[0])
 
-    if len(P["Peaks"]) == 0:
+    if len(P) == 0:
         return np.nan, None
-    P = P["Peaks"][np.argmax(P["Height"])]  # Select heighest
+    P = P[np.argmax(heights)]  # Select heighest
     from_R = R - P  # Relative to R
     return rpeak - from_R, P
 
 
-def _ecg_delineator_peak_S(rpeak, heartbeat):
-    segment = heartbeat[0:]  # Select right hand side
-    S = signal_findpeaks(-segment["Signal"], height_min=0.05 * (segment["Signal"].max() - segment["Signal"].min()))
+def _ecg_delineator_peak_S(rpeak, heartbeat, right, height_min):
+    segment = heartbeat[right:]  # Select right hand side
+    S, _ = _ecg_delineator_peak_find(-segment, height_min)
 
-    if len(S["Peaks"]) == 0:
+    if len(S) == 0:
         return np.nan, None
-    S = S["Peaks"][0]  # Select most left-hand side
+    S = S[0]  # Select most left-hand side
     return rpeak + S, S
 
 
@@ -767,12 +916,14 @@ def _ecg_delineator_peak_T(rpeak, heartbeat, R, S):
     if S is None:
         return np.nan, None
 
-    segment = heartbeat.iloc[R + S :]  # Select right of S wave
-    T = signal_findpeaks(segment["Signal"], height_min=0.05 * (segment["Signal"].max() - segment["Signal"].min()))
+    segment = heartbeat[R + S :]  # Select right of S wave
+    T, heights = _ecg_delineator_peak_find(
+        segment, 0.05 * _ecg_delineator_peak_range(segment[np.newaxis], 0, len(segment))[0]
+    )
 
-    if len(T["Peaks"]) == 0:
+    if len(T) == 0:
         return np.nan, None
-    T = S + T["Peaks"][np.argmax(T["Height"])]  # Select heighest
+    T = S + T[np.argmax(heights)]  # Select heighest
     return rpeak + T, T
 
 
@@ -780,11 +931,11 @@ def _ecg_delineator_peak_P_onset(rpeak, heartbeat, R, P):
     if P is None:
         return np.nan
 
-    segment = heartbeat.iloc[:P]  # Select left of P wave
+    segment = heartbeat[:P]  # Select left of P wave
     try:
-        signal = signal_smooth(segment["Signal"].values, size=R / 10)
+        signal = signal_smooth(segment, size=R / 10)
     except TypeError:
-        signal = segment["Signal"]
+        signal = segment
 
     if len(signal) < 2:
         return np.nan
@@ -800,11 +951,11 @@ def _ecg_delineator_peak_T_offset(rpeak, heartbeat, R, T):
     if T is None:
         return np.nan
 
-    segment = heartbeat.iloc[R + T :]  # Select left of P wave
+    segment = heartbeat[R + T :]  # Select left of P wave
     try:
-        signal = signal_smooth(segment["Signal"].values, size=R / 10)
+        signal = signal_smooth(segment, size=R / 10)
     except TypeError:
-        signal = segment["Signal"]
+        signal = segment
 
     if len(signal) < 2:
         return np.nan
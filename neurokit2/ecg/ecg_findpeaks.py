@@ -1,14 +1,15 @@
 # - * - coding: utf-8 - * -
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+import scipy.ndimage
 import scipy.signal
 import scipy.stats
 
-from ..signal import signal_findpeaks, signal_plot, signal_smooth, signal_zerocrossings
+from ..misc.parallel import _parallel_map
+from ..signal import signal_findpeaks, signal_smooth, signal_zerocrossings
 
 
-def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False):
+def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False, n_jobs=1):
     """Find R-peaks in an ECG signal.
 
     Low-level function used by `ecg_peaks()` to identify R-peaks in an ECG signal using a different
@@ -16,8 +17,10 @@ def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False
 
     Parameters
     ----------
-    ecg_cleaned : Union[list, np.array, pd.Series]
-        The cleaned ECG channel as returned by `ecg_clean()`.
+    ecg_cleaned : Union[list, np.array, pd.Series, pd.DataFrame]
+        The cleaned ECG channel as returned by `ecg_clean()`. Several leads can be passed as a 2D array
+        or DataFrame of shape (n_samples, n_leads), in which case the R-peaks are detected once, on the
+        average of the standardized leads (each oriented so that its R-waves are positive).
     sampling_rate : int
         The sampling frequency of `ecg_signal` (in Hz, i.e., samples/second).
         Defaults to 1000.
@@ -28,6 +31,12 @@ def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False
     show : bool
         If True, will return a plot to visualizing the thresholds used in the algorithm.
         Useful for debugging.
+    n_jobs : int
+        Only used by the 'promac' method, whose detectors are then run concurrently in a pool of
+        `n_jobs` threads. -1 uses as many workers as available. Defaults to 1 (sequential). Note that
+        the parts of the detectors written in pure Python (such as the beat-by-beat decision loops of
+        'hamilton2002', 'christov2004' or 'engzeemod2012') hold the interpreter lock and do not run
+        concurrently, so that the threads mainly help the detectors relying on NumPy and SciPy.
 
     Returns
     -------
@@ -88,6 +97,10 @@ def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False
     ...                         artifacts_amplitude=0.2, artifacts_frequency=50)
     >>> nk.ecg_findpeaks(ecg, sampling_rate=1000, method="promac", show=True) #doctest: +ELLIPSIS
     {'ECG_R_Peaks': array(...)}
+    >>>
+    >>> # Run the ProMAC detectors in parallel
+    >>> nk.ecg_findpeaks(ecg, sampling_rate=1000, method="promac", n_jobs=-1) #doctest: +ELLIPSIS
+    {'ECG_R_Peaks': array(...)}
 
     References
     --------------
@@ -115,13 +128,13 @@ def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False
     """
     # Try retrieving right column
     if isinstance(ecg_cleaned, pd.DataFrame):
-        try:
-            ecg_cleaned = ecg_cleaned["ECG_Clean"]
-        except NameError:
-            try:
-                ecg_cleaned = ecg_cleaned["ECG_Raw"]
-            except NameError:
-                ecg_cleaned = ecg_cleaned["ECG"]
+        cols = [col for col in ["ECG_Clean", "ECG_Raw", "ECG"] if col in ecg_cleaned.columns]
+        if cols:
+            ecg_cleaned = ecg_cleaned[cols[0]]
+
+    # Several leads (one per column)
+    if np.ndim(ecg_cleaned) == 2:
+        ecg_cleaned = _ecg_findpeaks_leads(ecg_cleaned)
 
     method = method.lower()  # remove capitalised letters
     # Run peak detection algorithm
@@ -150,7 +163,9 @@ def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False
     elif method in ["rodrigues2020", "rodrigues", "asi"]:
         rpeaks = _ecg_findpeaks_rodrigues(ecg_cleaned, sampling_rate)
     elif method in ["promac", "all"]:
-        rpeaks = _ecg_findpeaks_promac(ecg_cleaned, sampling_rate=sampling_rate, threshold=0.33, show=show)
+        rpeaks = _ecg_findpeaks_promac(
+            ecg_cleaned, sampling_rate=sampling_rate, threshold=0.33, show=show, n_jobs=n_jobs
+        )
     else:
         raise ValueError("NeuroKit error: ecg_findpeaks(): 'method' should be one of 'neurokit'" "or 'pamtompkins'.")
 
@@ -160,21 +175,54 @@ def ecg_findpeaks(ecg_cleaned, sampling_rate=1000, method="neurokit", show=False
     return info
 
 
+def _ecg_findpeaks_leads(ecg_cleaned):
+    """Combine several leads (columns) into a single signal on which to detect the R-peaks.
+
+    Each lead is standardized and flipped if its QRS complexes point downwards (negative skewness), so
+    that the R-waves of all leads add up in their average.
+
+    """
+    ecg_cleaned = np.asarray(ecg_cleaned, dtype=float)
+    if ecg_cleaned.shape[1] == 1:
+        return ecg_cleaned[:, 0]
+
+    leads = (ecg_cleaned - np.mean(ecg_cleaned, axis=0)) / np.std(ecg_cleaned, axis=0, ddof=1)
+    polarity = np.where(scipy.stats.skew(leads, axis=0) < 0, -1, 1)
+    return np.mean(leads * polarity, axis=1)
+
+
 # =============================================================================
 # Probabilistic Methods-Agreement via Convolution (ProMAC)
 # =============================================================================
-def _ecg_findpeaks_promac(signal, sampling_rate=1000, threshold=0.33, show=False, **kwargs):
+def _ecg_findpeaks_promac(signal, sampling_rate=1000, threshold=0.33, show=False, n_jobs=1, **kwargs):
 
-    x = np.zeros(len(signal))
+    signal = np.asarray(signal)
+
+    # Intermediates common to several methods are computed once, and passed to all of them (each one
+    # using those it needs)
+    shared = {"abs_signal": np.abs(signal)}
+
+    methods = [
+        _ecg_findpeaks_neurokit,
+        _ecg_findpeaks_gamboa,
+        _ecg_findpeaks_ssf,
+        _ecg_findpeaks_engzee,
+        _ecg_findpeaks_elgendi,
+        _ecg_findpeaks_kalidas,
+        _ecg_findpeaks_WT,
+        _ecg_findpeaks_rodrigues,
+    ]
 
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_neurokit, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_gamboa, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_ssf, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_engzee, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_elgendi, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_kalidas, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_WT, **kwargs)
-    x = _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, _ecg_findpeaks_rodrigues, **kwargs)
+    def detect(fun):
+        return fun(signal, sampling_rate=sampling_rate, shared=shared, **kwargs)
+
+    peaks = list(_parallel_map(detect, [(fun,) for fun in methods], n_jobs=n_jobs))
+
+    # The convolution being linear, the peaks of all methods are convolved at once
+    x = np.zeros(len(signal))
+    for method_peaks in peaks:
+        x = _ecg_findpeaks_promac_addmethod(x, method_peaks)
+    x = _ecg_findpeaks_promac_convolve(x, sampling_rate=sampling_rate)
 
     # Rescale
     x = x / np.max(x)
@@ -186,27 +234,29 @@ def _ecg_findpeaks_promac(signal, sampling_rate=1000, threshold=0.33, show=False
     peaks = signal_findpeaks(x, height_min=threshold)["Peaks"]
 
     if show is True:
+        import matplotlib.pyplot as plt
+
+        from ..signal import signal_plot
+
         signal_plot([signal, convoluted], standardize=True)
         [plt.axvline(x=peak, color="red", linestyle="--") for peak in peaks]  # pylint: disable=W0106
 
     return peaks
 
 
-def _ecg_findpeaks_promac_addmethod(signal, sampling_rate, x, fun, **kwargs):
-    peaks = fun(signal, sampling_rate=sampling_rate, **kwargs)
-    x += _ecg_findpeaks_promac_convolve(signal, peaks, sampling_rate=sampling_rate)
+def _ecg_findpeaks_promac_addmethod(x, peaks):
+    impulses = np.zeros(len(x))
+    impulses[peaks] = 1
+    x += impulses
     return x
 
 
-def _ecg_findpeaks_promac_convolve(signal, peaks, sampling_rate=1000):
-    x = np.zeros(len(signal))
-    x[peaks] = 1
-
+def _ecg_findpeaks_promac_convolve(x, sampling_rate=1000):
     # Because a typical QRS is roughly defined within about 100ms
     sd = sampling_rate / 10
     shape = scipy.stats.norm.pdf(np.linspace(-sd * 4, sd * 4, num=int(sd * 8)), loc=0, scale=sd)
 
-    return np.convolve(x, shape, "same")  # Return convolved
+    return scipy.signal.oaconvolve(x, shape, "same")  # Return convolved
 
 
 # =============================================================================
@@ -221,6 +271,7 @@ def _ecg_findpeaks_neurokit(
     minlenweight=0.4,
     mindelay=0.3,
     show=False,
+    shared=None,
 ):
     """All tune-able parameters are specified as keyword arguments.
 
@@ -228,6 +279,8 @@ def _ecg_findpeaks_neurokit(
 
     """
     if show is True:
+        import matplotlib.pyplot as plt
+
         __, (ax1, ax2) = plt.subplots(nrows=2, ncols=1, sharex=True)
 
     # Compute the ECG's gradient as well as the gradient threshold. Run with
@@ -293,7 +346,7 @@ def _ecg_findpeaks_neurokit(
 # =============================================================================
 # Pan & Tompkins (1985)
 # =============================================================================
-def _ecg_findpeaks_pantompkins(signal, sampling_rate=1000):
+def _ecg_findpeaks_pantompkins(signal, sampling_rate=1000, shared=None):
     """From https://github.com/berndporr/py-ecg-detectors/
 
     - Jiapu Pan and Willis J. Tompkins. A Real-Time QRS Detection Algorithm.
@@ -317,7 +370,7 @@ def _ecg_findpeaks_pantompkins(signal, sampling_rate=1000):
 # ===========================================================================
 # Nabian et al. (2018)
 # ===========================================================================
-def _ecg_findpeaks_nabian2018(signal, sampling_rate=1000):
+def _ecg_findpeaks_nabian2018(signal, sampling_rate=1000, shared=None):
     """R peak detection method by Nabian et al. (2018) inspired by the Pan-Tompkins
     algorithm.
 
@@ -329,25 +382,29 @@ def _ecg_findpeaks_nabian2018(signal, sampling_rate=1000):
     """
     window_size = int(0.4 * sampling_rate)
 
-    peaks = np.zeros(len(signal))
-
-    for i in range(1+window_size, len(signal)-window_size):
-        ecg_window = signal[i-window_size:i+window_size]
-        rpeak = np.argmax(ecg_window)
+    # A sample is marked as an R-peak when the next sample is the (first) maximum of the window
+    # signal[i - window_size : i + window_size]. This is equivalent to the next sample being strictly
+    # greater than the window_size + 1 samples before it, and at least as large as the ones after it.
+    signal = np.asarray(signal)
+    candidates = np.arange(window_size + 2, len(signal) - window_size + 1)
 
-        if i == (i-window_size-1+rpeak):
-            peaks[i] = 1
+    before = _ecg_findpeaks_rollingmax(signal, window_size + 1)[candidates - window_size - 1]
+    keep = signal[candidates] > before
+    if window_size > 2:
+        after = _ecg_findpeaks_rollingmax(signal, window_size - 2)[candidates + 1]
+        keep &= signal[candidates] >= after
 
-    rpeaks = np.where(peaks == 1)[0]
+    rpeaks = candidates[keep] - 1
 
     # min_distance = 200
 
     return rpeaks
 
+
 # =============================================================================
 # Hamilton (2002)
 # =============================================================================
-def _ecg_findpeaks_hamilton(signal, sampling_rate=1000):
+def _ecg_findpeaks_hamilton(signal, sampling_rate=1000, shared=None):
     """From https://github.com/berndporr/py-ecg-detectors/
 
     - Hamilton, Open Source ECG Analysis Software Documentation, E.P.Limited, 2002.
@@ -373,46 +430,42 @@ def _ecg_findpeaks_hamilton(signal, sampling_rate=1000):
 
     th = 0.0
 
-    i = 0
     idx = []
-    peaks = []
-
-    for i in range(len(ma)):  # pylint: disable=C0200,R1702
 
-        if i > 0 and i < len(ma) - 1 and ma[i - 1] < ma[i] and ma[i + 1] < ma[i]:  # pylint: disable=R1716
-            peak = i
-            peaks.append(peak)
-            if ma[peak] > th and (peak - QRS[-1]) > 0.3 * sampling_rate:
-                QRS.append(peak)
-                idx.append(peak)
-                s_pks.append(ma[peak])
-                if len(n_pks) > 8:
-                    s_pks.pop(0)
-                s_pks_ave = np.mean(s_pks)
-
-                if RR_ave != 0.0 and QRS[-1] - QRS[-2] > 1.5 * RR_ave:
-                    missed_peaks = peaks[idx[-2] + 1 : idx[-1]]
-                    for missed_peak in missed_peaks:
-                        if missed_peak - peaks[idx[-2]] > int(0.360 * sampling_rate) and ma[missed_peak] > 0.5 * th:
-                            QRS.append(missed_peak)
-                            QRS.sort()
-                            break
-
-                if len(QRS) > 2:
-                    RR.append(QRS[-1] - QRS[-2])
-                    if len(RR) > 8:
-                        RR.pop(0)
-                    RR_ave = int(np.mean(RR))
+    # The thresholds are only updated on the local maxima, so that we only iterate over them
+    peaks = np.nonzero((ma[1:-1] > ma[:-2]) & (ma[1:-1] > ma[2:]))[0] + 1
+
+    for n_peak, peak in enumerate(peaks):
+        if ma[peak] > th and (peak - QRS[-1]) > 0.3 * sampling_rate:
+            QRS.append(peak)
+            idx.append(peak)
+            s_pks.append(ma[peak])
+            if len(n_pks) > 8:
+                s_pks.pop(0)
+            s_pks_ave = np.mean(s_pks)
+
+            if RR_ave != 0.0 and QRS[-1] - QRS[-2] > 1.5 * RR_ave:
+                # Local maxima found so far, indexed by samples (as in the original implementation)
+                missed_peaks = peaks[: n_peak + 1][idx[-2] + 1 : idx[-1]]
+                for missed_peak in missed_peaks:
+                    if missed_peak - peaks[idx[-2]] > int(0.360 * sampling_rate) and ma[missed_peak] > 0.5 * th:
+                        QRS.append(missed_peak)
+                        QRS.sort()
+                        break
 
-            else:
-                n_pks.append(ma[peak])
-                if len(n_pks) > 8:
-                    n_pks.pop(0)
-                n_pks_ave = np.mean(n_pks)
+            if len(QRS) > 2:
+                RR.append(QRS[-1] - QRS[-2])
+                if len(RR) > 8:
+                    RR.pop(0)
+                RR_ave = int(np.mean(RR))
 
-            th = n_pks_ave + 0.45 * (s_pks_ave - n_pks_ave)
+        else:
+            n_pks.append(ma[peak])
+            if len(n_pks) > 8:
+                n_pks.pop(0)
+            n_pks_ave = np.mean(n_pks)
 
-            i += 1
+        th = n_pks_ave + 0.45 * (s_pks_ave - n_pks_ave)
 
     QRS.pop(0)
 
@@ -423,7 +476,7 @@ def _ecg_findpeaks_hamilton(signal, sampling_rate=1000):
 # =============================================================================
 # Slope Sum Function (SSF) - Zong et al. (2003)
 # =============================================================================
-def _ecg_findpeaks_ssf(signal, sampling_rate=1000, threshold=20, before=0.03, after=0.01):
+def _ecg_findpeaks_ssf(signal, sampling_rate=1000, threshold=20, before=0.03, after=0.01, shared=None):
     """From https://github.com/PIA-
     Group/BioSPPy/blob/e65da30f6379852ecb98f8e2e0c9b4b5175416c3/biosppy/signals/ecg.py#L448.
 
@@ -473,7 +526,7 @@ def _ecg_findpeaks_ssf(signal, sampling_rate=1000, threshold=20, before=0.03, af
 # =============================================================================
 # Christov (2004)
 # =============================================================================
-def _ecg_findpeaks_christov(signal, sampling_rate=1000):
+def _ecg_findpeaks_christov(signal, sampling_rate=1000, shared=None):
     """From https://github.com/berndporr/py-ecg-detectors/
 
     - Ivaylo I. Christov, Real time electrocardiogram QRS detection using combined adaptive threshold,
@@ -496,12 +549,7 @@ def _ecg_findpeaks_christov(signal, sampling_rate=1000):
 
     MA2 = scipy.signal.lfilter(b, a, MA1)
 
-    Y = []
-    for i in range(1, len(MA2) - 1):
-
-        diff = abs(MA2[i + 1] - MA2[i - 1])
-
-        Y.append(diff)
+    Y = np.abs(MA2[2:] - MA2[:-2])
 
     b = np.ones(int(0.040 * sampling_rate))
     b = b / int(0.040 * sampling_rate)
@@ -513,89 +561,16 @@ def _ecg_findpeaks_christov(signal, sampling_rate=1000):
     MA3[0:total_taps] = 0
 
     ms50 = int(0.05 * sampling_rate)
-    ms200 = int(0.2 * sampling_rate)
-    ms1200 = int(1.2 * sampling_rate)
     ms350 = int(0.35 * sampling_rate)
 
-    M = 0
-    newM5 = 0
-    M_list = []
-    MM = []
-    M_slope = np.linspace(1.0, 0.6, ms1200 - ms200)
-    F = 0
-    F_list = []
-    R = 0
-    RR = []
-    Rm = 0
-    R_list = []
-
-    MFR = 0
-    MFR_list = []
-
-    QRS = []
-
-    for i in range(len(MA3)):  # pylint: disable=C0200
-
-        # M
-        if i < 5 * sampling_rate:
-            M = 0.6 * np.max(MA3[: i + 1])
-            MM.append(M)
-            if len(MM) > 5:
-                MM.pop(0)
-
-        elif QRS and i < QRS[-1] + ms200:
-            newM5 = 0.6 * np.max(MA3[QRS[-1] : i])
-            if newM5 > 1.5 * MM[-1]:
-                newM5 = 1.1 * MM[-1]
-
-        elif QRS and i == QRS[-1] + ms200:
-            if newM5 == 0:
-                newM5 = MM[-1]
-            MM.append(newM5)
-            if len(MM) > 5:
-                MM.pop(0)
-            M = np.mean(MM)
-
-        elif QRS and i > QRS[-1] + ms200 and i < QRS[-1] + ms1200:
-
-            M = np.mean(MM) * M_slope[i - (QRS[-1] + ms200)]
-
-        elif QRS and i > QRS[-1] + ms1200:
-            M = 0.6 * np.mean(MM)
-
-        # F
-        if i > ms350:
-            F_section = MA3[i - ms350 : i]
-            max_latest = np.max(F_section[-ms50:])
-            max_earliest = np.max(F_section[:ms50])
-            F += (max_latest - max_earliest) / 150.0
+    # F (cumulated difference between the maxima of the latest and the earliest 50 ms of the last 350 ms)
+    F = np.zeros(len(MA3))
+    if len(MA3) > ms350 + 1:
+        rollingmax = _ecg_findpeaks_rollingmax(MA3, ms50)
+        i = np.arange(ms350 + 1, len(MA3))
+        F[ms350 + 1 :] = np.cumsum((rollingmax[i - ms50] - rollingmax[i - ms350]) / 150.0)
 
-        # R
-        if QRS and i < QRS[-1] + int((2.0 / 3.0 * Rm)):
-
-            R = 0
-
-        elif QRS and i > QRS[-1] + int((2.0 / 3.0 * Rm)) and i < QRS[-1] + Rm:
-
-            dec = (M - np.mean(MM)) / 1.4
-            R = 0 + dec
-
-        MFR = M + F + R
-        M_list.append(M)
-        F_list.append(F)
-        R_list.append(R)
-        MFR_list.append(MFR)
-
-        if not QRS and MA3[i] > MFR:
-            QRS.append(i)
-
-        elif QRS and i > QRS[-1] + ms200 and MA3[i] > MFR:
-            QRS.append(i)
-            if len(QRS) > 2:
-                RR.append(QRS[-1] - QRS[-2])
-                if len(RR) > 5:
-                    RR.pop(0)
-                Rm = int(np.mean(RR))
+    QRS, _ = _ecg_findpeaks_adaptivethreshold(MA3, sampling_rate, F=F)
 
     QRS.pop(0)
     QRS = np.array(QRS, dtype="int")
@@ -605,7 +580,7 @@ def _ecg_findpeaks_christov(signal, sampling_rate=1000):
 # =============================================================================
 # Gamboa (2008)
 # =============================================================================
-def _ecg_findpeaks_gamboa(signal, sampling_rate=1000, tol=0.002):
+def _ecg_findpeaks_gamboa(signal, sampling_rate=1000, tol=0.002, shared=None):
     """From https://github.com/PIA-
     Group/BioSPPy/blob/e65da30f6379852ecb98f8e2e0c9b4b5175416c3/biosppy/signals/ecg.py#L834.
 
@@ -650,7 +625,7 @@ def _ecg_findpeaks_gamboa(signal, sampling_rate=1000, tol=0.002):
 # =============================================================================
 # Engzee Modified (2012)
 # =============================================================================
-def _ecg_findpeaks_engzee(signal, sampling_rate=1000):
+def _ecg_findpeaks_engzee(signal, sampling_rate=1000, shared=None):
     """From https://github.com/berndporr/py-ecg-detectors/
 
     - C. Zeelenberg, A single scan algorithm for QRS detection and feature extraction, IEEE Comp.
@@ -662,102 +637,38 @@ def _ecg_findpeaks_engzee(signal, sampling_rate=1000):
     engzee_fake_delay = 0
 
     diff = np.zeros(len(signal))
-    for i in range(4, len(diff)):
-        diff[i] = signal[i] - signal[i - 4]
+    diff[4:] = signal[4:] - signal[:-4]
 
     ci = [1, 4, 6, 4, 1]
     low_pass = scipy.signal.lfilter(ci, 1, diff)
 
     low_pass[: int(0.2 * sampling_rate)] = 0
 
-    ms200 = int(0.2 * sampling_rate)
-    ms1200 = int(1.2 * sampling_rate)
     ms160 = int(0.16 * sampling_rate)
     neg_threshold = int(0.01 * sampling_rate)
 
-    M = 0
-    M_list = []
-    neg_m = []
-    MM = []
-    M_slope = np.linspace(1.0, 0.6, ms1200 - ms200)
+    QRS, M = _ecg_findpeaks_adaptivethreshold(low_pass, sampling_rate)
 
-    QRS = []
+    # Each threshold crossing opens a 160 ms window in which the signal must then stay below -M for more
+    # than 10 ms (a reset happens as soon as it goes back above -M).
     r_peaks = []
+    for qrs in QRS:
+        i = np.arange(qrs, min(qrs + ms160, len(low_pass)))
+        below = low_pass[i] < -M[i]
+        above = low_pass[i] > -M[i]
+        crossings = np.nonzero(below & (low_pass[i - 1] > -M[i]))[0]
+        if crossings.size == 0:
+            continue
 
-    counter = 0
-
-    thi_list = []
-    thi = False
-    thf_list = []
-    thf = False
-
-    for i in range(len(low_pass)):  # pylint: disable=C0200
-
-        # M
-        if i < 5 * sampling_rate:
-            M = 0.6 * np.max(low_pass[: i + 1])
-            MM.append(M)
-            if len(MM) > 5:
-                MM.pop(0)
-
-        elif QRS and i < QRS[-1] + ms200:
-
-            newM5 = 0.6 * np.max(low_pass[QRS[-1] : i])
-
-            if newM5 > 1.5 * MM[-1]:
-                newM5 = 1.1 * MM[-1]
-
-        elif QRS and i == QRS[-1] + ms200:
-            MM.append(newM5)
-            if len(MM) > 5:
-                MM.pop(0)
-            M = np.mean(MM)
-
-        elif QRS and i > QRS[-1] + ms200 and i < QRS[-1] + ms1200:
-
-            M = np.mean(MM) * M_slope[i - (QRS[-1] + ms200)]
-
-        elif QRS and i > QRS[-1] + ms1200:
-            M = 0.6 * np.mean(MM)
+        counter = np.cumsum(below[crossings[0] :])
+        peak = np.nonzero(counter > neg_threshold)[0]
+        reset = np.nonzero(above[crossings[0] :])[0]
+        if peak.size == 0 or (reset.size > 0 and reset[0] < peak[0]):
+            continue
 
-        M_list.append(M)
-        neg_m.append(-M)
-
-        if not QRS and low_pass[i] > M:
-            QRS.append(i)
-            thi_list.append(i)
-            thi = True
-
-        elif QRS and i > QRS[-1] + ms200 and low_pass[i] > M:
-            QRS.append(i)
-            thi_list.append(i)
-            thi = True
-
-        if thi and i < thi_list[-1] + ms160:
-            if low_pass[i] < -M and low_pass[i - 1] > -M:
-                # thf_list.append(i)
-                thf = True
-
-            if thf and low_pass[i] < -M:
-                thf_list.append(i)
-                counter += 1
-
-            elif low_pass[i] > -M and thf:
-                counter = 0
-                thi = False
-                thf = False
-
-        elif thi and i > thi_list[-1] + ms160:
-            counter = 0
-            thi = False
-            thf = False
-
-        if counter > neg_threshold:
-            unfiltered_section = signal[thi_list[-1] - int(0.01 * sampling_rate) : i]
-            r_peaks.append(engzee_fake_delay + np.argmax(unfiltered_section) + thi_list[-1] - int(0.01 * sampling_rate))
-            counter = 0
-            thi = False
-            thf = False
+        end = i[crossings[0] + peak[0]]
+        unfiltered_section = signal[qrs - int(0.01 * sampling_rate) : end]
+        r_peaks.append(engzee_fake_delay + np.argmax(unfiltered_section) + qrs - int(0.01 * sampling_rate))
 
     r_peaks = np.array(r_peaks, dtype="int")
     return r_peaks
@@ -766,7 +677,7 @@ def _ecg_findpeaks_engzee(signal, sampling_rate=1000):
 # =============================================================================
 # Stationary Wavelet Transform  (SWT) - Kalidas and Tamil (2017)
 # =============================================================================
-def _ecg_findpeaks_kalidas(signal, sampling_rate=1000):
+def _ecg_findpeaks_kalidas(signal, sampling_rate=1000, shared=None):
     """From https://github.com/berndporr/py-ecg-detectors/
 
     - Vignesh Kalidas and Lakshman Tamil (2017). Real-time QRS detector using Stationary Wavelet Transform
@@ -816,7 +727,7 @@ def _ecg_findpeaks_kalidas(signal, sampling_rate=1000):
 # =============================================================================
 # Elgendi et al. (2010)
 # =============================================================================
-def _ecg_findpeaks_elgendi(signal, sampling_rate=1000):
+def _ecg_findpeaks_elgendi(signal, sampling_rate=1000, shared=None):
     """From https://github.com/berndporr/py-ecg-detectors/
 
     - Elgendi, Mohamed & Jonkman, Mirjam & De Boer, Friso. (2010). Frequency Bands Effects on QRS Detection.
@@ -824,34 +735,33 @@ def _ecg_findpeaks_elgendi(signal, sampling_rate=1000):
       428-431.
 
     """
+    if shared is not None and "abs_signal" in shared:
+        abs_signal = shared["abs_signal"]
+    else:
+        abs_signal = abs(signal)
 
     window1 = int(0.12 * sampling_rate)
-    mwa_qrs = _ecg_findpeaks_MWA(abs(signal), window1)
+    mwa_qrs = _ecg_findpeaks_MWA(abs_signal, window1)
 
     window2 = int(0.6 * sampling_rate)
-    mwa_beat = _ecg_findpeaks_MWA(abs(signal), window2)
+    mwa_beat = _ecg_findpeaks_MWA(abs_signal, window2)
 
-    blocks = np.zeros(len(signal))
-    block_height = np.max(signal)
+    # Blocks of interest (if the signal's maximum is 0, the blocks cannot be told apart from the rest)
+    blocks = mwa_qrs > mwa_beat
+    if np.max(signal) == 0:
+        blocks[:] = False
+    starts = np.nonzero(~blocks[:-1] & blocks[1:])[0] + 1
+    ends = np.nonzero(blocks[:-1] & ~blocks[1:])[0]
 
-    for i in range(len(mwa_qrs)):  # pylint: disable=C0200
-        blocks[i] = block_height if mwa_qrs[i] > mwa_beat[i] else 0
     QRS = []
-
-    for i in range(1, len(blocks)):
-        if blocks[i - 1] == 0 and blocks[i] == block_height:
-            start = i
-
-        elif blocks[i - 1] == block_height and blocks[i] == 0:
-            end = i - 1
-
-            if end - start > int(0.08 * sampling_rate):
-                detection = np.argmax(signal[start : end + 1]) + start
-                if QRS:
-                    if detection - QRS[-1] > int(0.3 * sampling_rate):
-                        QRS.append(detection)
-                else:
+    for start, end in zip(starts, ends):
+        if end - start > int(0.08 * sampling_rate):
+            detection = np.argmax(signal[start : end + 1]) + start
+            if QRS:
+                if detection - QRS[-1] > int(0.3 * sampling_rate):
                     QRS.append(detection)
+            else:
+                QRS.append(detection)
 
     QRS = np.array(QRS, dtype="int")
     return QRS
@@ -861,7 +771,7 @@ def _ecg_findpeaks_elgendi(signal, sampling_rate=1000):
 # Continuous Wavelet Transform (CWT) - Martinez et al. (2003)
 # =============================================================================
 #
-def _ecg_findpeaks_WT(signal, sampling_rate=1000):
+def _ecg_findpeaks_WT(signal, sampling_rate=1000, shared=None):
     # Try loading pywt
     try:
         import pywt
@@ -927,7 +837,7 @@ def _ecg_findpeaks_WT(signal, sampling_rate=1000):
 # =============================================================================
 
 
-def _ecg_findpeaks_rodrigues(signal, sampling_rate=1000):
+def _ecg_findpeaks_rodrigues(signal, sampling_rate=1000, shared=None):
     """Segmenter by Tiago Rodrigues, inspired by on Gutierrez-Rivas (2015) and Sadhukhan (2012).
 
     References
@@ -953,8 +863,9 @@ def _ecg_findpeaks_rodrigues(signal, sampling_rate=1000):
     Ramptotal = 0
 
     # Double derivative squared
-    diff_ecg = [signal[i] - signal[i - Nd] for i in range(Nd, len(signal))]
-    ddiff_ecg = [diff_ecg[i] - diff_ecg[i - 1] for i in range(1, len(diff_ecg))]
+    signal = np.asarray(signal)
+    diff_ecg = signal[Nd:] - signal[: len(signal) - Nd]
+    ddiff_ecg = np.diff(diff_ecg)
     squar = np.square(ddiff_ecg)
 
     # Integrate moving window
@@ -1001,28 +912,144 @@ def _ecg_findpeaks_rodrigues(signal, sampling_rate=1000):
 def _ecg_findpeaks_MWA(signal, window_size):
     """From https://github.com/berndporr/py-ecg-detectors/"""
 
+    signal = np.asarray(signal)
     mwa = np.zeros(len(signal))
+    if len(signal) == 0:
+        return mwa
     sums = np.cumsum(signal)
 
-    def get_mean(begin, end):
-        if begin == 0:
-            return sums[end - 1] / end
+    # Growing window over the first samples
+    mwa[0] = signal[0]
+    for i in range(1, min(window_size, len(signal))):
+        mwa[i] = np.mean(signal[0:i])
+
+    # Sliding window (mean of the previous window_size samples)
+    if window_size < len(signal):
+        sums = np.concatenate([[0], sums])
+        mwa[window_size:] = (sums[window_size:-1] - sums[: -window_size - 1]) / window_size
+
+    return mwa
+
+
+def _ecg_findpeaks_adaptivethreshold(signal, sampling_rate=1000, F=None):
+    """Adaptive threshold shared by Christov (2004) and Engzee (2012).
+
+    The threshold M (to which Christov adds F and R) is updated on every sample, but its value between
+    two detections only depends on the time elapsed since the last one. The signal is thus processed by
+    segments in which the threshold is computed at once, until the next crossing. The first 5 seconds
+    (during which M is initialized) are processed sample by sample.
+
+    Returns the samples at which the signal crosses the threshold, and the value of M for each sample.
+
+    """
+    christov = F is not None
+    if F is None:
+        F = np.zeros(len(signal))
 
-        dif = sums[end - 1] - sums[begin - 1]
-        return dif / (end - begin)
+    ms200 = int(0.2 * sampling_rate)
+    ms1200 = int(1.2 * sampling_rate)
 
-    for i in range(len(signal)):  # pylint: disable=C0200
-        if i < window_size:
-            section = signal[0:i]
+    M = 0
+    newM5 = 0
+    MM = []
+    M_slope = np.linspace(1.0, 0.6, ms1200 - ms200)
+    R = 0
+    RR = []
+    Rm = 0
+    QRS = []
+    M_list = np.zeros(len(signal))
+
+    def detect(i):
+        nonlocal Rm
+        QRS.append(i)
+        if len(QRS) > 2:
+            RR.append(QRS[-1] - QRS[-2])
+            if len(RR) > 5:
+                RR.pop(0)
+            Rm = int(np.mean(RR))
+
+    # Initialization, sample by sample
+    maxima = np.maximum.accumulate(signal)
+    i = 0
+    while i < min(5 * sampling_rate, len(signal)):
+        M = 0.6 * maxima[i]
+        MM.append(M)
+        if len(MM) > 5:
+            MM.pop(0)
+
+        if christov and QRS and i < QRS[-1] + int((2.0 / 3.0 * Rm)):
+            R = 0
+        elif christov and QRS and i > QRS[-1] + int((2.0 / 3.0 * Rm)) and i < QRS[-1] + Rm:
+            R = 0 + (M - np.mean(MM)) / 1.4
+
+        M_list[i] = M
+        threshold = M + F[i] + R if christov else M
+        if (not QRS or i > QRS[-1] + ms200) and signal[i] > threshold:
+            detect(i)
+        i += 1
+
+    # Segments in which the threshold is computed at once
+    while i < len(signal):
+        if QRS:
+            q = QRS[-1]
+            r1, r2 = q + int((2.0 / 3.0 * Rm)), q + Rm
+            bounds = [q + ms200, q + ms200 + 1, q + ms1200, q + ms1200 + 1, r1, r1 + 1, r2, len(signal)]
+            end = min(bound for bound in bounds if bound > i)
         else:
-            section = get_mean(i - window_size, i)
+            q = r1 = r2 = None
+            end = len(signal)
 
-        if i != 0:
-            mwa[i] = np.mean(section)
+        # M
+        if q is not None and i < q + ms200:
+            newM5 = 0.6 * np.max(signal[q : end - 1])
+            if newM5 > 1.5 * MM[-1]:
+                newM5 = 1.1 * MM[-1]
+        elif q is not None and i == q + ms200:
+            if christov and newM5 == 0:
+                newM5 = MM[-1]
+            MM.append(newM5)
+            if len(MM) > 5:
+                MM.pop(0)
+            M = np.mean(MM)
+        elif q is not None and i > q + ms200 and i < q + ms1200:
+            M = np.mean(MM) * M_slope[i - (q + ms200) : end - (q + ms200)]
+        elif q is not None and i > q + ms1200:
+            M = 0.6 * np.mean(MM)
+        M = np.full(end - i, M) if np.ndim(M) == 0 else M
+
+        # R
+        if christov and q is not None and i < r1:
+            R = np.zeros(end - i)
+        elif christov and q is not None and i > r1 and i < r2:
+            R = 0 + (M - np.mean(MM)) / 1.4
         else:
-            mwa[i] = signal[i]
+            R = np.full(end - i, R) if np.ndim(R) == 0 else np.full(end - i, R[-1])
 
-    return mwa
+        # Crossings
+        threshold = M + F[i:end] + R if christov else M
+        crossing = signal[i:end] > threshold
+        if q is not None:
+            crossing &= np.arange(i, end) > q + ms200
+        crossing = np.nonzero(crossing)[0]
+        if crossing.size > 0:
+            end = i + crossing[0] + 1
+
+        M_list[i:end] = M[: end - i]
+        M, R = M[end - i - 1], R[end - i - 1]
+        if crossing.size > 0:
+            detect(end - 1)
+        i = end
+
+    return QRS, M_list
+
+
+def _ecg_findpeaks_rollingmax(signal, window_size):
+    """Maximum of each window of `window_size` samples, i.e., ``out[i] = max(signal[i : i + window_size])``.
+
+    Only the first ``len(signal) - window_size + 1`` values are defined (the others are padded).
+
+    """
+    return scipy.ndimage.maximum_filter1d(signal, window_size, origin=-(window_size // 2))
 
 
 def _ecg_findpeaks_peakdetect(detection, sampling_rate=1000):
@@ -2,10 +2,10 @@
 import numpy as np
 import pandas as pd
 
-from ..hrv import hrv
+from ..hrv import hrv, hrv_batch
 
 
-def ecg_intervalrelated(data, sampling_rate=1000):
+def ecg_intervalrelated(data, sampling_rate=1000, n_jobs=1):
     """Performs ECG analysis on longer periods of data (typically > 10 seconds), such as resting-state data.
 
     Parameters
@@ -16,6 +16,9 @@ def ecg_intervalrelated(data, sampling_rate=1000):
         separately processed DataFrames.
     sampling_rate : int
         The sampling frequency of the signal (in Hz, i.e., samples/second).
+    n_jobs : int
+        If ``data`` is a dict, the number of processes over which the HRV of the intervals is computed
+        (see ``hrv_batch()``). -1 uses as many processes as available. Defaults to 1 (sequential).
 
     Returns
     -------
@@ -30,7 +33,7 @@ def ecg_intervalrelated(data, sampling_rate=1000):
 
     See Also
     --------
-    bio_process, ecg_eventrelated
+    bio_process, ecg_eventrelated, hrv_batch
 
     Examples
     ----------
@@ -75,6 +78,7 @@ def ecg_intervalrelated(data, sampling_rate=1000):
         ecg_intervals = pd.DataFrame.from_dict(intervals, orient="index").T
 
     elif isinstance(data, dict):
+        rpeaks = {}
         for index in data:
             intervals[index] = {}  # Initialize empty container
 
@@ -84,10 +88,13 @@ def ecg_intervalrelated(data, sampling_rate=1000):
             # Rate
             intervals[index] = _ecg_intervalrelated_formatinput(data[index], intervals[index])
 
-            # HRV
-            intervals[index] = _ecg_intervalrelated_hrv(data[index], sampling_rate, intervals[index])
+            # R-peaks
+            rpeaks[index] = _ecg_intervalrelated_rpeaks(data[index])
 
+        # HRV (of all the intervals at once)
         ecg_intervals = pd.DataFrame.from_dict(intervals, orient="index")
+        results = hrv_batch(rpeaks, sampling_rate=sampling_rate, n_jobs=n_jobs, errors="raise")
+        ecg_intervals = pd.concat([ecg_intervals, results], axis=1)
 
     return ecg_intervals
 
@@ -115,6 +122,17 @@ def _ecg_intervalrelated_formatinput(data, output={}):
 
 def _ecg_intervalrelated_hrv(data, sampling_rate, output={}):
 
+    rpeaks = _ecg_intervalrelated_rpeaks(data)
+
+    results = hrv(rpeaks, sampling_rate=sampling_rate)
+    for column in results.columns:
+        output[column] = float(results[column])
+
+    return output
+
+
+def _ecg_intervalrelated_rpeaks(data):
+
     # Sanitize input
     colnames = data.columns.values
     if len([i for i in colnames if "ECG_R_Peaks" in i]) == 0:
@@ -128,8 +146,4 @@ def _ecg_intervalrelated_hrv(data, sampling_rate, output={}):
     rpeaks = np.where(data["ECG_R_Peaks"].values)[0]
     rpeaks = {"ECG_R_Peaks": rpeaks}
 
-    results = hrv(rpeaks, sampling_rate=sampling_rate)
-    for column in results.columns:
-        output[column] = float(results[column])
-
-    return output
+    return rpeaks
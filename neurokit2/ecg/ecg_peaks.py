@@ -4,15 +4,17 @@ from ..signal import signal_fixpeaks, signal_formatpeaks
 from .ecg_findpeaks import ecg_findpeaks
 
 
-def ecg_peaks(ecg_cleaned, sampling_rate=1000, method="neurokit", correct_artifacts=False):
+def ecg_peaks(ecg_cleaned, sampling_rate=1000, method="neurokit", correct_artifacts=False, n_jobs=1):
     """Find R-peaks in an ECG signal.
 
     Find R-peaks in an ECG signal using the specified method.
 
     Parameters
     ----------
-    ecg_cleaned : Union[list, np.array, pd.Series]
-        The cleaned ECG channel as returned by `ecg_clean()`.
+    ecg_cleaned : Union[list, np.array, pd.Series, pd.DataFrame]
+        The cleaned ECG channel as returned by `ecg_clean()`. Several leads can be passed as a 2D array
+        or DataFrame of shape (n_samples, n_leads), in which case the R-peaks common to all the leads are
+        detected at once (see `ecg_findpeaks()`).
     sampling_rate : int
         The sampling frequency of `ecg_signal` (in Hz, i.e., samples/second).
         Defaults to 1000.
@@ -23,6 +25,9 @@ def ecg_peaks(ecg_cleaned, sampling_rate=1000, method="neurokit", correct_artifa
         Whether or not to identify artifacts as defined by Jukka A. Lipponen & Mika P. Tarvainen (2019):
         A robust algorithm for heart rate variability time series artefact correction using novel beat
         classification, Journal of Medical Engineering & Technology, DOI: 10.1080/03091902.2019.1640306.
+    n_jobs : int
+        The number of detectors run concurrently by the 'promac' method. -1 uses as many workers as
+        available. See `ecg_findpeaks()`.
 
     Returns
     -------
@@ -68,7 +73,7 @@ def ecg_peaks(ecg_cleaned, sampling_rate=1000, method="neurokit", correct_artifa
       for Finger Based ECG Biometrics", BIOSIGNALS 2012, pp. 49-54, 2012.
 
     """
-    rpeaks = ecg_findpeaks(ecg_cleaned, sampling_rate=sampling_rate, method=method)
+    rpeaks = ecg_findpeaks(ecg_cleaned, sampling_rate=sampling_rate, method=method, n_jobs=n_jobs)
 
     if correct_artifacts:
         _, rpeaks = signal_fixpeaks(rpeaks, sampling_rate=sampling_rate, iterative=True, method="Kubios")
@@ -0,0 +1,323 @@
+# - * - coding: utf-8 - * -
+import numpy as np
+import scipy.signal
+
+
+class ECGPeakStream:
+    """Online R-peak detection on a chunked ECG signal.
+
+    Detects R-peaks in an ECG signal that arrives in successive chunks (e.g., the packets sent by a
+    bedside monitor). The state of the filters, of the moving-window integrators and of the adaptive
+    thresholds is kept between chunks, so that each call to ``push()`` only processes the new samples
+    and returns the R-peaks that have been confirmed since the previous call.
+
+    The detected R-peaks do not depend on how the signal is chunked: they are identical to the ones
+    obtained by running ``ecg_clean()`` and ``ecg_findpeaks()`` (with the same method) on the whole
+    recording. Only the methods that are causal (i.e., that do not need the whole signal to detect a
+    peak) are supported.
+
+    Parameters
+    ----------
+    sampling_rate : int
+        The sampling frequency of the ECG signal (in Hz, i.e., samples/second). Defaults to 1000.
+    method : str
+        The algorithm to be used for R-peak detection. Can be one of 'pantompkins1985' (default) or
+        'elgendi2010'.
+    clean : bool
+        If True (default), the chunks are considered as raw ECG and are cleaned with the filter of
+        ``ecg_clean()`` corresponding to `method`. If False, they must already be cleaned.
+
+    Attributes
+    ----------
+    n_samples : int
+        The number of samples pushed so far.
+
+    See Also
+    --------
+    ecg_clean, ecg_findpeaks, ecg_peaks
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import neurokit2 as nk
+    >>>
+    >>> ecg = nk.ecg_simulate(duration=20, sampling_rate=250)
+    >>> stream = nk.ECGPeakStream(sampling_rate=250, method="pantompkins1985")
+    >>>
+    >>> # Push the signal in 250 ms packets
+    >>> rpeaks = [stream.push(packet) for packet in np.array_split(ecg, 80)]
+    >>> rpeaks = np.concatenate(rpeaks)
+    >>>
+    >>> # Same as the batch detection
+    >>> cleaned = nk.ecg_clean(ecg, sampling_rate=250, method="pantompkins1985")
+    >>> batch = nk.ecg_findpeaks(cleaned, sampling_rate=250, method="pantompkins1985")["ECG_R_Peaks"]
+    >>> np.array_equal(rpeaks, batch)
+    True
+
+    References
+    ----------
+    - Jiapu Pan and Willis J. Tompkins. A Real-Time QRS Detection Algorithm. In: IEEE Transactions on
+      Biomedical Engineering BME-32.3 (1985), pp. 230–236.
+
+    - Elgendi, Mohamed & Jonkman, Mirjam & De Boer, Friso. (2010). Frequency Bands Effects on QRS Detection.
+      The 3rd International Conference on Bio-inspired Systems and Signal Processing (BIOSIGNALS2010).
+      428-431.
+
+    """
+
+    def __init__(self, sampling_rate=1000, method="pantompkins1985", clean=True):
+        self.sampling_rate = sampling_rate
+        self.method = method.lower()  # remove capitalised letters
+        self.clean = clean
+
+        if self.method in ["pantompkins", "pantompkins1985"]:
+            self._method = "pantompkins1985"
+            f1, f2, order = 5 / sampling_rate, 15 / sampling_rate, 1  # Same filter as in ecg_clean()
+        elif self.method in ["elgendi", "elgendi2010"]:
+            self._method = "elgendi2010"
+            f1, f2, order = 8 / sampling_rate, 20 / sampling_rate, 2  # Same filter as in ecg_clean()
+        else:
+            raise ValueError(
+                "NeuroKit error: ECGPeakStream(): 'method' should be one of 'pantompkins1985' or 'elgendi2010'."
+            )
+        self._b, self._a = scipy.signal.butter(order, [f1 * 2, f2 * 2], btype="bandpass")
+
+        self.reset()
+
+    def reset(self):
+        """Forget all the past samples to start a new recording."""
+        self.n_samples = 0
+        self._zi = np.zeros(max(len(self._a), len(self._b)) - 1)
+
+        if self._method == "pantompkins1985":
+            self._last = None  # Last cleaned sample (for the derivative)
+            self._mwa = _StreamMWA(int(0.12 * self.sampling_rate))
+            self._peakdetect = _StreamPeakdetect(self.sampling_rate)
+        else:
+            self._mwa_qrs = _StreamMWA(int(0.12 * self.sampling_rate))
+            self._mwa_beat = _StreamMWA(int(0.6 * self.sampling_rate))
+            self._block = None  # Whether the previous sample was in a block of interest
+            self._start = None  # Onset of the current block
+            self._buffer = np.array([])  # Cleaned signal since the onset of the current block
+            self._qrs = None  # Last R-peak
+
+    def push(self, chunk):
+        """Process a new chunk of signal.
+
+        Parameters
+        ----------
+        chunk : Union[list, np.array, pd.Series]
+            The new samples of the ECG signal.
+
+        Returns
+        -------
+        array
+            The samples (counted from the beginning of the stream) of the R-peaks that have been
+            confirmed with this chunk.
+
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.size == 0:
+            return np.array([], dtype="int")
+
+        if self.clean is True:
+            chunk, self._zi = scipy.signal.lfilter(self._b, self._a, chunk, zi=self._zi)
+
+        if self._method == "pantompkins1985":
+            rpeaks = self._push_pantompkins(chunk)
+        else:
+            rpeaks = self._push_elgendi(chunk)
+
+        self.n_samples += len(chunk)
+        return np.array(rpeaks, dtype="int")
+
+    # =============================================================================
+    # Pan & Tompkins (1985)
+    # =============================================================================
+    def _push_pantompkins(self, chunk):
+        # Derivative (the first sample of the stream has none)
+        if self._last is not None:
+            diff = np.diff(np.concatenate([[self._last], chunk]))
+        else:
+            diff = np.diff(chunk)
+        self._last = chunk[-1]
+
+        # Moving-window integration of the squared derivative
+        start = self._mwa.n_samples
+        mwa = self._mwa.push(diff * diff)
+        mwa[: max(0, int(0.2 * self.sampling_rate) - start)] = 0
+
+        return self._peakdetect.push(mwa)
+
+    # =============================================================================
+    # Elgendi et al. (2010)
+    # =============================================================================
+    def _push_elgendi(self, chunk):
+        mwa_qrs = self._mwa_qrs.push(np.abs(chunk))
+        mwa_beat = self._mwa_beat.push(np.abs(chunk))
+        blocks = mwa_qrs > mwa_beat
+
+        # Onsets and offsets of the blocks of interest
+        if self._block is None:
+            changes = np.nonzero(blocks[:-1] != blocks[1:])[0] + 1
+        else:
+            changes = np.nonzero(np.concatenate([[self._block], blocks[:-1]]) != blocks)[0]
+        self._block = blocks[-1]
+
+        buffer_start = self.n_samples - len(self._buffer)
+        signal = np.concatenate([self._buffer, chunk])
+
+        rpeaks = []
+        for change in changes:
+            i = self.n_samples + change
+            if blocks[change]:
+                self._start = i
+                continue
+
+            end = i - 1
+            if self._start is None or end - self._start <= int(0.08 * self.sampling_rate):
+                continue
+            detection = np.argmax(signal[self._start - buffer_start : end + 1 - buffer_start]) + self._start
+            if self._qrs is None or detection - self._qrs > int(0.3 * self.sampling_rate):
+                self._qrs = detection
+                rpeaks.append(detection)
+
+        # Only keep the current block in memory
+        if self._block and self._start is not None:
+            self._buffer = signal[self._start - buffer_start :]
+        else:
+            self._buffer = np.array([])
+
+        return rpeaks
+
+
+# =============================================================================
+# Utilities
+# =============================================================================
+class _StreamMWA:
+    """Streaming version of ``_ecg_findpeaks_MWA()``, giving the same results as on the whole signal."""
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self.n_samples = 0
+        self._head = np.array([])  # First samples (to average the incomplete windows)
+        self._sums = np.array([])  # Last cumulative sums
+
+    def push(self, signal):
+        n0 = self.n_samples
+        w = self.window_size
+
+        # Cumulative sums, continuing the previous ones (so that they are the same as on the whole signal)
+        if self._sums.size > 0:
+            sums = np.cumsum(np.concatenate([[self._sums[-1]], signal]))[1:]
+        else:
+            sums = np.cumsum(signal)
+        sums = np.concatenate([self._sums, sums])
+        offset = n0 - len(self._sums)  # Sample of sums[0]
+        if n0 < w:
+            self._head = np.concatenate([self._head, signal[: w - n0]])
+
+        mwa = np.zeros(len(signal))
+        idx = np.arange(n0, n0 + len(signal))
+
+        # Full windows
+        full = idx > w
+        mwa[full] = (sums[idx[full] - 1 - offset] - sums[idx[full] - w - 1 - offset]) / w
+        if w in idx:
+            mwa[w - n0] = sums[w - 1 - offset] / w
+
+        # Incomplete windows
+        for i in idx[idx < w]:
+            mwa[i - n0] = np.mean(self._head[0:i]) if i != 0 else signal[0]
+
+        self.n_samples += len(signal)
+        self._sums = sums[-(w + 1) :]
+        return mwa
+
+
+class _StreamPeakdetect:
+    """Streaming version of ``_ecg_findpeaks_peakdetect()``, giving the same results as on the whole signal.
+
+    Only the local maxima of the detection signal can change the state of the detector, so that they
+    are the only samples that are iterated over.
+
+    """
+
+    def __init__(self, sampling_rate=1000):
+        self.sampling_rate = sampling_rate
+        self.min_distance = int(0.25 * sampling_rate)
+
+        self.signal_peaks = [0]
+        self.SPKI = 0.0
+        self.NPKI = 0.0
+        self.threshold_I1 = 0.0
+        self.threshold_I2 = 0.0
+        self.RR_missed = 0
+        self.index = 0
+        self.indexes = []
+        self.peaks = []  # Local maxima (and their height) since the last signal peak
+        self.peaks_start = 0  # Index of peaks[0]
+
+        self._tail = np.array([])  # Last two samples (to find the local maxima across chunks)
+        self._tail_start = 0
+
+    def push(self, detection):
+        detection = np.concatenate([self._tail, detection])
+        start = self._tail_start
+
+        # Local maxima (the last sample can't be tested yet)
+        locmax = np.nonzero((detection[:-2] < detection[1:-1]) & (detection[2:] < detection[1:-1]))[0] + 1
+
+        n_before = len(self.signal_peaks)
+        for i in locmax:
+            self._update(start + i, detection[i])
+
+        self._tail = detection[-2:]
+        self._tail_start = start + len(detection) - len(self._tail)
+
+        # Newly confirmed peaks (only the last 9 are needed to estimate the RR interval)
+        new = self.signal_peaks[n_before:]
+        self.signal_peaks = self.signal_peaks[-10:]
+        return new
+
+    def _update(self, peak, height):
+        self.peaks.append((peak, height))
+
+        if height > self.threshold_I1 and (peak - self.signal_peaks[-1]) > 0.3 * self.sampling_rate:
+
+            self.signal_peaks.append(peak)
+            self.indexes.append(self.index)
+            self.SPKI = 0.125 * height + 0.875 * self.SPKI
+            if self.RR_missed != 0 and self.signal_peaks[-1] - self.signal_peaks[-2] > self.RR_missed:
+                missed_section_peaks = self.peaks[
+                    self.indexes[-2] + 1 - self.peaks_start : self.indexes[-1] - self.peaks_start
+                ]
+                missed_section_peaks2 = []
+                for missed_peak, missed_height in missed_section_peaks:
+                    if missed_peak - self.signal_peaks[-2] > self.min_distance:
+                        if self.signal_peaks[-1] - missed_peak > self.min_distance:
+                            if missed_height > self.threshold_I2:
+                                missed_section_peaks2.append((missed_peak, missed_height))
+
+                if missed_section_peaks2:
+                    missed_peak = missed_section_peaks2[np.argmax([h for _, h in missed_section_peaks2])][0]
+                    self.signal_peaks.append(self.signal_peaks[-1])
+                    self.signal_peaks[-2] = missed_peak
+
+            # Forget the local maxima that can't be missed peaks anymore
+            self.peaks = self.peaks[self.indexes[-1] + 1 - self.peaks_start :]
+            self.peaks_start = self.indexes[-1] + 1
+            self.indexes = self.indexes[-2:]
+
+        else:
+            self.NPKI = 0.125 * height + 0.875 * self.NPKI
+
+        self.threshold_I1 = self.NPKI + 0.25 * (self.SPKI - self.NPKI)
+        self.threshold_I2 = 0.5 * self.threshold_I1
+
+        if len(self.signal_peaks) > 8:
+            RR = np.diff(self.signal_peaks[-9:])
+            RR_ave = int(np.mean(RR))
+            self.RR_missed = int(1.66 * RR_ave)
+
+        self.index += 1
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
+import numpy as np
 import pandas as pd
 
+from ..misc import as_vector
+from ..misc.process_steps import _process_steps
 from ..signal import signal_rate
 from .ecg_clean import ecg_clean
 from .ecg_delineate import ecg_delineate
@@ -9,11 +12,16 @@ from .ecg_phase import ecg_phase
 from .ecg_quality import ecg_quality
 
 
-def ecg_process(ecg_signal, sampling_rate=1000, method="neurokit"):
+def ecg_process(
+    ecg_signal, sampling_rate=1000, method="neurokit", steps=None, chunk_size=None, overlap=10, path=None
+):
     """Process an ECG signal.
 
     Convenience function that automatically processes an ECG signal.
 
+    Long recordings can be processed by chunks (see ``chunk_size``), so that the memory used by the
+    processing steps depends on the size of the chunks rather than on the length of the recording.
+
     Parameters
     ----------
     ecg_signal : Union[list, np.array, pd.Series]
@@ -23,6 +31,25 @@ def ecg_process(ecg_signal, sampling_rate=1000, method="neurokit"):
         Defaults to 1000.
     method : str
         The processing pipeline to apply. Defaults to "neurokit".
+    steps : list
+        The processing steps to run, among "peaks", "rate", "quality", "delineate" and "phase" (the
+        signal is always cleaned). The steps on which they depend are run as well, but their columns are
+        not added to the signals (their results, such as the R-peaks, are still returned in the info
+        dictionary). If None (default), all steps are run. For instance, ``steps=["peaks", "rate"]``
+        skips the quality assessment, the delineation and the cardiac phase.
+    chunk_size : float
+        If not None, the signal is processed by consecutive chunks of ``chunk_size`` seconds, each
+        extended by ``overlap`` seconds on both sides to avoid edge effects. The results of each chunk
+        are then only kept within the chunk itself, and R-peaks detected twice at the boundaries are
+        removed (with their waves). A last chunk shorter than half of ``chunk_size`` is merged into
+        the previous one. Note that the signal quality is then assessed relative to the average beat of each
+        chunk rather than of the whole recording.
+    overlap : float
+        The duration (in seconds) of the margins added to each chunk. Only used if ``chunk_size`` is
+        not None. Defaults to 10.
+    path : str
+        If not None (and ``chunk_size`` is given), the signals of each chunk are appended to a CSV file
+        at this path as soon as they are processed, instead of being kept in memory.
 
     Returns
     -------
@@ -71,9 +98,12 @@ def ecg_process(ecg_signal, sampling_rate=1000, method="neurokit"):
 
         - *"ECG_Ventricular_PhaseCompletion"*: cardiac phase (ventricular) completion, expressed in
           percentage (from 0 to 1), representing the stage of the current cardiac phase.
+
+        If ``path`` is given, the signals are written to that file and None is returned instead.
     info : dict
         A dictionary containing the samples at which the R-peaks occur, accessible with the key
-        "ECG_Peaks".
+        "ECG_R_Peaks", and (if the delineation is run) those of the waves of each heartbeat (see
+        ``ecg_delineate()``), e.g., "ECG_P_Peaks" or "ECG_T_Offsets".
 
     See Also
     --------
@@ -87,28 +117,158 @@ def ecg_process(ecg_signal, sampling_rate=1000, method="neurokit"):
     >>> signals, info = nk.ecg_process(ecg, sampling_rate=1000)
     >>> nk.ecg_plot(signals) #doctest: +ELLIPSIS
     <Figure ...>
+    >>>
+    >>> # Long recordings can be processed by chunks
+    >>> ecg = nk.ecg_simulate(duration=120, sampling_rate=250, heart_rate=70)
+    >>> signals, info = nk.ecg_process(ecg, sampling_rate=250, chunk_size=30, overlap=5)
+    >>>
+    >>> # Only run the steps that are needed
+    >>> signals, info = nk.ecg_process(ecg, sampling_rate=250, steps=["peaks", "rate"])
+    >>> list(signals.columns)
+    ['ECG_Raw', 'ECG_Clean', 'ECG_Rate', 'ECG_R_Peaks']
 
     """
+    if chunk_size is not None:
+        return _ecg_process_chunked(
+            ecg_signal,
+            sampling_rate=sampling_rate,
+            method=method,
+            steps=steps,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            path=path,
+        )
+
+    return _ecg_process(ecg_signal, sampling_rate=sampling_rate, method=method, steps=steps)
+
+
+# =============================================================================
+# Internals
+# =============================================================================
+def _ecg_process(ecg_signal, sampling_rate=1000, method="neurokit", steps=None):
+
+    run, output = _process_steps(
+        steps,
+        ["peaks", "rate", "quality", "delineate", "phase"],
+        {"rate": ["peaks"], "delineate": ["peaks"], "phase": ["peaks", "delineate"]},
+        function="ecg_process",
+    )
+
     ecg_cleaned = ecg_clean(ecg_signal, sampling_rate=sampling_rate, method=method)
+    signals = {"ECG_Raw": ecg_signal, "ECG_Clean": ecg_cleaned}
+    info = {}
+
     # R-peaks
-    instant_peaks, rpeaks, = ecg_peaks(
-        ecg_cleaned=ecg_cleaned, sampling_rate=sampling_rate, method=method, correct_artifacts=True
-    )
+    if "peaks" in run:
+        instant_peaks, rpeaks, = ecg_peaks(
+            ecg_cleaned=ecg_cleaned, sampling_rate=sampling_rate, method=method, correct_artifacts=True
+        )
+        info = rpeaks
 
-    rate = signal_rate(rpeaks, sampling_rate=sampling_rate, desired_length=len(ecg_cleaned))
+    if "rate" in run:
+        signals["ECG_Rate"] = signal_rate(rpeaks, sampling_rate=sampling_rate, desired_length=len(ecg_cleaned))
 
-    quality = ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=sampling_rate)
+    if "quality" in run:
+        signals["ECG_Quality"] = ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=sampling_rate)
 
-    signals = pd.DataFrame({"ECG_Raw": ecg_signal, "ECG_Clean": ecg_cleaned, "ECG_Rate": rate, "ECG_Quality": quality})
+    signals = [pd.DataFrame(signals)]
+    if "peaks" in output:
+        signals.append(instant_peaks)
 
     # Additional info of the ecg signal
-    delineate_signal, delineate_info = ecg_delineate(
-        ecg_cleaned=ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate
-    )
+    if "delineate" in run:
+        delineate_signal, delineate_info = ecg_delineate(
+            ecg_cleaned=ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate
+        )
+        if "delineate" in output:
+            signals.append(delineate_signal)
+        info.update(delineate_info)
 
-    cardiac_phase = ecg_phase(ecg_cleaned=ecg_cleaned, rpeaks=rpeaks, delineate_info=delineate_info)
+    if "phase" in run:
+        cardiac_phase = ecg_phase(ecg_cleaned=ecg_cleaned, rpeaks=rpeaks, delineate_info=delineate_info)
+        signals.append(cardiac_phase)
 
-    signals = pd.concat([signals, instant_peaks, delineate_signal, cardiac_phase], axis=1)
+    signals = pd.concat(signals, axis=1) if len(signals) > 1 else signals[0]
 
-    info = rpeaks
     return signals, info
+
+
+def _ecg_process_chunked(
+    ecg_signal, sampling_rate=1000, method="neurokit", steps=None, chunk_size=60, overlap=10, path=None
+):
+
+    ecg_signal = as_vector(ecg_signal)
+
+    chunk_size = int(np.round(chunk_size * sampling_rate))
+    overlap = int(np.round(overlap * sampling_rate))
+    if chunk_size <= 0:
+        raise ValueError("NeuroKit error: ecg_process(): 'chunk_size' should be strictly positive.")
+
+    # Two detections closer than this refractory period are the same beat seen from two chunks
+    refractory = int(0.3 * sampling_rate)
+
+    # A trailing chunk shorter than half a chunk is merged into the previous one (a few seconds are
+    # not enough to process)
+    bounds = list(range(0, len(ecg_signal), chunk_size))
+    if len(bounds) > 1 and len(ecg_signal) - bounds[-1] < chunk_size / 2:
+        bounds.pop()
+    bounds.append(len(ecg_signal))
+
+    rpeaks = []
+    waves = {}
+    last_peak = None
+    chunks = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        window_start = max(start - overlap, 0)
+        window_end = min(end + overlap, len(ecg_signal))
+
+        signals, info = _ecg_process(
+            ecg_signal[window_start:window_end], sampling_rate=sampling_rate, method=method, steps=steps
+        )
+
+        # Keep the part of the window corresponding to the chunk
+        signals = signals.iloc[start - window_start : end - window_start]
+        signals.index = pd.RangeIndex(start, end)
+
+        # Stitch the R-peaks at the boundary with the previous chunk
+        peaks = np.asarray(info.get("ECG_R_Peaks", np.array([], dtype=int))) + window_start
+        keep = (peaks >= start) & (peaks < end)
+        if last_peak is not None:
+            duplicated = keep & (peaks - last_peak < refractory)
+            if np.any(duplicated):
+                signals = signals.copy()
+                _ecg_process_unmark(signals, "ECG_R_Peaks", peaks[duplicated])
+                # As well as the waves of these heartbeats
+                for key, values in info.items():
+                    if key != "ECG_R_Peaks":
+                        _ecg_process_unmark(signals, key, np.asarray(values, dtype=float)[duplicated] + window_start)
+            keep &= ~duplicated
+        peaks = peaks[keep]
+        if len(peaks) > 0:
+            last_peak = peaks[-1]
+        rpeaks.append(peaks)
+
+        # Waves of the same heartbeats (one per R-peak, NaN if missing)
+        for key, values in info.items():
+            if key != "ECG_R_Peaks":
+                waves.setdefault(key, []).append(np.asarray(values, dtype=float)[keep] + window_start)
+
+        if path is None:
+            chunks.append(signals)
+        else:
+            signals.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+    info = {"ECG_R_Peaks": np.concatenate(rpeaks).astype(int)} if "ECG_R_Peaks" in info else {}
+    info.update({key: list(np.concatenate(values)) for key, values in waves.items()})
+    signals = pd.concat(chunks, axis=0, sort=False) if path is None else None
+
+    return signals, info
+
+
+def _ecg_process_unmark(signals, column, locations):
+    """Clear the markers of a column at the given locations (ignoring those missing or out of the chunk)."""
+    if column not in signals.columns:
+        return
+    locations = locations[~np.isnan(locations)].astype(int)
+    locations = locations[(locations >= signals.index[0]) & (locations <= signals.index[-1])]
+    signals.loc[locations, column] = 0
@@ -1,14 +1,14 @@
 # - * - coding: utf-8 - * -
 import numpy as np
+import pandas as pd
 
-from ..epochs import epochs_to_df
 from ..signal import signal_interpolate
-from ..stats import distance, rescale
+from ..stats import rescale
 from .ecg_peaks import ecg_peaks
-from .ecg_segment import ecg_segment
+from .ecg_segment import _ecg_segment_heartbeats
 
 
-def ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=1000):
+def ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=1000, window=None):
     """Quality of ECG Signal.
 
     Compute a continuous index of quality of the ECG signal, by interpolating the distance
@@ -16,6 +16,24 @@ def ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=1000):
     therefore relative, and 1 corresponds to heartbeats that are the closest to the average
     sample and 0 corresponds to the most distance heartbeat, from that average sample.
 
+    Parameters
+    ----------
+    ecg_cleaned : Union[list, np.array, pd.Series]
+        The cleaned ECG signal in the form of a vector of values.
+    rpeaks : tuple or list
+        The list of R-peak samples returned by `ecg_peaks()`. If None, peaks is computed from
+        the signal input.
+    sampling_rate : int
+        The sampling frequency of the signal (in Hz, i.e., samples/second).
+    window : int
+        If not None, each heartbeat is compared to a rolling average QRS segment, computed over the
+        ``window`` last heartbeats (the current one included), rather than to the average QRS segment of
+        the whole recording. The distances are then also rescaled over the same heartbeats, so that the
+        quality of each heartbeat only depends on the previous ones. The average is updated incrementally,
+        so that the memory used by the rolling average depends on ``window`` rather than on the number
+        of heartbeats. Note that the whole signal is still needed at once, and that the quality index
+        is interpolated over all of its samples.
+
     Returns
     -------
     array
@@ -34,6 +52,9 @@ def ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=1000):
     >>> quality = nk.ecg_quality(ecg_cleaned, sampling_rate=300)
     >>>
     >>> nk.signal_plot([ecg_cleaned, quality], standardize=True)
+    >>>
+    >>> # Rolling average QRS segment over the last 10 heartbeats
+    >>> quality = nk.ecg_quality(ecg_cleaned, sampling_rate=300, window=10)
 
     """
     # Sanitize inputs
@@ -41,28 +62,83 @@ def ecg_quality(ecg_cleaned, rpeaks=None, sampling_rate=1000):
         _, rpeaks = ecg_peaks(ecg_cleaned, sampling_rate=sampling_rate)
         rpeaks = rpeaks["ECG_R_Peaks"]
 
-    # Get heartbeats
-    heartbeats = ecg_segment(ecg_cleaned, rpeaks, sampling_rate)
-    data = epochs_to_df(heartbeats).pivot(index="Label", columns="Time", values="Signal")
-    data.index = data.index.astype(int)
-    data = data.sort_index()
+    # Get heartbeats (as a view on the signal)
+    windows, starts, lengths, __, __ = _ecg_segment_heartbeats(ecg_cleaned, rpeaks, sampling_rate=sampling_rate)
 
-    # Filter Nans
-    missing = data.T.isnull().sum().values
-    nonmissing = np.where(missing == 0)[0]
-
-    data = data.iloc[nonmissing, :]
+    # Filter heartbeats that are not entirely within the signal
+    missing = np.isnan(windows[starts, 0]) | np.isnan(windows[starts + lengths - 1, 0])
+    missing |= lengths < np.max(lengths, initial=0)
+    nonmissing = np.where(~missing)[0]
 
     # Compute distance
-    dist = distance(data, method="mean")
-    dist = rescale(np.abs(dist), to=[0, 1])
+    if window is None:
+        dist = _ecg_quality_distance(windows[starts[nonmissing]])
+        dist = rescale(np.abs(dist), to=[0, 1])
+    else:
+        dist = _ecg_quality_distance_rolling(windows, starts[nonmissing], window=window)
+        dist = np.abs(dist)
+        dist = pd.Series(dist)
+        dist_min = dist.rolling(window, min_periods=1).min().values
+        dist_max = dist.rolling(window, min_periods=1).max().values
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dist = np.where(dist_max > dist_min, (dist.values - dist_min) / (dist_max - dist_min), 0)
     dist = np.abs(dist - 1)  # So that 1 is top quality
 
     # Replace missing by 0
-    quality = np.zeros(len(heartbeats))
+    quality = np.zeros(len(rpeaks))
     quality[nonmissing] = dist
 
     # Interpolate
     quality = signal_interpolate(rpeaks, quality, x_new=np.arange(len(ecg_cleaned)), method="quadratic")
 
     return quality
+
+
+# =============================================================================
+# Internals
+# =============================================================================
+def _ecg_quality_distance(heartbeats):
+    """Average z-score of each heartbeat (row) relative to the average heartbeat."""
+    z = (heartbeats - np.mean(heartbeats, axis=0)) / np.std(heartbeats, axis=0, ddof=1)
+    return np.mean(z, axis=1)
+
+
+def _ecg_quality_distance_rolling(windows, starts, window=10):
+    """Average z-score of each heartbeat relative to the average of the ``window`` last heartbeats.
+
+    The heartbeats are taken from ``windows`` (see ``_ecg_segment_heartbeats()``) by blocks of ``window``
+    heartbeats. The rolling sums over the heartbeats are obtained from the cumulative sums over the
+    current and the previous blocks (centred on the average heartbeat of the current block, for
+    numerical precision), so that only two blocks are held in memory at any time.
+
+    """
+    if window < 2:
+        raise ValueError("NeuroKit error: ecg_quality(): 'window' should be at least 2 heartbeats.")
+
+    dist = np.zeros(len(starts))
+    previous = np.zeros((0, windows.shape[1]))
+    for block in range(0, len(starts), window):
+        heartbeats = windows[starts[block : block + window]]
+        centred = np.concatenate([previous, heartbeats]) - np.mean(heartbeats, axis=0)
+        cumsum = np.cumsum(np.concatenate([np.zeros((1, centred.shape[1])), centred]), axis=0)
+        cumsum_squared = np.cumsum(np.concatenate([np.zeros((1, centred.shape[1])), np.square(centred)]), axis=0)
+
+        # Sums over the heartbeats [i - window + 1, i]
+        end = np.arange(len(previous), len(centred)) + 1
+        begin = np.maximum(end - window, 0)
+        total = cumsum[end] - cumsum[begin]
+        total_squared = cumsum_squared[end] - cumsum_squared[begin]
+        count = (end - begin)[:, np.newaxis]
+
+        mean = total / count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.maximum(total_squared - count * np.square(mean), 0) / (count - 1))
+            dist[block : block + len(heartbeats)] = np.mean((centred[len(previous) :] - mean) / std, axis=1)
+
+        previous = heartbeats
+
+    # The first heartbeat has no variability to compare to (as in `standardize()`, filled backward)
+    if len(dist) > 1:
+        dist[0] = dist[1]
+
+    return dist
@@ -98,3 +98,40 @@ def _ecg_segment_window(heart_rate=None, rpeaks=None, sampling_rate=1000, desire
         epochs_end = epochs_end + c
 
     return epochs_start, epochs_end
+
+
+def _ecg_segment_heartbeats(ecg_cleaned, rpeaks, sampling_rate=1000):
+    """Heartbeats as rows of an array, with the same windows as `ecg_segment()`.
+
+    The signal is padded with NaNs (as by `epochs_create()`), and a zero-copy (n_samples, n_times) view
+    on all the windows of the padded signal is returned, in which the heartbeat of each R-peak is the row
+    given by `starts`. As the R-peaks are not evenly spaced, selecting the heartbeats (``windows[starts]``)
+    makes a (n_beats, n_times) copy, which can be done by blocks if all the heartbeats are not needed at
+    once (see `_ecg_quality_distance_rolling()`). Also returns the length of each heartbeat (the windows
+    can differ by one sample because of rounding), and the start and end of the windows (in seconds).
+
+    """
+    ecg_cleaned = np.asarray(ecg_cleaned, dtype=float)
+    rpeaks = np.asarray(rpeaks)
+
+    epochs_start, epochs_end = _ecg_segment_window(
+        rpeaks=rpeaks, sampling_rate=sampling_rate, desired_length=len(ecg_cleaned)
+    )
+
+    buffer = int((epochs_end - epochs_start) * sampling_rate)
+    padded = np.concatenate([np.full(buffer, np.nan), ecg_cleaned, np.full(buffer, np.nan)])
+
+    starts = ((rpeaks + buffer) + (epochs_start * sampling_rate)).astype(int)
+    ends = ((rpeaks + buffer) + (epochs_end * sampling_rate)).astype(int)
+    ends = np.minimum(ends, len(padded))
+    lengths = ends - starts
+    n_times = np.max(lengths)
+
+    windows = np.lib.stride_tricks.as_strided(
+        np.concatenate([padded, np.full(n_times, np.nan)]),
+        shape=(len(padded) + 1, n_times),
+        strides=(padded.strides[0], padded.strides[0]),
+        writeable=False,
+    )
+
+    return windows, starts, lengths, epochs_start, epochs_end
@@ -4,6 +4,7 @@ import math
 import numpy as np
 import scipy
 
+from ..misc.parallel import _parallel_map, _parallel_workers
 from ..signal import signal_distort, signal_resample
 
 
@@ -114,6 +115,154 @@ def ecg_simulate(
     return ecg
 
 
+def ecg_simulate_batch(
+    n=10,
+    duration=10,
+    length=None,
+    sampling_rate=1000,
+    noise=0.01,
+    heart_rate=70,
+    heart_rate_std=0,
+    random_state=None,
+    n_jobs=1,
+    filename=None,
+):
+    """Simulate a batch of ECG signals.
+
+    Generate ``n`` synthetic ECG signals with the ECGSYN dynamical model (McSharry et al., 2003), as
+    in ``ecg_simulate()``, for instance to build large corpora of subjects for testing or
+    benchmarking. Instead of numerically integrating the model for each subject, its trajectory is
+    computed in closed form: the oscillator stays on the unit circle, so that its phase is the
+    cumulative sum of the angular velocity, and the ECG follows a linear first-order equation, which
+    is solved exactly for a piecewise-linear forcing (with ``scipy.signal.lfilter``). This is done at
+    once for all the subjects of a chunk, at an internal sampling rate of at least 1000 Hz.
+
+    Parameters
+    ----------
+    n : int
+        Number of signals (i.e., of subjects) to simulate.
+    duration : int
+        Desired recording length in seconds.
+    length : int
+        The desired length of the signals (in samples).
+    sampling_rate : int
+        The desired sampling rate (in Hz, i.e., samples/second).
+    noise : float
+        Noise level (amplitude of the laplace noise).
+    heart_rate : Union[int, list, np.array]
+        Desired simulated heart rate (in beats per minute), or one heart rate per subject.
+    heart_rate_std : float
+        If larger than 0, the heart rate of each subject is drawn from a normal distribution centred
+        on ``heart_rate`` with this standard deviation (in beats per minute).
+    random_state : int
+        Seed for the random number generator. It determines the seed of each subject (returned in
+        ``info``), so that the signals do not depend on ``n_jobs`` and each subject can be
+        regenerated.
+    n_jobs : int
+        The number of processes in which the subjects are simulated. -1 uses as many workers as
+        available. Defaults to 1 (sequential).
+    filename : str
+        If not None, the signals are written (as 32-bit floats) to a ``.npy`` file while they are
+        simulated, so that only a few subjects are held in memory at once. The returned array is then
+        a memory map of that file (which can later be opened with ``np.load(filename, mmap_mode="r")``).
+
+    Returns
+    -------
+    ecg : array
+        An array of shape (n, length) containing the ECG signals.
+    info : dict
+        A dictionary containing the heart rate (``"Heart_Rate"``) and the seed (``"Random_State"``) of
+        each subject.
+
+    See Also
+    --------
+    ecg_simulate
+
+    Examples
+    ----------
+    >>> import neurokit2 as nk
+    >>>
+    >>> ecg, info = nk.ecg_simulate_batch(n=20, duration=10, heart_rate=70, heart_rate_std=10, random_state=42)
+    >>> ecg.shape
+    (20, 10000)
+    >>> nk.signal_plot(list(ecg[0:3]), subplots=True)
+
+    References
+    -----------
+    - McSharry, P. E., Clifford, G. D., Tarassenko, L., & Smith, L. A. (2003). A dynamical model for
+    generating synthetic electrocardiogram signals. IEEE transactions on biomedical engineering, 50(3), 289-294.
+
+    """
+    if length is None:
+        length = int(duration * sampling_rate)
+    if duration is None:
+        duration = length / sampling_rate
+
+    # Heart rate and seed of each subject
+    rng = np.random.RandomState(random_state)
+    heart_rate = np.broadcast_to(np.asarray(heart_rate, dtype=float), (n,)).copy()
+    if heart_rate_std > 0:
+        heart_rate += rng.normal(0, heart_rate_std, n)
+    if np.any(heart_rate <= 0):
+        raise ValueError("NeuroKit error: ecg_simulate_batch(): all heart rates should be positive.")
+    seeds = rng.randint(0, 2 ** 31 - 1, n)
+
+    if filename is None:
+        ecg = np.zeros((n, length))
+    else:
+        ecg = np.lib.format.open_memmap(filename, mode="w+", dtype=np.float32, shape=(n, length))
+
+    # Chunks of subjects (of about 2^22 samples at the internal sampling rate, and at least one per worker)
+    q = int(np.ceil(1000 / sampling_rate))
+    chunksize = int(np.clip(2 ** 22 // (length * q), 1, max(1, np.ceil(n / _parallel_workers(n_jobs)))))
+    chunks = [np.arange(i, min(i + chunksize, n)) for i in range(0, n, chunksize)]
+    tasks = (
+        (length, sampling_rate, q, noise, heart_rate[chunk], seeds[chunk]) for chunk in chunks
+    )
+
+    results = _parallel_map(_ecg_simulate_batch, tasks, n_jobs=n_jobs, processes=True)
+    for chunk, result in zip(chunks, results):
+        ecg[chunk] = result
+
+    if filename is not None:
+        ecg.flush()
+
+    return ecg, {"Heart_Rate": heart_rate, "Random_State": seeds}
+
+
+def _ecg_simulate_batch(length, sampling_rate, q, noise, heart_rate, seeds):
+    """Simulate the ECGSYN signals of a chunk of subjects (one per heart rate and seed)."""
+    sfint = sampling_rate * q
+    rrn = np.zeros((len(seeds), length * q))
+    for i, seed in enumerate(seeds):
+        np.random.seed(seed)
+        rrn[i] = _ecg_simulate_rrn(heart_rate[i], length / sampling_rate, sfint)[0][0 : length * q]
+
+    ecg = _ecg_simulate_ecgsyn_closedform(rrn, heart_rate, sfint)[:, ::q]
+
+    # Scale signals to lie between -0.4 and 1.2 mV
+    ecg_min = np.min(ecg, axis=1, keepdims=True)
+    ecg_max = np.max(ecg, axis=1, keepdims=True)
+    ecg = (ecg - ecg_min) * 1.6 / (ecg_max - ecg_min) - 0.4
+
+    # Add random noise
+    if noise > 0:
+        for i, seed in enumerate(seeds):
+            ecg[i] = signal_distort(
+                ecg[i],
+                sampling_rate=sampling_rate,
+                noise_amplitude=noise,
+                noise_frequency=[5, 10, 100],
+                noise_shape="laplace",
+                random_state=seed,
+                silent=True,
+            )
+
+    # Reset random seed (so it doesn't affect global)
+    np.random.seed(None)
+    return ecg
+
+
 # =============================================================================
 # Daubechies
 # =============================================================================
@@ -225,35 +374,9 @@ def _ecg_simulate_ecgsyn(
             " (sfecg). Your current choices are: sfecg = " + str(sfecg) + " and sfint = " + str(sfint) + "."
         )
 
-    # Define frequency parameters for rr process
-    # flo and fhi correspond to the Mayer waves and respiratory rate respectively
-    flo = 0.1
-    fhi = 0.25
-    flostd = 0.01
-    fhistd = 0.01
-
-    # Calculate time scales for rr and total output
-    sfrr = 1
-    trr = 1 / sfrr
-    rrmean = 60 / hrmean
-    n = 2 ** (np.ceil(np.log2(N * rrmean / trr)))
-
-    rr0 = _ecg_simulate_rrprocess(flo, fhi, flostd, fhistd, lfhfratio, hrmean, hrstd, sfrr, n)
-
-    # Upsample rr time series from 1 Hz to sfint Hz
-    rr = signal_resample(rr0, sampling_rate=1, desired_sampling_rate=sfint)
-
     # Make the rrn time series
+    rrn, Nt = _ecg_simulate_rrn(hrmean, N * 60 / hrmean, sfint, hrstd=hrstd, lfhfratio=lfhfratio)
     dt = 1 / sfint
-    rrn = np.zeros(len(rr))
-    tecg = 0
-    i = 0
-    while i < len(rr):
-        tecg += rr[i]
-        ip = int(np.round(tecg / dt))
-        rrn[i:ip] = rr[i]
-        i = ip
-    Nt = ip
 
     # Integrate system using fourth order Runge-Kutta
     x0 = np.array([1, 0, 0.04])
@@ -286,6 +409,93 @@ def _ecg_simulate_ecgsyn(
     return z + Anoise * eta  # Return signal
 
 
+def _ecg_simulate_rrn(hrmean, duration, sfint, hrstd=1, lfhfratio=0.5):
+    """RR interval at each sample (constant over each beat) of a recording of about ``duration`` seconds.
+
+    Returns the RR intervals and the number of samples covered by complete beats (which can be larger
+    than the number of RR intervals).
+
+    """
+    # Define frequency parameters for rr process
+    # flo and fhi correspond to the Mayer waves and respiratory rate respectively
+    flo = 0.1
+    fhi = 0.25
+    flostd = 0.01
+    fhistd = 0.01
+
+    # Calculate time scales for rr and total output
+    sfrr = 1
+    trr = 1 / sfrr
+    n = 2 ** (np.ceil(np.log2(duration / trr)))
+
+    rr0 = _ecg_simulate_rrprocess(flo, fhi, flostd, fhistd, lfhfratio, hrmean, hrstd, sfrr, n)
+
+    # Upsample rr time series from 1 Hz to sfint Hz
+    rr = signal_resample(rr0, sampling_rate=1, desired_sampling_rate=sfint)
+
+    # Make the rrn time series
+    dt = 1 / sfint
+    rrn = np.zeros(len(rr))
+    tecg = 0
+    i = 0
+    while i < len(rr):
+        tecg += rr[i]
+        ip = int(np.round(tecg / dt))
+        rrn[i:ip] = rr[i]
+        i = ip
+    return rrn, ip
+
+
+def _ecg_simulate_ecgsyn_closedform(
+    rrn,
+    hrmean,
+    sfint,
+    ti=(-70, -15, 0, 15, 100),
+    ai=(1.2, -5, 30, -7.5, 0.75),
+    bi=(0.25, 0.1, 0.1, 0.1, 0.4),
+):
+    """Solution of the ECGSYN model (the z coordinate), for one subject per row of ``rrn``.
+
+    Starting from (1, 0, 0.04) as in ``_ecg_simulate_ecgsyn()``, (x, y) stays on the unit circle, so
+    that the phase is the integral of the angular velocity 2 * pi / rrn. z then follows
+    dz/dt = g(t) - z, where g only depends on time, which is integrated exactly over each sample by
+    assuming that g is linear between samples.
+
+    """
+    rrn = np.atleast_2d(rrn)
+    hrmean = np.reshape(hrmean, (-1, 1))
+    dt = 1 / sfint
+    t = np.arange(rrn.shape[1]) * dt
+
+    # Adjust extrema parameters for mean heart rate
+    hrfact = np.sqrt(hrmean / 60)
+    hrfact2 = np.sqrt(hrfact)
+    ti = np.deg2rad(ti) * np.hstack([hrfact2, hrfact, np.ones_like(hrfact), hrfact, hrfact2])
+    bi = hrfact * np.array(bi)
+
+    # Phase
+    theta = np.zeros(rrn.shape)
+    np.cumsum(2 * np.pi / rrn[:, :-1] * dt, axis=1, out=theta[:, 1:])
+
+    # Forcing (including the baseline wander)
+    g = np.tile(0.005 * np.sin(2 * np.pi * 0.25 * t), (len(rrn), 1))
+    for i in range(len(ai)):
+        dti = theta - ti[:, i : i + 1]
+        dti -= np.round(dti / 2 / np.pi) * 2 * np.pi
+        g -= ai[i] * dti * np.exp(-0.5 * (dti / bi[:, i : i + 1]) ** 2)
+
+    # z[k + 1] = exp(-dt) * z[k] + b0 * g[k] + b1 * g[k + 1]
+    decay = np.exp(-dt)
+    b1 = 1 - (1 - decay) / dt
+    b0 = 1 - decay - b1
+    z = np.zeros(rrn.shape)
+    z[:, 0] = 0.04
+    z[:, 1:], _ = scipy.signal.lfilter(
+        [b1, b0], [1, -decay], g[:, 1:], axis=1, zi=b0 * g[:, 0:1] + decay * z[:, 0:1]
+    )
+    return z
+
+
 def _ecg_simulate_derivsecgsyn(t, x, rr, ti, sfint, ai, bi):
 
     ta = math.atan2(x[1], x[0])
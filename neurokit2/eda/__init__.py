@@ -1,34 +1,23 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .eda_analyze import eda_analyze
-from .eda_autocor import eda_autocor
-from .eda_changepoints import eda_changepoints
-from .eda_clean import eda_clean
-from .eda_eventrelated import eda_eventrelated
-from .eda_findpeaks import eda_findpeaks
-from .eda_fixpeaks import eda_fixpeaks
-from .eda_intervalrelated import eda_intervalrelated
-from .eda_peaks import eda_peaks
-from .eda_phasic import eda_phasic
-from .eda_plot import eda_plot
-from .eda_process import eda_process
-from .eda_simulate import eda_simulate
-from .eda_sympathetic import eda_sympathetic
 
-
-__all__ = [
-    "eda_simulate",
-    "eda_clean",
-    "eda_phasic",
-    "eda_findpeaks",
-    "eda_fixpeaks",
-    "eda_peaks",
-    "eda_process",
-    "eda_plot",
-    "eda_eventrelated",
-    "eda_intervalrelated",
-    "eda_analyze",
-    "eda_autocor",
-    "eda_changepoints",
-    "eda_sympathetic",
-]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "eda_simulate": ".eda_simulate",
+        "eda_clean": ".eda_clean",
+        "eda_phasic": ".eda_phasic",
+        "eda_findpeaks": ".eda_findpeaks",
+        "eda_fixpeaks": ".eda_fixpeaks",
+        "eda_peaks": ".eda_peaks",
+        "eda_process": ".eda_process",
+        "eda_plot": ".eda_plot",
+        "eda_eventrelated": ".eda_eventrelated",
+        "eda_intervalrelated": ".eda_intervalrelated",
+        "eda_analyze": ".eda_analyze",
+        "eda_autocor": ".eda_autocor",
+        "eda_changepoints": ".eda_changepoints",
+        "eda_sympathetic": ".eda_sympathetic",
+    },
+)
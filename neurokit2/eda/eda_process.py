@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
 
+from ..misc.process_steps import _process_steps
 from .eda_clean import eda_clean
 from .eda_peaks import eda_peaks
 from .eda_phasic import eda_phasic
 
 
-def eda_process(eda_signal, sampling_rate=1000, method="neurokit"):
+def eda_process(eda_signal, sampling_rate=1000, method="neurokit", steps=None):
     """Process Electrodermal Activity (EDA).
 
     Convenience function that automatically processes electrodermal activity (EDA) signal.
@@ -19,6 +20,10 @@ def eda_process(eda_signal, sampling_rate=1000, method="neurokit"):
         The sampling frequency of `rsp_signal` (in Hz, i.e., samples/second).
     method : str
         The processing pipeline to apply. Can be one of "biosppy" or "neurokit" (default).
+    steps : list
+        The processing steps to run, among "phasic" (decomposition into tonic and phasic components)
+        and "peaks" (SCR peaks, which requires the decomposition). The signal is always cleaned. If None
+        (default), all steps are run.
 
     Returns
     -------
@@ -64,18 +69,26 @@ def eda_process(eda_signal, sampling_rate=1000, method="neurokit"):
     >>> fig #doctest: +SKIP
 
     """
+    run, output = _process_steps(steps, ["phasic", "peaks"], {"peaks": ["phasic"]}, function="eda_process")
+
     # Preprocess
     eda_cleaned = eda_clean(eda_signal, sampling_rate=sampling_rate, method=method)
-    eda_decomposed = eda_phasic(eda_cleaned, sampling_rate=sampling_rate)
+    signals = [pd.DataFrame({"EDA_Raw": eda_signal, "EDA_Clean": eda_cleaned})]
+    info = {}
+
+    if "phasic" in run:
+        eda_decomposed = eda_phasic(eda_cleaned, sampling_rate=sampling_rate)
+        if "phasic" in output:
+            signals.append(eda_decomposed)
 
     # Find peaks
-    peak_signal, info = eda_peaks(
-        eda_decomposed["EDA_Phasic"].values, sampling_rate=sampling_rate, method=method, amplitude_min=0.1
-    )
+    if "peaks" in run:
+        peak_signal, info = eda_peaks(
+            eda_decomposed["EDA_Phasic"].values, sampling_rate=sampling_rate, method=method, amplitude_min=0.1
+        )
+        signals.append(peak_signal)
 
     # Store
-    signals = pd.DataFrame({"EDA_Raw": eda_signal, "EDA_Clean": eda_cleaned})
-
-    signals = pd.concat([signals, eda_decomposed, peak_signal], axis=1)
+    signals = pd.concat(signals, axis=1) if len(signals) > 1 else signals[0]
 
     return signals, info
@@ -1,9 +1,13 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .epochs_create import epochs_create
-from .epochs_plot import epochs_plot
-from .epochs_to_array import epochs_to_array
-from .epochs_to_df import epochs_to_df
 
-
-__all__ = ["epochs_create", "epochs_to_df", "epochs_to_array", "epochs_plot"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "epochs_create": ".epochs_create",
+        "epochs_to_df": ".epochs_to_df",
+        "epochs_to_array": ".epochs_to_array",
+        "epochs_plot": ".epochs_plot",
+    },
+)
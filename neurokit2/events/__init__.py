@@ -1,8 +1,12 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .events_find import events_find
-from .events_plot import events_plot
-from .events_to_mne import events_to_mne
 
-
-__all__ = ["events_find", "events_plot", "events_to_mne"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "events_find": ".events_find",
+        "events_plot": ".events_plot",
+        "events_to_mne": ".events_to_mne",
+    },
+)
@@ -1,9 +1,18 @@
 # -*- coding: utf-8 -*-
-from .hrv import hrv
-from .hrv_frequency import hrv_frequency
-from .hrv_nonlinear import hrv_nonlinear
-from .hrv_rsa import hrv_rsa
-from .hrv_time import hrv_time
+"""Submodule for NeuroKit."""
+from .._lazy import attach
 
 
-__all__ = ["hrv_time", "hrv_frequency", "hrv_nonlinear", "hrv_rsa", "hrv"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "hrv_time": ".hrv_time",
+        "hrv_frequency": ".hrv_frequency",
+        "hrv_nonlinear": ".hrv_nonlinear",
+        "hrv_rsa": ".hrv_rsa",
+        "hrv": ".hrv",
+        "hrv_windowed": ".hrv_windowed",
+        "hrv_context": ".hrv_context",
+        "hrv_batch": ".hrv_batch",
+    },
+)
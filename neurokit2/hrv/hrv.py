@@ -7,7 +7,7 @@ from ..stats import summary_plot
 from .hrv_frequency import _hrv_frequency_show, hrv_frequency
 from .hrv_nonlinear import _hrv_nonlinear_show, hrv_nonlinear
 from .hrv_time import hrv_time
-from .hrv_utils import _hrv_get_rri, _hrv_sanitize_input
+from .hrv_context import hrv_context
 
 
 def hrv(peaks, sampling_rate=1000, show=False):
@@ -22,7 +22,8 @@ def hrv(peaks, sampling_rate=1000, show=False):
     ----------
     peaks : dict
         Samples at which cardiac extrema (i.e., R-peaks, systolic peaks) occur. Dictionary returned
-        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks.
+        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks. Can also be the output of
+        ``hrv_context()``. The R-R intervals are computed once and shared between the domains.
     sampling_rate : int, optional
         Sampling rate (Hz) of the continuous cardiac signal in which the peaks occur. Should be at
         least twice as high as the highest frequency in vhf. By default 1000.
@@ -66,13 +67,16 @@ def hrv(peaks, sampling_rate=1000, show=False):
     Frontiers in public health, 5, 258.
 
     """
+    # Sanitize input (once for all domains)
+    context = hrv_context(peaks, sampling_rate=sampling_rate)
+
     # Get indices
     out = []  # initialize empty container
 
     # Gather indices
-    out.append(hrv_time(peaks, sampling_rate=sampling_rate))
-    out.append(hrv_frequency(peaks, sampling_rate=sampling_rate))
-    out.append(hrv_nonlinear(peaks, sampling_rate=sampling_rate))
+    out.append(hrv_time(context))
+    out.append(hrv_frequency(context))
+    out.append(hrv_nonlinear(context))
 
     out = pd.concat(out, axis=1)
 
@@ -81,12 +85,12 @@ def hrv(peaks, sampling_rate=1000, show=False):
         # Indices for plotting
         out_plot = out.copy(deep=False)
 
-        _hrv_plot(peaks, out_plot, sampling_rate)
+        _hrv_plot(context, out_plot)
 
     return out
 
 
-def _hrv_plot(peaks, out, sampling_rate=1000):
+def _hrv_plot(context, out):
 
     fig = plt.figure(constrained_layout=False)
     spec = gs.GridSpec(ncols=2, nrows=2, height_ratios=[1, 1], width_ratios=[1, 1])
@@ -105,8 +109,7 @@ def _hrv_plot(peaks, out, sampling_rate=1000):
     ax_marg_y = fig.add_subplot(spec_within[1:4, 3])
 
     # Distribution of RR intervals
-    peaks = _hrv_sanitize_input(peaks)
-    rri = _hrv_get_rri(peaks, sampling_rate=sampling_rate, interpolate=False)
+    rri = context.rri
     ax_distrib = summary_plot(rri, ax=ax_distrib)
 
     # Poincare plot
@@ -114,6 +117,5 @@ def _hrv_plot(peaks, out, sampling_rate=1000):
     _hrv_nonlinear_show(rri, out, ax=ax_poincare, ax_marg_x=ax_marg_x, ax_marg_y=ax_marg_y)
 
     # PSD plot
-    rri, sampling_rate = _hrv_get_rri(peaks, sampling_rate=sampling_rate, interpolate=True)
     frequency_bands = out[["ULF", "VLF", "LF", "HF", "VHF"]]
-    _hrv_frequency_show(rri, frequency_bands, sampling_rate=sampling_rate, ax=ax_psd)
+    _hrv_frequency_show(context, frequency_bands, ax=ax_psd)
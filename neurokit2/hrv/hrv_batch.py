@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+from ..misc.parallel import _parallel_map, _parallel_workers
+from .hrv import hrv
+
+
+def hrv_batch(peaks, sampling_rate=1000, n_jobs=1, chunksize=None, errors="coerce"):
+    """Computes indices of Heart Rate Variability (HRV) of many recordings.
+
+    Computes the HRV indices (see ``hrv()``) of each recording of a dictionary, possibly in parallel
+    over a pool of processes, and gathers them in a single DataFrame. The recordings are sent to the
+    workers by chunks, and each worker returns the indices of its chunk as an array (rather than a
+    DataFrame per recording).
+
+    Parameters
+    ----------
+    peaks : dict
+        A dictionary of recordings, with for each one the samples at which cardiac extrema (i.e.,
+        R-peaks, systolic peaks) occur (see ``hrv()``).
+    sampling_rate : Union[int, dict], optional
+        Sampling rate (Hz) of the continuous cardiac signals in which the peaks occur. Can be a
+        dictionary with the sampling rate of each recording. By default 1000.
+    n_jobs : int
+        The number of processes over which the recordings are distributed. -1 uses as many processes
+        as available. Defaults to 1 (sequential, in the current process).
+    chunksize : int
+        The number of recordings sent to a process at once. If None (default), the recordings are split
+        in about 4 chunks per process.
+    errors : str
+        If "coerce" (default), the indices of a recording for which the computation fails are set to
+        NaN, and the error message is stored in the ``Error`` column (which is "None" otherwise). If
+        "raise", the error is raised.
+
+    Returns
+    -------
+    DataFrame
+        Contains the HRV indices of each recording (one row per recording, indexed by the keys of
+        ``peaks``), and an ``Error`` column if ``errors`` is "coerce".
+
+    See Also
+    --------
+    hrv, ecg_intervalrelated
+
+    Examples
+    --------
+    >>> import neurokit2 as nk
+    >>>
+    >>> peaks = {}
+    >>> for i in range(4):
+    ...     ecg = nk.ecg_simulate(duration=60, sampling_rate=250, heart_rate=60 + 5 * i, random_state=i)
+    ...     peaks["Participant_" + str(i)] = nk.ecg_peaks(ecg, sampling_rate=250)[1]
+    >>>
+    >>> hrv = nk.hrv_batch(peaks, sampling_rate=250)
+    >>> hrv[["HRV_MeanNN", "HRV_RMSSD", "Error"]] #doctest: +SKIP
+
+    """
+    if errors not in ["coerce", "raise"]:
+        raise ValueError("NeuroKit error: hrv_batch(): 'errors' should be one of 'coerce' or 'raise'.")
+
+    keys = list(peaks.keys())
+    if not isinstance(sampling_rate, dict):
+        sampling_rate = {key: sampling_rate for key in keys}
+
+    # Chunks of recordings
+    if chunksize is None:
+        chunksize = max(1, int(np.ceil(len(keys) / (4 * _parallel_workers(n_jobs)))))
+    chunks = [keys[i : i + chunksize] for i in range(0, len(keys), chunksize)]
+    tasks = (([peaks[key] for key in chunk], [sampling_rate[key] for key in chunk], errors) for chunk in chunks)
+
+    results = list(_parallel_map(_hrv_batch, tasks, n_jobs=n_jobs, processes=True))
+
+    # Gather (the columns are those of the first recording that succeeded)
+    columns = next((result[0] for result in results if result[0] is not None), [])
+    out = []
+    for chunk, (chunk_columns, values, chunk_errors) in zip(chunks, results):
+        if chunk_columns is None:
+            values = np.full((len(chunk), len(columns)), np.nan)
+            chunk_columns = columns
+        out.append(pd.DataFrame(values, index=chunk, columns=chunk_columns))
+        out[-1]["Error"] = chunk_errors
+    out = pd.concat(out) if out else pd.DataFrame(columns=list(columns) + ["Error"])
+
+    if errors == "raise":
+        out = out.drop(columns="Error")
+    return out
+
+
+def _hrv_batch(peaks, sampling_rate, errors="coerce"):
+    """HRV indices of a chunk of recordings, as an array (one row per recording)."""
+    columns = None
+    values = []
+    messages = []
+    for rpeaks, rate in zip(peaks, sampling_rate):
+        try:
+            out = hrv(rpeaks, sampling_rate=rate)
+        except Exception as error:  # pylint: disable=broad-except
+            if errors == "raise":
+                raise
+            values.append(None)
+            messages.append(str(error))
+            continue
+        if columns is None:
+            columns = list(out.columns)
+        values.append(out[columns].values[0])
+        messages.append("None")
+
+    if columns is not None:
+        values = np.array([np.full(len(columns), np.nan) if row is None else row for row in values], dtype=float)
+    return columns, values, messages
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+from ..signal.signal_psd import signal_psd
+from .hrv_utils import _hrv_get_rri, _hrv_sanitize_input
+
+
+def hrv_context(peaks, sampling_rate=1000):
+    """Prepares the R-R intervals of a set of peaks once for several HRV analyses.
+
+    The HRV functions (``hrv()``, ``hrv_time()``, ``hrv_frequency()``, ``hrv_nonlinear()``,
+    ``hrv_windowed()`` and ``hrv_rsa()``) all start by extracting the peaks from their input, and by
+    computing the R-R intervals and, for some, their interpolation and power spectrum. The object
+    returned by this function can be passed instead of the peaks to these functions, so that this work
+    is done only once and shared between them.
+
+    Parameters
+    ----------
+    peaks : dict
+        Samples at which cardiac extrema (i.e., R-peaks, systolic peaks) occur. Dictionary returned
+        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks. If it is already the output of
+        ``hrv_context()``, it is returned as is.
+    sampling_rate : int, optional
+        Sampling rate (Hz) of the continuous cardiac signal in which the peaks occur. By default 1000.
+        The functions to which the context is passed use this sampling rate rather than their own.
+
+    Returns
+    -------
+    context
+        An object with the attributes ``peaks`` (the sample of each peak), ``sampling_rate`` and ``rri``
+        (the R-R intervals, in milliseconds). The interpolated R-R intervals and their power spectrum
+        are computed the first time they are needed, and then kept.
+
+    See Also
+    --------
+    hrv, hrv_time, hrv_frequency, hrv_nonlinear, hrv_rsa
+
+    Examples
+    --------
+    >>> import neurokit2 as nk
+    >>>
+    >>> data = nk.data("bio_resting_5min_100hz")
+    >>> peaks, info = nk.ecg_peaks(data["ECG"], sampling_rate=100)
+    >>>
+    >>> context = nk.hrv_context(peaks, sampling_rate=100)
+    >>> hrv_time = nk.hrv_time(context)
+    >>> hrv_frequency = nk.hrv_frequency(context)
+
+    """
+    if isinstance(peaks, _HRVContext):
+        return peaks
+    return _HRVContext(peaks, sampling_rate=sampling_rate)
+
+
+# =============================================================================
+# Internals
+# =============================================================================
+class _HRVContext:
+    """Peaks and R-R intervals, with caches for the interpolated R-R intervals and their PSD."""
+
+    def __init__(self, peaks, sampling_rate=1000):
+        self.peaks = _hrv_sanitize_input(peaks)
+        self.sampling_rate = sampling_rate
+        self.rri = _hrv_get_rri(self.peaks, sampling_rate=sampling_rate, interpolate=False)
+        self.rri.flags.writeable = False
+
+        self._interpolated = {}
+        self._psd = {}
+
+    def __repr__(self):
+        return "<HRV context: {} peaks at {} Hz>".format(len(self.peaks), self.sampling_rate)
+
+    def rri_interpolated(self, **kwargs):
+        """R-R intervals interpolated at the sampling rate of the peaks (see ``_hrv_get_rri()``)."""
+        key = _hrv_context_key(kwargs)
+        if key not in self._interpolated:
+            rri, sampling_rate = _hrv_get_rri(self.peaks, sampling_rate=self.sampling_rate, interpolate=True, **kwargs)
+            rri.flags.writeable = False
+            self._interpolated[key] = rri, sampling_rate
+        return self._interpolated[key]
+
+    def psd(self, frequency_band, interpolation=None, **kwargs):
+        """PSD of the interpolated R-R intervals, as computed by ``signal_power()`` for these bands.
+
+        The window is chosen so as to capture at least 2 cycles of the lowest frequency band that the
+        duration of the recording allows. ``kwargs`` are passed to ``signal_psd()``.
+
+        """
+        if interpolation is None:
+            interpolation = {}
+        rri, sampling_rate = self.rri_interpolated(**interpolation)
+        for band in frequency_band:
+            min_frequency = band[0]
+            if min_frequency == 0:
+                min_frequency = 0.001  # sanitize lowest frequency
+            # Check if signal length is sufficient to capture at least 2 cycles of min_frequency
+            window_length = int((2 / min_frequency) * sampling_rate)
+            if window_length <= len(rri) / 2:
+                break
+
+        key = (_hrv_context_key(interpolation), min_frequency, _hrv_context_key(kwargs))
+        if key not in self._psd:
+            self._psd[key] = signal_psd(
+                rri, sampling_rate=sampling_rate, show=False, min_frequency=min_frequency, **kwargs
+            )
+        return self._psd[key].copy()
+
+
+def _hrv_context_key(kwargs):
+    return tuple(sorted((key, repr(value)) for key, value in kwargs.items()))
@@ -6,9 +6,8 @@ import numpy as np
 import pandas as pd
 
 from ..misc import NeuroKitWarning
-from ..signal.signal_power import _signal_power_instant_plot, signal_power
-from ..signal.signal_psd import signal_psd
-from .hrv_utils import _hrv_get_rri, _hrv_sanitize_input
+from ..signal.signal_power import _signal_power_instant_get, _signal_power_instant_plot
+from .hrv_context import hrv_context
 
 
 def hrv_frequency(
@@ -36,7 +35,8 @@ def hrv_frequency(
     ----------
     peaks : dict
         Samples at which cardiac extrema (i.e., R-peaks, systolic peaks) occur. Dictionary returned
-        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks.
+        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks. Can also be the output of
+        ``hrv_context()``, in which case the interpolated R-R intervals and their PSD are shared.
     sampling_rate : int, optional
         Sampling rate (Hz) of the continuous cardiac signal in which the peaks occur. Should be at
         least twice as high as the highest frequency in vhf. By default 1000.
@@ -118,27 +118,24 @@ def hrv_frequency(
 
     """
     # Sanitize input
-    peaks = _hrv_sanitize_input(peaks)
-
-    # Compute R-R intervals (also referred to as NN) in milliseconds (interpolated at 1000 Hz by default)
-    rri, sampling_rate = _hrv_get_rri(peaks, sampling_rate=sampling_rate, interpolate=True, **kwargs)
+    context = hrv_context(peaks, sampling_rate=sampling_rate)
 
+    # PSD of the R-R intervals (also referred to as NN) in milliseconds (interpolated at 1000 Hz by
+    # default), and power in each band (see `signal_power()`)
     frequency_band = [ulf, vlf, lf, hf, vhf]
-    power = signal_power(
-        rri,
-        frequency_band=frequency_band,
-        sampling_rate=sampling_rate,
+    psd = context.psd(
+        frequency_band,
+        interpolation=kwargs,
         method=psd_method,
         max_frequency=0.5,
-        show=False,
         normalize=normalize,
         order_criteria=order_criteria,
         **kwargs
     )
 
-    power.columns = ["ULF", "VLF", "LF", "HF", "VHF"]
-
-    out = power.to_dict(orient="index")[0]
+    out = {}
+    for name, band in zip(["ULF", "VLF", "LF", "HF", "VHF"], frequency_band):
+        out[name] = list(_signal_power_instant_get(psd, band).values())[0]
     out_bands = out.copy()  # Components to be entered into plot
 
     if silent is False:
@@ -152,7 +149,7 @@ def hrv_frequency(
                 )
 
     # Normalized
-    total_power = np.nansum(power.values)
+    total_power = np.nansum(list(out_bands.values()))
     out["LFHF"] = out["LF"] / out["HF"]
     out["LFn"] = out["LF"] / total_power
     out["HFn"] = out["HF"] / total_power
@@ -164,22 +161,34 @@ def hrv_frequency(
 
     # Plot
     if show:
-        _hrv_frequency_show(rri, out_bands, sampling_rate=sampling_rate, psd_method=psd_method, order_criteria=order_criteria, normalize=normalize)
+        _hrv_frequency_show(
+            context,
+            out_bands,
+            ulf=ulf,
+            vlf=vlf,
+            lf=lf,
+            hf=hf,
+            vhf=vhf,
+            psd_method=psd_method,
+            order_criteria=order_criteria,
+            normalize=normalize,
+            interpolation=kwargs,
+        )
     return out
 
 
 def _hrv_frequency_show(
-    rri,
+    context,
     out_bands,
     ulf=(0, 0.0033),
     vlf=(0.0033, 0.04),
     lf=(0.04, 0.15),
     hf=(0.15, 0.4),
     vhf=(0.4, 0.5),
-    sampling_rate=1000,
     psd_method="welch",
     order_criteria=None,
     normalize=True,
+    interpolation=None,
     **kwargs
 ):
 
@@ -190,15 +199,13 @@ def _hrv_frequency_show(
         __, ax = plt.subplots()
 
     frequency_band = [ulf, vlf, lf, hf, vhf]
-    for i in range(len(frequency_band)):  # pylint: disable=C0200
-        min_frequency = frequency_band[i][0]
-        if min_frequency == 0:
-            min_frequency = 0.001  # sanitize lowest frequency
-
-        window_length = int((2 / min_frequency) * sampling_rate)
-        if window_length <= len(rri) / 2:
-            break
-
-    psd = signal_psd(rri, sampling_rate=sampling_rate, show=False, min_frequency=min_frequency, method=psd_method, max_frequency=0.5, order_criteria=order_criteria, normalize=normalize)
+    psd = context.psd(
+        frequency_band,
+        interpolation=interpolation,
+        method=psd_method,
+        max_frequency=0.5,
+        normalize=normalize,
+        order_criteria=order_criteria,
+    )
 
     _signal_power_instant_plot(psd, out_bands, frequency_band, ax=ax)
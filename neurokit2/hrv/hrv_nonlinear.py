@@ -8,7 +8,7 @@ import scipy.stats
 from ..complexity import entropy_approximate, entropy_sample
 from ..misc import find_consecutive
 from ..signal import signal_zerocrossings
-from .hrv_utils import _hrv_get_rri, _hrv_sanitize_input
+from .hrv_context import hrv_context
 
 
 def hrv_nonlinear(peaks, sampling_rate=1000, show=False):
@@ -20,7 +20,8 @@ def hrv_nonlinear(peaks, sampling_rate=1000, show=False):
     ----------
     peaks : dict
         Samples at which cardiac extrema (i.e., R-peaks, systolic peaks) occur. Dictionary returned
-        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks.
+        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks. Can also be the output of
+        ``hrv_context()``.
     sampling_rate : int, optional
         Sampling rate (Hz) of the continuous cardiac signal in which the peaks occur. Should be at
         least twice as high as the highest frequency in vhf. By default 1000.
@@ -166,10 +167,10 @@ def hrv_nonlinear(peaks, sampling_rate=1000, show=False):
 
     """
     # Sanitize input
-    peaks = _hrv_sanitize_input(peaks)
+    context = hrv_context(peaks, sampling_rate=sampling_rate)
 
-    # Compute R-R intervals (also referred to as NN) in milliseconds
-    rri = _hrv_get_rri(peaks, sampling_rate=sampling_rate, interpolate=False)
+    # R-R intervals (also referred to as NN) in milliseconds
+    rri = context.rri
 
     # Initialize empty container for results
     out = {}
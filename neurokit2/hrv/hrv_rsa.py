@@ -12,7 +12,7 @@ from ..rsp import rsp_process
 from ..signal import (signal_filter, signal_interpolate, signal_rate,
                       signal_resample, signal_timefrequency)
 from ..signal.signal_formatpeaks import _signal_formatpeaks_sanitize
-from .hrv_utils import _hrv_get_rri
+from .hrv_context import _HRVContext, hrv_context
 
 
 def hrv_rsa(ecg_signals, rsp_signals=None, rpeaks=None, sampling_rate=1000, continuous=False,
@@ -60,7 +60,8 @@ def hrv_rsa(ecg_signals, rsp_signals=None, rpeaks=None, sampling_rate=1000, cont
         Defaults to None.
     rpeaks : dict
         The samples at which the R-peaks of the ECG signal occur. Dict returned by `ecg_peaks()`,
-        `ecg_process()`, or `bio_process()`. Defaults to None.
+        `ecg_process()`, or `bio_process()`. Can also be the output of `hrv_context()`, in which case
+        its interpolated R-R intervals are reused. Defaults to None.
     sampling_rate : int
         The sampling frequency of signals (in Hz, i.e., samples/second).
     continuous : bool
@@ -142,7 +143,12 @@ def hrv_rsa(ecg_signals, rsp_signals=None, rpeaks=None, sampling_rate=1000, cont
       1(06), 32.
 
     """
+    context = None
+    if isinstance(rpeaks, _HRVContext):
+        context, rpeaks = rpeaks, rpeaks.peaks
     signals, ecg_period, rpeaks, __ = _hrv_rsa_formatinput(ecg_signals, rsp_signals, rpeaks, sampling_rate)
+    if context is None:
+        context = hrv_context(rpeaks, sampling_rate=sampling_rate)
 
     # Extract cycles
     rsp_cycles = _hrv_rsa_cycles(signals)
@@ -172,7 +178,7 @@ def hrv_rsa(ecg_signals, rsp_signals=None, rpeaks=None, sampling_rate=1000, cont
         window = 32  # 32 seconds
     input_duration = rpeaks[-1] / sampling_rate
     if input_duration >= window:
-        rsa_gates = _hrv_rsa_gates(ecg_signals, rpeaks, sampling_rate=sampling_rate,
+        rsa_gates = _hrv_rsa_gates(ecg_signals, context, sampling_rate=sampling_rate,
                                    window=window, window_number=window_number, continuous=continuous)
     else:
         warn(
@@ -204,27 +210,27 @@ def hrv_rsa(ecg_signals, rsp_signals=None, rpeaks=None, sampling_rate=1000, cont
 # =============================================================================
 def _hrv_rsa_p2t(rsp_onsets, rpeaks, sampling_rate, continuous=False, ecg_period=None, rsp_peaks=None):
     """Peak-to-trough algorithm (P2T)"""
-
-    # Find all RSP cycles and the Rpeaks within
-    cycles_rri = []
-    for idx in range(len(rsp_onsets) - 1):
-        cycle_init = rsp_onsets[idx]
-        cycle_end = rsp_onsets[idx + 1]
-        cycles_rri.append(rpeaks[np.logical_and(rpeaks >= cycle_init, rpeaks < cycle_end)])
-
-    # Iterate over all cycles
-    rsa_values = np.full(len(cycles_rri), np.nan)
-    for i, cycle in enumerate(cycles_rri):
-        # Estimate of RSA during each breath
-        RRis = np.diff(cycle) / sampling_rate
-        if len(RRis) > 1:
-            rsa_values[i] = np.max(RRis) - np.min(RRis)
+    # R-R intervals (in seconds)
+    rri = np.diff(rpeaks) / sampling_rate
+
+    # Find all RSP cycles and the R-peaks within (peaks[start:end]), and their R-R intervals
+    # (rri[start:end - 1])
+    start = np.searchsorted(rpeaks, rsp_onsets[:-1], side="left")
+    end = np.searchsorted(rpeaks, rsp_onsets[1:], side="left")
+
+    # Estimate of RSA during each breath (with at least 2 R-R intervals)
+    rsa_values = np.full(len(start), np.nan)
+    valid = end - start > 2
+    if np.any(valid):
+        bounds = np.column_stack([start[valid], end[valid] - 1]).ravel()
+        rri = np.append(rri, np.nan)  # So that the last boundary is a valid index
+        rsa_values[valid] = (np.maximum.reduceat(rri, bounds) - np.minimum.reduceat(rri, bounds))[::2]
 
     if continuous is False:
         rsa = {"RSA_P2T_Mean": np.nanmean(rsa_values)}
         rsa["RSA_P2T_Mean_log"] = np.log(rsa["RSA_P2T_Mean"])  # pylint: disable=E1111
         rsa["RSA_P2T_SD"] = np.nanstd(rsa_values, ddof=1)
-        rsa["RSA_P2T_NoRSA"] = len(pd.Series(rsa_values).index[pd.Series(rsa_values).isnull()])
+        rsa["RSA_P2T_NoRSA"] = int(np.sum(np.isnan(rsa_values)))
     else:
         rsa = signal_interpolate(
             x_values=rsp_peaks[~np.isnan(rsa_values)],
@@ -253,19 +259,18 @@ def _hrv_rsa_pb(ecg_period, sampling_rate, continuous=False):
     # Remove variance outside bandwidth of spontaneous respiration
     zero_mean_filtered = signal_filter(zero_mean, sampling_rate=2, lowcut=0.12, highcut=0.40)
 
-    # Divide into 30-second epochs
-    time = np.arange(0, len(zero_mean_filtered)) / 2
-    time = pd.DataFrame({"Epoch Index": time // 30, "Signal": zero_mean_filtered})
-    time = time.set_index("Epoch Index")
-
-    epochs = [time.loc[i] for i in range(int(np.max(time.index.values)) + 1)]
-    variance = []
-    for epoch in epochs:
-        variance.append(np.log(epoch.var(axis=0) / 1000))  # convert ms
+    # Divide into 30-second epochs (of 60 samples), the last one being possibly shorter
+    n_full = len(zero_mean_filtered) // 60
+    epochs = zero_mean_filtered[: n_full * 60].reshape(n_full, 60)
+    variance = np.var(epochs, axis=1, ddof=1)
+    if len(zero_mean_filtered) > n_full * 60:
+        last = zero_mean_filtered[n_full * 60 :]
+        variance = np.append(variance, np.var(last, ddof=1) if len(last) > 1 else np.nan)
 
-    variance = [row for row in variance if not np.isnan(row).any()]
+    with np.errstate(divide="ignore"):
+        variance = np.log(variance / 1000)  # convert ms
 
-    return {"RSA_PorgesBohrer": pd.concat(variance).mean()}
+    return {"RSA_PorgesBohrer": np.mean(variance[~np.isnan(variance)])}
 
 
 # def _hrv_rsa_synchrony(ecg_period, rsp_signal, sampling_rate=1000, method="correlation", continuous=False):
@@ -338,14 +343,14 @@ def _hrv_rsa_pb(ecg_period, sampling_rate, continuous=False):
 # Second-by-second RSA
 # =============================================================================
 
-def _hrv_rsa_gates(ecg_signals, rpeaks, sampling_rate=1000, window=None, window_number=None,
+def _hrv_rsa_gates(ecg_signals, context, sampling_rate=1000, window=None, window_number=None,
                    continuous=False):
 
     # Boundaries of rsa freq
     min_frequency = 0.12
     max_frequency = 0.40
     # Retrived IBI and interpolate it
-    rri, sampling_rate = _hrv_get_rri(rpeaks, sampling_rate=sampling_rate, interpolate=True)
+    rri, sampling_rate = context.rri_interpolated()
 
     # Re-sample at 4 Hz
     desired_sampling_rate = 4
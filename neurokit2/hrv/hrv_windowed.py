@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import scipy.signal
+
+from ..signal import signal_interpolate
+from ..signal.signal_psd import _signal_psd_lomb_fast
+from .hrv_context import hrv_context
+
+
+def hrv_windowed(
+    peaks,
+    sampling_rate=1000,
+    window=300,
+    step=30,
+    ulf=(0, 0.0033),
+    vlf=(0.0033, 0.04),
+    lf=(0.04, 0.15),
+    hf=(0.15, 0.4),
+    vhf=(0.4, 0.5),
+    psd_method="welch",
+    normalize=True,
+    interpolation_rate=4,
+):
+    """Computes time-resolved indices of Heart Rate Variability (HRV).
+
+    Computes time- and frequency-domain HRV indices in windows of ``window`` seconds sliding every
+    ``step`` seconds over the recording (e.g., 5-minute HRV every 30 seconds over a Holter recording),
+    without recomputing each window from scratch.
+
+    The time-domain indices are the same as those of ``hrv_time()`` applied to the R-R intervals within
+    each window. They are obtained from cumulative sums of the R-R intervals and of their successive
+    differences, and from the order statistics of all the windows at once (except for ``TINN`` and
+    ``HTI``, which require a histogram of each window).
+
+    The frequency-domain indices are obtained as in ``hrv_frequency()`` with the Welch method, but from
+    the R-R intervals interpolated once over the whole recording at ``interpolation_rate`` (the start
+    of each window being rounded to the closest interpolated sample). As the Welch spectrum of a
+    window is the average of the periodograms of its segments, the periodogram of each segment is
+    computed once and shared by all the windows that contain it. With the Lomb-Scargle method, the R-R
+    intervals are not interpolated: the periodogram of each window is computed directly from the R-R
+    intervals at the time of their peak, for all the windows at once. The frequency-domain indices of
+    the windows with less than 2 R-R intervals (e.g., within a gap of the recording) are NaN.
+
+    Parameters
+    ----------
+    peaks : dict
+        Samples at which cardiac extrema (i.e., R-peaks, systolic peaks) occur. Dictionary returned
+        by ecg_findpeaks, ecg_peaks, ppg_findpeaks, or ppg_peaks. Can also be the output of
+        ``hrv_context()``.
+    sampling_rate : int, optional
+        Sampling rate (Hz) of the continuous cardiac signal in which the peaks occur. By default 1000.
+    window : float
+        Duration of the windows (in seconds). By default 300 (i.e., 5 minutes).
+    step : float
+        Time between the starts of consecutive windows (in seconds). By default 30.
+    ulf : tuple, optional
+        Upper and lower limit of the ultra-low frequency band. By default (0, 0.0033).
+    vlf : tuple, optional
+        Upper and lower limit of the very-low frequency band. By default (0.0033, 0.04).
+    lf : tuple, optional
+        Upper and lower limit of the low frequency band. By default (0.04, 0.15).
+    hf : tuple, optional
+        Upper and lower limit of the high frequency band. By default (0.15, 0.4).
+    vhf : tuple, optional
+        Upper and lower limit of the very-high frequency band. By default (0.4, 0.5).
+    psd_method : str
+        Method used for spectral density estimation. Can be "welch" (default) or "lomb".
+    normalize : bool
+        Normalization of power by maximum PSD value (of each window). Default to True.
+    interpolation_rate : int
+        Sampling rate (Hz) at which the R-R intervals are interpolated for the frequency-domain
+        indices (with the Welch method). By default 4.
+
+    Returns
+    -------
+    DataFrame
+        Contains the time-domain (see ``hrv_time()``) and frequency-domain (see ``hrv_frequency()``)
+        HRV indices of each window, indexed by the start of the window (in seconds).
+
+    See Also
+    --------
+    hrv, hrv_time, hrv_frequency
+
+    Examples
+    --------
+    >>> import neurokit2 as nk
+    >>>
+    >>> # Simulate a 20-minute recording
+    >>> ecg = nk.ecg_simulate(duration=1200, sampling_rate=250, heart_rate=70, random_state=42)
+    >>> peaks, info = nk.ecg_peaks(ecg, sampling_rate=250)
+    >>>
+    >>> # 5-minute HRV every 30 seconds
+    >>> hrv = nk.hrv_windowed(peaks, sampling_rate=250, window=300, step=30)
+    >>> hrv[["HRV_MeanNN", "HRV_RMSSD", "HRV_LF", "HRV_HF"]].plot(subplots=True) #doctest: +SKIP
+    >>>
+    >>> # Lomb-Scargle periodogram of the (non-interpolated) R-R intervals
+    >>> hrv = nk.hrv_windowed(peaks, sampling_rate=250, window=300, step=30, psd_method="lomb")
+
+    """
+    # Sanitize input
+    context = hrv_context(peaks, sampling_rate=sampling_rate)
+
+    # R-R intervals (also referred to as NN) in milliseconds, and their time
+    rri = context.rri
+    peaks_time = np.asarray(context.peaks) / context.sampling_rate
+
+    # Windows
+    starts = np.arange(peaks_time[0], peaks_time[-1] - window + step / 1000, step)
+    if len(starts) == 0:
+        raise ValueError("NeuroKit error: hrv_windowed(): the recording is shorter than 'window'.")
+
+    # The R-R intervals within each window are those between the peaks within the window
+    first = np.searchsorted(peaks_time, starts, side="left")
+    n = np.maximum(np.searchsorted(peaks_time, starts + window, side="left") - first - 1, 0)
+
+    out = _hrv_windowed_time(rri, first, n)
+    out.update(
+        _hrv_windowed_frequency(
+            peaks_time,
+            rri,
+            starts,
+            first,
+            n,
+            window,
+            frequency_band=[ulf, vlf, lf, hf, vhf],
+            psd_method=psd_method,
+            normalize=normalize,
+            interpolation_rate=interpolation_rate,
+        )
+    )
+
+    out = pd.DataFrame(out, index=pd.Index(starts, name="Window_Start")).add_prefix("HRV_")
+    return out
+
+
+# =============================================================================
+# Time domain
+# =============================================================================
+def _hrv_windowed_time(rri, first, n):
+    """Time-domain indices of the R-R intervals ``rri[first:first + n]`` of each window."""
+    diff_rri = np.diff(rri)
+
+    # Cumulative sums (of values centred on their mean, for numerical precision)
+    def window_sum(x, first, n):
+        cumsum = np.concatenate([[0], np.cumsum(x)])
+        return cumsum[first + n] - cumsum[first]
+
+    rri_centred = rri - np.mean(rri)
+    sum_rri = window_sum(rri_centred, first, n)
+    sum_rri2 = window_sum(rri_centred ** 2, first, n)
+    diff_centred = diff_rri - np.mean(diff_rri)
+    n_diff = np.maximum(n - 1, 0)
+    sum_diff = window_sum(diff_centred, first, n_diff)
+    sum_diff2 = window_sum(diff_centred ** 2, first, n_diff)
+    sum_sd = window_sum(diff_rri ** 2, first, n_diff)
+    nn50 = window_sum(np.abs(diff_rri) > 50, first, n_diff)
+    nn20 = window_sum(np.abs(diff_rri) > 20, first, n_diff)
+
+    out = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Mean based
+        out["RMSSD"] = np.sqrt(sum_sd / n_diff)
+
+        out["MeanNN"] = sum_rri / n + np.mean(rri)
+        out["SDNN"] = np.sqrt(np.maximum(sum_rri2 - sum_rri ** 2 / n, 0) / (n - 1))
+        out["SDSD"] = np.sqrt(np.maximum(sum_diff2 - sum_diff ** 2 / n_diff, 0) / (n_diff - 1))
+
+        # Normalized
+        out["CVNN"] = out["SDNN"] / out["MeanNN"]
+        out["CVSD"] = out["RMSSD"] / out["MeanNN"]
+
+        # Robust
+        q25, q50, q75, mad = _hrv_windowed_quantiles(rri, first, n)
+        out["MedianNN"] = q50
+        out["MadNN"] = mad
+        out["MCVNN"] = out["MadNN"] / out["MedianNN"]  # Normalized
+        out["IQRNN"] = q75 - q25
+
+        # Extreme-based
+        out["pNN50"] = nn50 / n * 100
+        out["pNN20"] = nn20 / n * 100
+
+    # Geometrical domain
+    out["TINN"] = np.full(len(first), np.nan)
+    out["HTI"] = np.full(len(first), np.nan)
+    for i in np.where(n > 0)[0]:
+        bar_y, bar_x = np.histogram(rri[first[i] : first[i] + n[i]], bins="auto")
+        out["TINN"][i] = np.max(bar_x) - np.min(bar_x)  # Triangular Interpolation of the NN Interval Histogram
+        out["HTI"][i] = n[i] / np.max(bar_y)  # HRV Triangular Index
+
+    return out
+
+
+def _hrv_windowed_quantiles(rri, first, n, constant=1.4826, blocksize=2 ** 20):
+    """First quartile, median, third quartile and median absolute deviation of each window.
+
+    The windows are sorted at once as the rows of a matrix padded with infinite values (by blocks of
+    windows, to bound the memory).
+
+    """
+    out = np.full((4, len(first)), np.nan)
+    width = max(np.max(n, initial=0), 1)
+    step = max(blocksize // width, 1)
+    for block in range(0, len(first), step):
+        rows = slice(block, block + step)
+        index = first[rows, np.newaxis] + np.arange(width)
+        valid = np.arange(width) < n[rows, np.newaxis]
+        values = np.sort(np.where(valid, rri[np.minimum(index, len(rri) - 1)], np.inf), axis=1)
+
+        q25 = _hrv_windowed_percentile(values, n[rows], 0.25)
+        q50 = _hrv_windowed_percentile(values, n[rows], 0.5)
+        q75 = _hrv_windowed_percentile(values, n[rows], 0.75)
+        deviation = np.sort(np.where(valid, np.abs(values - q50[:, np.newaxis]), np.inf), axis=1)
+        out[:, rows] = [q25, q50, q75, constant * _hrv_windowed_percentile(deviation, n[rows], 0.5)]
+
+    return out
+
+
+def _hrv_windowed_percentile(values, n, q):
+    """Percentile (with linear interpolation, as ``np.percentile()``) of the first n sorted values of
+    each row."""
+    position = q * (n - 1)
+    lower = np.floor(position).astype(int)
+    t = position - lower
+    rows = np.arange(len(values))
+    a = values[rows, np.clip(lower, 0, values.shape[1] - 1)]
+    b = values[rows, np.clip(lower + 1, 0, values.shape[1] - 1)]
+    b = np.where(t > 0, b, a)
+    with np.errstate(invalid="ignore"):
+        # Same interpolation as numpy (more accurate when t is close to 1)
+        out = np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+    return np.where(n > 0, out, np.nan)
+
+
+# =============================================================================
+# Frequency domain
+# =============================================================================
+def _hrv_windowed_frequency(
+    peaks_time,
+    rri,
+    starts,
+    first,
+    n,
+    window,
+    frequency_band,
+    psd_method="welch",
+    normalize=True,
+    interpolation_rate=4,
+):
+    """Frequency-domain indices of each window."""
+    # Lowest frequency, so as to capture at least 2 cycles of it (see `signal_power()`)
+    length = int(np.round(window * interpolation_rate))
+    for band in frequency_band:
+        min_frequency = band[0] if band[0] > 0 else 0.001  # sanitize lowest frequency
+        if int((2 / min_frequency) * interpolation_rate) <= length / 2:
+            break
+
+    if psd_method.lower() in ["welch"]:
+        frequency, power = _hrv_windowed_welch(
+            peaks_time, rri, starts, window, min_frequency, interpolation_rate=interpolation_rate
+        )
+    elif psd_method.lower() in ["lombscargle", "lomb"]:
+        frequency, power = _hrv_windowed_lomb(peaks_time, rri, first, n, window, min_frequency)
+    else:
+        raise ValueError("NeuroKit error: hrv_windowed(): 'psd_method' should be one of 'welch' or 'lomb'.")
+
+    # No spectrum for the windows with too few beats (e.g., within a gap), rather than that of the
+    # R-R intervals interpolated across the gap
+    power[n < 2] = np.nan
+
+    if normalize is True:
+        power /= np.max(power, axis=1, keepdims=True)
+
+    # Power in each frequency band
+    keep = np.logical_and(frequency >= min_frequency, frequency <= 0.5)
+    frequency, power = frequency[keep], power[:, keep]
+    out = {}
+    for name, band in zip(["ULF", "VLF", "LF", "HF", "VHF"], frequency_band):
+        indices = np.logical_and(frequency >= band[0], frequency < band[1])
+        out[name] = np.trapz(y=power[:, indices], x=frequency[indices], axis=1)
+        out[name][out[name] == 0] = np.nan  # As in `signal_power()`
+
+    # Normalized
+    total_power = np.nansum([out[name] for name in ["ULF", "VLF", "LF", "HF", "VHF"]], axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["LFHF"] = out["LF"] / out["HF"]
+        out["LFn"] = out["LF"] / total_power
+        out["HFn"] = out["HF"] / total_power
+
+        # Log
+        out["LnHF"] = np.log(out["HF"])
+
+    return out
+
+
+def _hrv_windowed_welch(peaks_time, rri, starts, window, min_frequency, interpolation_rate=4):
+    """Welch spectrum of each window, from the periodograms of segments shared between windows."""
+    fs = interpolation_rate
+
+    # Interpolated R-R intervals, from the start of the first window to the end of the last one
+    length = int(np.round(window * fs))
+    offsets = np.round((starts - starts[0]) * fs).astype(int)
+    time = starts[0] + np.arange(offsets[-1] + length) / fs
+    rri = signal_interpolate(peaks_time[1:], rri, x_new=time)
+
+    # Length of the segments (see `signal_psd()`)
+    nperseg = min(int((2 / min_frequency) * fs), int(length / 2))
+    hop = nperseg - nperseg // 2  # Default overlap of scipy.signal.welch()
+
+    # Spectra of the segments of all the windows (each one computed once, even if it is shared by
+    # several windows), scaled as the one-sided density of `scipy.signal.welch()`
+    index = offsets[:, np.newaxis] + np.arange((length - nperseg) // hop + 1) * hop
+    segment_starts, index = np.unique(index, return_inverse=True)
+    index = index.reshape(len(offsets), -1)
+    nfft = int(nperseg * 2)
+    taper = scipy.signal.get_window("hann", nperseg)
+    scale = np.full(nfft // 2 + 1, 2 / (fs * np.sum(taper ** 2)))
+    scale[[0, -1]] /= 2
+    frequency = np.fft.rfftfreq(nfft, 1 / fs)
+    segments = np.lib.stride_tricks.sliding_window_view(rri, nperseg)[segment_starts]
+    spectrum = np.fft.rfft(segments * taper, n=nfft, axis=1)
+    spectrum_taper = np.fft.rfft(taper, n=nfft)
+
+    # Welch spectrum of each window, i.e., the average of the periodograms of its segments. As the
+    # mean of the window is removed beforehand (see `signal_psd()`), the periodogram of a segment
+    # is |X - mean * W|^2, where X and W are the spectra of the segment and of the taper.
+    mean = np.concatenate([[0], np.cumsum(rri)])
+    mean = (mean[offsets + length] - mean[offsets]) / length
+    power = (np.abs(spectrum) ** 2)[index].mean(axis=1)
+    power -= 2 * mean[:, np.newaxis] * np.real(spectrum[index].mean(axis=1) * np.conj(spectrum_taper))
+    power += mean[:, np.newaxis] ** 2 * np.abs(spectrum_taper) ** 2
+    power *= scale
+
+    return frequency, power
+
+
+def _hrv_windowed_lomb(peaks_time, rri, first, n, window, min_frequency, max_frequency=0.5, blocksize=2 ** 18):
+    """Lomb-Scargle periodogram of the R-R intervals of each window, at the time of their peak (i.e.,
+    without interpolation). The windows are computed together, by blocks (see ``signal_psd()``)."""
+    # Frequency grid (5 samples per peak of width 1 / window, see `signal_psd()`)
+    df = 1 / window / 5
+    n_frequency = 1 + int(np.round((max_frequency - min_frequency) / df))
+    frequency = min_frequency + df * np.arange(n_frequency)
+
+    power = np.full((len(first), n_frequency), np.nan)
+    width = max(np.max(n, initial=0), 1)
+    step = max(blocksize // (n_frequency * 20), 1)  # Size of the FFT grid of `_signal_psd_lomb_fast()`
+    for block in range(0, len(first), step):
+        rows = slice(block, block + step)
+        index = first[rows, np.newaxis] + np.arange(width)
+        valid = np.arange(width) < n[rows, np.newaxis]
+        index = np.minimum(index, len(rri) - 1)
+        power[rows] = _signal_psd_lomb_fast(
+            np.where(valid, peaks_time[index + 1], np.nan),
+            np.where(valid, rri[index], np.nan),
+            min_frequency,
+            df,
+            n_frequency,
+        )
+
+    return frequency, power
@@ -1,22 +1,18 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .microstates_clean import microstates_clean
-from .microstates_peaks import microstates_peaks
-from .microstates_static import microstates_static
-from .microstates_dynamic import microstates_dynamic
-from .microstates_complexity import microstates_complexity
-from .microstates_segment import microstates_segment
-from .microstates_classify import microstates_classify
-from .microstates_plot import microstates_plot
-from .microstates_findnumber import microstates_findnumber
 
-
-__all__ = ["microstates_clean",
-           "microstates_peaks",
-           "microstates_static",
-           "microstates_dynamic",
-           "microstates_complexity",
-           "microstates_segment",
-           "microstates_classify",
-           "microstates_plot",
-           "microstates_findnumber"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "microstates_clean": ".microstates_clean",
+        "microstates_peaks": ".microstates_peaks",
+        "microstates_static": ".microstates_static",
+        "microstates_dynamic": ".microstates_dynamic",
+        "microstates_complexity": ".microstates_complexity",
+        "microstates_segment": ".microstates_segment",
+        "microstates_classify": ".microstates_classify",
+        "microstates_plot": ".microstates_plot",
+        "microstates_findnumber": ".microstates_findnumber",
+    },
+)
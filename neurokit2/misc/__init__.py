@@ -1,22 +1,17 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .expspace import expspace
-from .find_closest import find_closest
-from .find_consecutive import find_consecutive
-from .find_groups import find_groups
-from .listify import listify
-from .type_converters import as_vector
-from .replace import replace
-from .warnings import NeuroKitWarning
 
-
-__all__ = [
-    "listify",
-    "find_closest",
-    "find_consecutive",
-    "find_groups",
-    "as_vector",
-    "expspace",
-    "replace",
-    "NeuroKitWarning",
-]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "listify": ".listify",
+        "find_closest": ".find_closest",
+        "find_consecutive": ".find_consecutive",
+        "find_groups": ".find_groups",
+        "as_vector": ".type_converters",
+        "expspace": ".expspace",
+        "replace": ".replace",
+        "NeuroKitWarning": ".warnings",
+    },
+)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import itertools
+import os
+
+
+def _parallel_workers(n_jobs=1):
+    """Number of workers for ``n_jobs``: as many as the available CPUs if None or smaller than 1."""
+    if n_jobs is None or n_jobs < 1:
+        return os.cpu_count() or 1
+    return int(n_jobs)
+
+
+def _parallel_map(function, tasks, n_jobs=1, processes=False, group=4):
+    """Apply a function to the arguments of each task, possibly in a pool of workers.
+
+    Used by the functions with a ``n_jobs`` argument. The tasks (tuples of arguments) are run in the
+    current thread if there is a single worker (see ``_parallel_workers()``), and otherwise in a pool
+    of threads, or of processes if ``processes`` is True (in which case the function and its arguments
+    must be picklable). The tasks are submitted by groups of ``group`` tasks per worker, so that only
+    a few of them (and of their results) are held in memory at once. Returns an iterator over the
+    results, in the order of the tasks.
+
+    Examples
+    --------
+    >>> from neurokit2.misc.parallel import _parallel_map
+    >>>
+    >>> list(_parallel_map(pow, [(2, 3), (3, 2), (4, 0.5)], n_jobs=2))
+    [8, 9, 2.0]
+
+    """
+    n_workers = _parallel_workers(n_jobs)
+    if n_workers == 1:
+        for task in tasks:
+            yield function(*task)
+        return
+
+    import concurrent.futures
+
+    if processes is True:
+        pool = concurrent.futures.ProcessPoolExecutor
+    else:
+        pool = concurrent.futures.ThreadPoolExecutor
+
+    tasks = iter(tasks)
+    with pool(max_workers=n_workers) as executor:
+        while True:
+            chunk = list(itertools.islice(tasks, group * n_workers))
+            if len(chunk) == 0:
+                break
+            for result in executor.map(function, *zip(*chunk)):
+                yield result
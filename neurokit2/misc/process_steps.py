@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+
+def _process_steps(steps, available, dependencies=None, function="process"):
+    """Select the processing steps to run, including the ones they depend on.
+
+    Used by the ``*_process()`` functions to only run the requested steps (all of them if ``steps``
+    is None). Returns the set of steps to run and the set of steps to return.
+
+    Examples
+    --------
+    >>> from neurokit2.misc.process_steps import _process_steps
+    >>>
+    >>> run, output = _process_steps(["phase"], ["peaks", "delineate", "phase"],
+    ...                              {"phase": ["delineate"], "delineate": ["peaks"]})
+    >>> sorted(run), sorted(output)
+    (['delineate', 'peaks', 'phase'], ['phase'])
+
+    """
+    if steps is None:
+        return set(available), set(available)
+
+    if isinstance(steps, str):
+        steps = [steps]
+    steps = [step.lower() for step in steps]
+
+    unknown = [step for step in steps if step not in available]
+    if unknown:
+        raise ValueError(
+            "NeuroKit error: " + function + "(): unknown steps " + str(unknown) + ". 'steps' should be"
+            " None or a list of steps among " + str(list(available)) + "."
+        )
+
+    if dependencies is None:
+        dependencies = {}
+
+    run = set()
+    to_add = list(steps)
+    while to_add:
+        step = to_add.pop()
+        if step not in run:
+            run.add(step)
+            to_add.extend(dependencies.get(step, []))
+
+    return run, set(steps)
@@ -1,12 +1,16 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-# Aliases
-from ..signal import signal_rate as ppg_rate
-from .ppg_clean import ppg_clean
-from .ppg_findpeaks import ppg_findpeaks
-from .ppg_plot import ppg_plot
-from .ppg_process import ppg_process
-from .ppg_simulate import ppg_simulate
 
-
-__all__ = ["ppg_simulate", "ppg_clean", "ppg_findpeaks", "ppg_rate", "ppg_process", "ppg_plot"]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "ppg_simulate": ".ppg_simulate",
+        "ppg_clean": ".ppg_clean",
+        "ppg_findpeaks": ".ppg_findpeaks",
+        # Aliases
+        "ppg_rate": "..signal:signal_rate",
+        "ppg_process": ".ppg_process",
+        "ppg_plot": ".ppg_plot",
+    },
+)
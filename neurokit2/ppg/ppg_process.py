@@ -2,13 +2,14 @@
 import pandas as pd
 
 from ..misc import as_vector
+from ..misc.process_steps import _process_steps
 from ..signal import signal_rate
 from ..signal.signal_formatpeaks import _signal_from_indices
 from .ppg_clean import ppg_clean
 from .ppg_findpeaks import ppg_findpeaks
 
 
-def ppg_process(ppg_signal, sampling_rate=1000, **kwargs):
+def ppg_process(ppg_signal, sampling_rate=1000, steps=None, **kwargs):
     """Process a photoplethysmogram (PPG)  signal.
 
     Convenience function that automatically processes a photoplethysmogram signal.
@@ -19,6 +20,10 @@ def ppg_process(ppg_signal, sampling_rate=1000, **kwargs):
         The raw PPG channel.
     sampling_rate : int
         The sampling frequency of `emg_signal` (in Hz, i.e., samples/second).
+    steps : list
+        The processing steps to run, among "peaks" and "rate" (the signal is always cleaned). If "rate"
+        is requested without "peaks", the peaks are found but only returned in the info dictionary (not
+        in the signals). If None (default), all steps are run.
 
     Returns
     -------
@@ -49,21 +54,28 @@ def ppg_process(ppg_signal, sampling_rate=1000, **kwargs):
     # Sanitize input
     ppg_signal = as_vector(ppg_signal)
 
+    run, output = _process_steps(steps, ["peaks", "rate"], {"rate": ["peaks"]}, function="ppg_process")
+
     # Clean signal
     ppg_cleaned = ppg_clean(ppg_signal, sampling_rate=sampling_rate)
+    signals = {"PPG_Raw": ppg_signal, "PPG_Clean": ppg_cleaned}
+    info = {}
 
     # Find peaks
-    info = ppg_findpeaks(ppg_cleaned, sampling_rate=sampling_rate, **kwargs)
-
-    # Mark peaks
-    peaks_signal = _signal_from_indices(info["PPG_Peaks"], desired_length=len(ppg_cleaned))
+    if "peaks" in run:
+        info = ppg_findpeaks(ppg_cleaned, sampling_rate=sampling_rate, **kwargs)
 
     # Rate computation
-    rate = signal_rate(info["PPG_Peaks"], sampling_rate=sampling_rate, desired_length=len(ppg_cleaned))
+    if "rate" in run:
+        signals["PPG_Rate"] = signal_rate(
+            info["PPG_Peaks"], sampling_rate=sampling_rate, desired_length=len(ppg_cleaned)
+        )
+
+    # Mark peaks
+    if "peaks" in output:
+        signals["PPG_Peaks"] = _signal_from_indices(info["PPG_Peaks"], desired_length=len(ppg_cleaned))
 
     # Prepare output
-    signals = pd.DataFrame(
-        {"PPG_Raw": ppg_signal, "PPG_Clean": ppg_cleaned, "PPG_Rate": rate, "PPG_Peaks": peaks_signal}
-    )
+    signals = pd.DataFrame(signals)
 
     return signals, info
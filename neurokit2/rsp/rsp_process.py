@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
 
+from ..misc.process_steps import _process_steps
 from ..signal import signal_rate
 from .rsp_amplitude import rsp_amplitude
 from .rsp_clean import rsp_clean
@@ -8,7 +9,7 @@ from .rsp_peaks import rsp_peaks
 from .rsp_phase import rsp_phase
 
 
-def rsp_process(rsp_signal, sampling_rate=1000, method="khodadad2018"):
+def rsp_process(rsp_signal, sampling_rate=1000, method="khodadad2018", steps=None):
     """Process a respiration (RSP) signal.
 
     Convenience function that automatically processes a respiration signal with one of the following methods:
@@ -27,6 +28,11 @@ def rsp_process(rsp_signal, sampling_rate=1000, method="khodadad2018"):
         The sampling frequency of `rsp_signal` (in Hz, i.e., samples/second).
     method : str
         The processing pipeline to apply. Can be one of "khodadad2018" (default) or "biosppy".
+    steps : list
+        The processing steps to run, among "peaks", "phase", "amplitude" and "rate" (the signal is
+        always cleaned). The steps on which they depend are run as well, but their columns are not
+        added to the signals (the peaks and troughs are still returned in the info dictionary). If None
+        (default), all steps are run.
 
     Returns
     -------
@@ -60,21 +66,34 @@ def rsp_process(rsp_signal, sampling_rate=1000, method="khodadad2018"):
     >>> fig #doctest: +SKIP
 
     """
+    run, output = _process_steps(
+        steps,
+        ["peaks", "phase", "amplitude", "rate"],
+        {"phase": ["peaks"], "amplitude": ["peaks"], "rate": ["peaks"]},
+        function="rsp_process",
+    )
+
     # Clean signal
     rsp_cleaned = rsp_clean(rsp_signal, sampling_rate=sampling_rate, method=method)
+    signals = {"RSP_Raw": rsp_signal, "RSP_Clean": rsp_cleaned}
+    info = {}
 
     # Extract, fix and format peaks
-    peak_signal, info = rsp_peaks(rsp_cleaned, sampling_rate=sampling_rate, method=method, amplitude_min=0.3)
+    if "peaks" in run:
+        peak_signal, info = rsp_peaks(rsp_cleaned, sampling_rate=sampling_rate, method=method, amplitude_min=0.3)
 
     # Get additional parameters
-    phase = rsp_phase(peak_signal, desired_length=len(rsp_signal))
-    amplitude = rsp_amplitude(rsp_cleaned, peak_signal)
-    rate = signal_rate(peak_signal, sampling_rate=sampling_rate, desired_length=len(rsp_signal))
+    if "amplitude" in run:
+        signals["RSP_Amplitude"] = rsp_amplitude(rsp_cleaned, peak_signal)
+    if "rate" in run:
+        signals["RSP_Rate"] = signal_rate(peak_signal, sampling_rate=sampling_rate, desired_length=len(rsp_signal))
 
     # Prepare output
-    signals = pd.DataFrame(
-        {"RSP_Raw": rsp_signal, "RSP_Clean": rsp_cleaned, "RSP_Amplitude": amplitude, "RSP_Rate": rate}
-    )
-    signals = pd.concat([signals, phase, peak_signal], axis=1)
+    signals = [pd.DataFrame(signals)]
+    if "phase" in run:
+        signals.append(rsp_phase(peak_signal, desired_length=len(rsp_signal)))
+    if "peaks" in output:
+        signals.append(peak_signal)
+    signals = pd.concat(signals, axis=1) if len(signals) > 1 else signals[0]
 
     return signals, info
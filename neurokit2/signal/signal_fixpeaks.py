@@ -1,6 +1,4 @@
 # - * - coding: utf-8 - * -
-import matplotlib.patches
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
@@ -168,7 +166,10 @@ def _signal_fixpeaks_kubios(peaks, sampling_rate=1000, iterative=True, show=Fals
 
             previous_diff = n_artifacts_previous - n_artifacts_current
 
-            artifacts, subspaces = _find_artifacts(peaks_clean, sampling_rate=sampling_rate)
+            # Only the thresholds around the corrected peaks need to be updated (and nothing, if no
+            # peaks were corrected).
+            if not np.array_equal(peaks_clean, subspaces["peaks"]):
+                artifacts, subspaces = _find_artifacts(peaks_clean, sampling_rate=sampling_rate, previous=subspaces)
             peaks_clean = _correct_artifacts(artifacts, peaks_clean)
 
             n_artifacts_previous = n_artifacts_current
@@ -183,7 +184,9 @@ def _signal_fixpeaks_kubios(peaks, sampling_rate=1000, iterative=True, show=Fals
 # =============================================================================
 # Kubios: Lipponen & Tarvainen (2019).
 # =============================================================================
-def _find_artifacts(peaks, c1=0.13, c2=0.17, alpha=5.2, window_width=91, medfilt_order=11, sampling_rate=1000):
+def _find_artifacts(
+    peaks, c1=0.13, c2=0.17, alpha=5.2, window_width=91, medfilt_order=11, sampling_rate=1000, previous=None
+):
 
     # Compute period series (make sure it has same numer of elements as peaks);
     # peaks are in samples, convert to seconds.
@@ -198,124 +201,167 @@ def _find_artifacts(peaks, c1=0.13, c2=0.17, alpha=5.2, window_width=91, medfilt
     # Compute dRRs: time series of differences of consecutive periods (dRRs).
     drrs = np.ediff1d(rr, to_begin=0)
     drrs[0] = np.mean(drrs[1:])
-    # Normalize by threshold.
-    th1 = _compute_threshold(drrs, alpha, window_width)
-    drrs /= th1
 
-    # ignore division by 0 warning
-    np.seterr(divide="ignore", invalid="ignore")
+    # Rolling thresholds, and median of RRs (reused from the previous peaks where possible).
+    thresholds = _find_artifacts_thresholds(
+        peaks, rr, drrs, alpha=alpha, window_width=window_width, medfilt_order=medfilt_order, previous=previous
+    )
+    th1, medrr, th2 = thresholds
 
-    # Cast dRRs to subspace s12.
-    # Pad drrs with one element.
+    # Normalize by threshold.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drrs /= th1
+
+    # Cast dRRs to subspace s12 and s22.
+    # Pad drrs with two elements.
     padding = 2
     drrs_pad = np.pad(drrs, padding, "reflect")
+    drrs_prev = drrs_pad[padding - 1 : -padding - 1]
+    drrs_next = drrs_pad[padding + 1 : -padding + 1]
+    drrs_next2 = drrs_pad[padding + 2 :]
 
-    s12 = np.zeros(drrs.size)
-    for d in np.arange(padding, padding + drrs.size):
-
-        if drrs_pad[d] > 0:
-            s12[d - padding] = np.max([drrs_pad[d - 1], drrs_pad[d + 1]])
-        elif drrs_pad[d] < 0:
-            s12[d - padding] = np.min([drrs_pad[d - 1], drrs_pad[d + 1]])
-
-    # Cast dRRs to subspace s22.
-    s22 = np.zeros(drrs.size)
-    for d in np.arange(padding, padding + drrs.size):
+    with np.errstate(invalid="ignore"):
+        s12 = np.where(drrs > 0, np.maximum(drrs_prev, drrs_next), 0)
+        s12 = np.where(drrs < 0, np.minimum(drrs_prev, drrs_next), s12)
 
-        if drrs_pad[d] >= 0:
-            s22[d - padding] = np.min([drrs_pad[d + 1], drrs_pad[d + 2]])
-        elif drrs_pad[d] < 0:
-            s22[d - padding] = np.max([drrs_pad[d + 1], drrs_pad[d + 2]])
+        s22 = np.where(drrs >= 0, np.minimum(drrs_next, drrs_next2), 0)
+        s22 = np.where(drrs < 0, np.maximum(drrs_next, drrs_next2), s22)
 
     # Compute mRRs: time series of deviation of RRs from median.
-    df = pd.DataFrame({"signal": rr})
-    medrr = df.rolling(medfilt_order, center=True, min_periods=1).median().signal.to_numpy()
     mrrs = rr - medrr
     mrrs[mrrs < 0] = mrrs[mrrs < 0] * 2
     # Normalize by threshold.
-    th2 = _compute_threshold(mrrs, alpha, window_width)
-    mrrs /= th2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mrrs /= th2
 
     # Artifact classification #################################################
     ###########################################################################
-
-    # Artifact classes.
-    extra_idcs = []
-    missed_idcs = []
-    ectopic_idcs = []
-    longshort_idcs = []
-
-    i = 0
-    while i < rr.size - 2:  # The flow control is implemented based on Figure 1
-
-        if np.abs(drrs[i]) <= 1:  # Figure 1
-            i += 1
-            continue
-        eq1 = np.logical_and(drrs[i] > 1, s12[i] < (-c1 * drrs[i] - c2))  # pylint: disable=E1111
-        eq2 = np.logical_and(drrs[i] < -1, s12[i] > (-c1 * drrs[i] + c2))  # pylint: disable=E1111
-
-        if np.any([eq1, eq2]):
-            # If any of the two equations is true.
-            ectopic_idcs.append(i)
-            i += 1
-            continue
-        # If none of the two equations is true.
-        if ~np.any([np.abs(drrs[i]) > 1, np.abs(mrrs[i]) > 3]):  # Figure 1
-            i += 1
-            continue
-        longshort_candidates = [i]
-        # Check if the following beat also needs to be evaluated.
-        if np.abs(drrs[i + 1]) < np.abs(drrs[i + 2]):
-            longshort_candidates.append(i + 1)
-
-        for j in longshort_candidates:
-            # Long beat.
-            eq3 = np.logical_and(drrs[j] > 1, s22[j] < -1)  # pylint: disable=E1111
-            # Long or short.
-            eq4 = np.abs(mrrs[j]) > 3  # Figure 1
-            # Short beat.
-            eq5 = np.logical_and(drrs[j] < -1, s22[j] > 1)  # pylint: disable=E1111
-
-            if ~np.any([eq3, eq4, eq5]):
-                # If none of the three equations is true: normal beat.
-                i += 1
-                continue
-            # If any of the three equations is true: check for missing or extra
-            # peaks.
-
-            # Missing.
-            eq6 = np.abs(rr[j] / 2 - medrr[j]) < th2[j]  # Figure 1
-            # Extra.
-            eq7 = np.abs(rr[j] + rr[j + 1] - medrr[j]) < th2[j]  # Figure 1
-
-            # Check if extra.
-            if np.all([eq5, eq7]):
-                extra_idcs.append(j)
-                i += 1
-                continue
-            # Check if missing.
-            if np.all([eq3, eq6]):
-                missed_idcs.append(j)
-                i += 1
-                continue
-            # If neither classified as extra or missing, classify as "long or
-            # short".
-            longshort_idcs.append(j)
-            i += 1
+    with np.errstate(invalid="ignore"):
+        ectopic_idcs, longshort_candidates = _find_artifacts_candidates(drrs, s12, c1=c1, c2=c2)
+
+        # Classify the candidates (Figure 1).
+        j = longshort_candidates
+        # Long beat.
+        eq3 = np.logical_and(drrs[j] > 1, s22[j] < -1)
+        # Long or short.
+        eq4 = np.abs(mrrs[j]) > 3
+        # Short beat.
+        eq5 = np.logical_and(drrs[j] < -1, s22[j] > 1)
+        # Missing.
+        eq6 = np.abs(rr[j] / 2 - medrr[j]) < th2[j]
+        # Extra.
+        eq7 = np.abs(rr[j] + rr[j + 1] - medrr[j]) < th2[j]
+
+    # If none of the three equations is true: normal beat. Otherwise, check for extra or missing
+    # peaks and, if neither, classify as "long or short".
+    abnormal = eq3 | eq4 | eq5
+    extra = abnormal & eq5 & eq7
+    missed = abnormal & ~extra & eq3 & eq6
+    longshort = abnormal & ~extra & ~missed
+
+    extra_idcs = j[extra].tolist()
+    missed_idcs = j[missed].tolist()
+    ectopic_idcs = ectopic_idcs.tolist()
+    longshort_idcs = j[longshort].tolist()
 
     # Prepare output
     artifacts = {"ectopic": ectopic_idcs, "missed": missed_idcs, "extra": extra_idcs, "longshort": longshort_idcs}
 
     subspaces = {"rr": rr, "drrs": drrs, "mrrs": mrrs, "s12": s12, "s22": s22, "c1": c1, "c2": c2}
+    subspaces.update({"peaks": peaks, "thresholds": thresholds})
 
     return artifacts, subspaces
 
 
+def _find_artifacts_thresholds(peaks, rr, drrs, alpha=5.2, window_width=91, medfilt_order=11, previous=None):
+    """Thresholds of dRRs and mRRs, and median of RRs.
+
+    These rolling statistics only depend on the neighbouring peaks. If the subspaces obtained for
+    ``previous`` peaks are given, they are only recomputed around the peaks that changed (the others
+    being shifted to their new index).
+
+    """
+    n = len(rr)
+    if previous is None:
+        dirty = np.ones(n, dtype=bool)
+        thresholds = [np.zeros(n), np.zeros(n), np.zeros(n)]
+    else:
+        # Index of the peaks in the previous peaks
+        previous_peaks = previous["peaks"]
+        index = np.minimum(np.searchsorted(previous_peaks, peaks), len(previous_peaks) - 1)
+        changed = previous_peaks[index] != peaks
+        changed[1:] |= np.diff(index) != 1
+        changed[0] = True  # The first RR is the average RR
+
+        # Statistics that depend on changed peaks (through the rolling windows, padded for the
+        # median and the differences), or on the end of the signal (where the windows are truncated)
+        dirty = _find_artifacts_dilate(changed, window_width // 2 + medfilt_order // 2 + 4)
+        dirty[-(window_width // 2 + 1) :] = True
+        thresholds = [old[index] for old in previous["thresholds"]]
+
+    # Beats within the rolling windows of the dirty beats. As these windows do not extend beyond
+    # these beats (except at the edges of the signal), the other beats can be dropped.
+    around = _find_artifacts_dilate(dirty, window_width // 2 + 1)
+    around_rr = _find_artifacts_dilate(around, medfilt_order // 2 + 1)
+
+    medrr = np.full(n, np.nan)
+    medrr[around_rr] = pd.Series(rr[around_rr]).rolling(medfilt_order, center=True, min_periods=1).median()
+    mrrs = rr[around] - medrr[around]
+    mrrs[mrrs < 0] = mrrs[mrrs < 0] * 2
+
+    th1 = np.full(n, np.nan)
+    th1[around] = _compute_threshold(drrs[around], alpha, window_width)
+    th2 = np.full(n, np.nan)
+    th2[around] = _compute_threshold(mrrs, alpha, window_width)
+
+    for new, old in zip([th1, medrr, th2], thresholds):
+        old[dirty] = new[dirty]
+
+    return thresholds
+
+
+def _find_artifacts_dilate(mask, radius):
+    """Elements of ``mask`` that are within ``radius`` of a True element."""
+    count = np.cumsum(np.concatenate([[0], mask]))
+    i = np.arange(len(mask))
+    return count[np.minimum(i + radius + 1, len(mask))] > count[np.maximum(i - radius, 0)]
+
+
+def _find_artifacts_candidates(drrs, s12, c1=0.13, c2=0.17):
+    """Ectopic beats, and candidates for long, short, missed or extra beats.
+
+    The flow control is implemented based on Figure 1. Beats whose dRR is above threshold are either
+    ectopic (subspace 1) or candidates for the other classes, in which case the following beat is
+    also a candidate if its dRR is smaller than the next one. That following beat is then skipped,
+    i.e., it cannot be ectopic nor bring its own following beat as a candidate.
+
+    """
+    i = np.arange(max(drrs.size - 2, 0))
+    d = drrs[i]
+
+    eq1 = np.logical_and(d > 1, s12[i] < (-c1 * d - c2))
+    eq2 = np.logical_and(d < -1, s12[i] > (-c1 * d + c2))
+    above = ~(np.abs(d) <= 1)
+    ectopic = above & (eq1 | eq2)
+    candidate = above & ~ectopic
+    # Check if the following beat also needs to be evaluated.
+    pair = candidate & (np.abs(drrs[i + 1]) < np.abs(drrs[i + 2]))
+
+    # In a run of consecutive pairs, every other beat is skipped (starting with the second one).
+    run_start = pair & ~np.concatenate([[False], pair[:-1]])
+    offset = i - np.maximum.accumulate(np.where(run_start, i, 0))
+    pair &= offset % 2 == 0
+    visited = ~np.concatenate([[False], pair[:-1]])
+
+    candidates = np.sort(np.concatenate([i[candidate & visited], i[pair & visited] + 1]))
+    return i[ectopic & visited], candidates
+
+
 def _compute_threshold(signal, alpha, window_width):
 
-    df = pd.DataFrame({"signal": np.abs(signal)})
-    q1 = df.rolling(window_width, center=True, min_periods=1).quantile(0.25).signal.to_numpy()
-    q3 = df.rolling(window_width, center=True, min_periods=1).quantile(0.75).signal.to_numpy()
+    rolling = pd.Series(np.abs(signal)).rolling(window_width, center=True, min_periods=1)
+    q1 = rolling.quantile(0.25).to_numpy()
+    q3 = rolling.quantile(0.75).to_numpy()
     th = alpha * ((q3 - q1) / 2)
 
     return th
@@ -375,7 +421,7 @@ def _correct_missed(missed_idcs, peaks):
     # number of elements.
     valid_idcs = np.logical_and(missed_idcs > 1, missed_idcs < len(corrected_peaks))  # pylint: disable=E1111
     missed_idcs = missed_idcs[valid_idcs]
-    prev_peaks = corrected_peaks[[i - 1 for i in missed_idcs]]
+    prev_peaks = corrected_peaks[missed_idcs - 1]
     next_peaks = corrected_peaks[missed_idcs]
     added_peaks = prev_peaks + (next_peaks - prev_peaks) / 2
     # Add the new peaks before the missed indices (see numpy docs).
@@ -395,8 +441,8 @@ def _correct_misaligned(misaligned_idcs, peaks):
         misaligned_idcs > 1, misaligned_idcs < len(corrected_peaks) - 1  # pylint: disable=E1111
     )
     misaligned_idcs = misaligned_idcs[valid_idcs]
-    prev_peaks = corrected_peaks[[i - 1 for i in misaligned_idcs]]
-    next_peaks = corrected_peaks[[i + 1 for i in misaligned_idcs]]
+    prev_peaks = corrected_peaks[misaligned_idcs - 1]
+    next_peaks = corrected_peaks[misaligned_idcs + 1]
 
     half_ibi = (next_peaks - prev_peaks) / 2
     peaks_interp = prev_peaks + half_ibi
@@ -414,13 +460,16 @@ def _update_indices(source_idcs, update_idcs, update):
     if not update_idcs:
         return update_idcs
 
-    for s in source_idcs:
-        update_idcs = [u + update if u > s else u for u in update_idcs]
-
-    return update_idcs
+    # As the elements of source_idcs are applied in turn (in increasing order) and compared with the
+    # already updated u, u is updated by the first k elements such that s_k - update * (k - 1) < u.
+    source_idcs = np.sort(source_idcs)
+    n_updates = np.searchsorted(source_idcs - update * np.arange(len(source_idcs)), update_idcs, side="left")
+    return (np.asarray(update_idcs) + update * n_updates).tolist()
 
 
 def _plot_artifacts_lipponen2019(artifacts, info):
+    import matplotlib.patches
+    import matplotlib.pyplot as plt
 
     # Extract parameters
     longshort_idcs = artifacts["longshort"]
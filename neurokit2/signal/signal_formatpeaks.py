@@ -30,6 +30,8 @@ def _signal_from_indices(indices, desired_length=None, value=1):
 
     """
     signal = np.zeros(desired_length)
+    if len(indices) == 0:
+        return signal
 
     # Force indices as int
     if isinstance(indices[0], np.float):
@@ -1,42 +1,29 @@
 """Submodule for NeuroKit."""
+from .._lazy import attach
 
-from .correlation import cor
-from .density import density
-from .distance import distance
-from .fit_error import fit_error, fit_mse, fit_r2, fit_rmse
-from .fit_loess import fit_loess
-from .fit_mixture import fit_mixture
-from .fit_polynomial import fit_polynomial, fit_polynomial_findorder
-from .hdi import hdi
-from .mad import mad
-from .mutual_information import mutual_information
-from .rescale import rescale
-from .standardize import standardize
-from .summary import summary_plot
-from .cluster import cluster
-from .cluster_quality import cluster_quality
-from .cluster_findnumber import cluster_findnumber
 
-
-__all__ = [
-    "standardize",
-    "hdi",
-    "mad",
-    "cor",
-    "density",
-    "distance",
-    "rescale",
-    "fit_loess",
-    "fit_polynomial",
-    "fit_polynomial_findorder",
-    "fit_mixture",
-    "fit_error",
-    "fit_mse",
-    "fit_rmse",
-    "fit_r2",
-    "mutual_information",
-    "summary_plot",
-    "cluster",
-    "cluster_quality",
-    "cluster_findnumber"
-]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "standardize": ".standardize",
+        "hdi": ".hdi",
+        "mad": ".mad",
+        "cor": ".correlation",
+        "density": ".density",
+        "distance": ".distance",
+        "rescale": ".rescale",
+        "fit_loess": ".fit_loess",
+        "fit_polynomial": ".fit_polynomial",
+        "fit_polynomial_findorder": ".fit_polynomial",
+        "fit_mixture": ".fit_mixture",
+        "fit_error": ".fit_error",
+        "fit_mse": ".fit_error",
+        "fit_rmse": ".fit_error",
+        "fit_r2": ".fit_error",
+        "mutual_information": ".mutual_information",
+        "summary_plot": ".summary",
+        "cluster": ".cluster",
+        "cluster_quality": ".cluster_quality",
+        "cluster_findnumber": ".cluster_findnumber",
+    },
+)
@@ -36,8 +36,7 @@ test_requirements = requirements + [
     "biosppy",
     "cvxopt",
     "PyWavelets",
-    "EMD-signal",
-    "astropy"
+    "EMD-signal"
 ]
 
 # Setup
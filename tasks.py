@@ -65,6 +65,14 @@ def lint(c):
     c.run("pylint {}".format(SOURCE_DIR))
 
 
+@task
+def exports(c):
+    """
+    Regenerate the export table of the top-level namespace
+    """
+    c.run('python -c "from neurokit2._lazy import _generate_exports; _generate_exports()"')
+
+
 @task
 def test(c):
     """
@@ -74,6 +82,19 @@ def test(c):
     c.run("python {} test".format(SETUP_FILE), pty=pty)
 
 
+@task(help={"n": "Number of fresh interpreters in which to import the package"})
+def benchmark_import(c, n=10):
+    """
+    Time the import of the package, compared to that of its main dependencies
+    """
+    code = "import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)"
+    for modules in ["neurokit2", "numpy", "numpy, pandas, scipy.signal, matplotlib.pyplot, sklearn"]:
+        timings = [
+            float(c.run('python -c "{}"'.format(code.format(modules)), hide=True).stdout) for _ in range(int(n))
+        ]
+        print("{}: {:.1f} ms (median of {})".format(modules, 1000 * sorted(timings)[len(timings) // 2], n))
+
+
 @task(help={"publish": "Publish the result via coveralls"})
 def coverage(c, publish=False):
     """
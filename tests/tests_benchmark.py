@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+import neurokit2 as nk
+from neurokit2.benchmark.benchmark_ecg import benchmark_ecg_compareRpeaks
+
+
+def test_benchmark_ecg_compareRpeaks():
+    # Tolerance of 5 samples
+    true_rpeaks = [100, 300, 500, 700, 900]
+    found_rpeaks = [105, 306, 500, 698, 702, 1200]
+    scores = benchmark_ecg_compareRpeaks(true_rpeaks, found_rpeaks, sampling_rate=100, tolerance=0.05)
+
+    # 105 is at the tolerance (matched), 306 beyond it (not matched), 702 is closer to the already
+    # matched 700 than to 900, and 1200 is far from everything
+    assert (scores["TP"], scores["FP"], scores["FN"]) == (3, 3, 2)
+    assert np.isclose(scores["Sensitivity"], 3 / 5)
+    assert np.isclose(scores["PPV"], 3 / 6)
+    assert np.isclose(scores["F1"], 6 / 11)
+    assert np.isclose(scores["Timing_Error"], (5 + 0 + 2) / 3 / 100)
+
+    # Independent of the order
+    assert benchmark_ecg_compareRpeaks(true_rpeaks[::-1], found_rpeaks[::-1], sampling_rate=100) == scores
+
+    # No detected R-peak
+    scores = benchmark_ecg_compareRpeaks(true_rpeaks, [], sampling_rate=100)
+    assert (scores["TP"], scores["FP"], scores["FN"]) == (0, 0, 5)
+    assert scores["Sensitivity"] == 0 and np.isnan(scores["PPV"]) and np.isnan(scores["Timing_Error"])
+
+
+def test_benchmark_ecg_preprocessing():
+    ecg = nk.ecg_simulate(duration=20, sampling_rate=200, random_state=42)
+    true_rpeaks = nk.ecg_peaks(ecg, sampling_rate=200)[1]["ECG_R_Peaks"]
+
+    def function(ecg, sampling_rate):
+        return nk.ecg_peaks(ecg, sampling_rate=sampling_rate)[1]["ECG_R_Peaks"]
+
+    results = nk.benchmark_ecg_preprocessing(function, ecg, true_rpeaks, sampling_rate=200)
+    assert results["Error"].iloc[0] == "None"
+    assert results["F1"].iloc[0] == 1
+    assert results["Score"].iloc[0] == 0
+
+    # Too few detected R-peaks
+    results = nk.benchmark_ecg_preprocessing(lambda ecg, sampling_rate: [10], ecg, true_rpeaks, sampling_rate=200)
+    assert results["Error"].iloc[0] == "R-peaks detected <= 3"
+    assert np.isnan(results["Score"].iloc[0])
+
+
+def test_benchmark_ecg_score():
+    from neurokit2.benchmark.benchmark_ecg import _benchmark_ecg_score
+
+    # Same as the average difference of the periods interpolated over all the samples
+    true_rpeaks = np.array([120, 350, 560, 800, 1010, 1240, 1460])
+    found_rpeaks = np.array([20, 118, 355, 470, 565, 790, 1250, 1400, 1500])
+    length = np.max(found_rpeaks)
+    true_period, found_period = [
+        nk.signal_period(rpeaks, sampling_rate=100, desired_length=length + 1, interpolation_method="linear")
+        for rpeaks in [true_rpeaks, found_rpeaks]
+    ]
+    score, error = _benchmark_ecg_score(true_rpeaks, found_rpeaks, sampling_rate=100)
+    assert error == "None"
+    assert np.isclose(score, np.mean(np.abs(found_period - true_period)[:length]))
+
+
+def _benchmark_function(ecg, sampling_rate):
+    return nk.ecg_peaks(ecg, sampling_rate=sampling_rate)[1]["ECG_R_Peaks"]
+
+
+def test_benchmark_ecg_preprocessing_databases():
+    # Two databases (of two participants each, at different sampling rates)
+    ecgs, rpeaks = [], []
+    for database, sampling_rate in [("A", 200), ("B", 250)]:
+        for participant in ["P1", "P2"]:
+            ecg = nk.ecg_simulate(duration=10, sampling_rate=sampling_rate, random_state=len(ecgs))
+            info = {"Participant": participant, "Database": database}
+            ecgs.append(pd.DataFrame({"ECG": ecg, "Sampling_Rate": sampling_rate, **info}))
+            rpeaks.append(pd.DataFrame({"Rpeaks": _benchmark_function(ecg, sampling_rate), **info}))
+    ecgs, rpeaks = pd.concat(ecgs), pd.concat(rpeaks)
+
+    results = nk.benchmark_ecg_preprocessing(_benchmark_function, ecgs, rpeaks)
+    assert len(results) == 4
+    keys = list(zip(results["Participant"], results["Database"]))
+    assert keys == [("P1", "A"), ("P1", "B"), ("P2", "A"), ("P2", "B")]
+    for column in ["Duration", "Throughput", "Memory"]:
+        assert np.all(results[column] > 0)
+    assert np.all(results["F1"] == 1)
+
+    # Same results over several processes (except for the timings and memory)
+    results_parallel = nk.benchmark_ecg_preprocessing(_benchmark_function, ecgs, rpeaks, n_jobs=2, memory=False)
+    assert results_parallel["Memory"].isna().all()
+    assert list(results_parallel.columns) == list(results.columns)
+    pd.testing.assert_frame_equal(
+        results_parallel.drop(columns=["Duration", "Throughput", "Memory"]),
+        results.drop(columns=["Duration", "Throughput", "Memory"]),
+    )
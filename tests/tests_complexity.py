@@ -32,6 +32,63 @@ def test_complexity_sanity():
     assert np.allclose(nk.fractal_correlation(signal, r="nolds"), nolds.corr_dim(signal, 2), atol=0.0001)
 
 
+def test_complexity_count_chebyshev():
+    from neurokit2.complexity.utils import _get_count_chebyshev, _get_embedded
+
+    # Quantized signal, with many distances equal to r
+    signal = np.round(np.random.RandomState(42).normal(0, 5, 500))
+    for delay, dimension, r in [(1, 2, 2.0), (2, 3, 3.0), (3, 1, 1.0)]:
+        count_all, count1, count2 = _get_count_chebyshev(signal, delay=delay, dimension=dimension, r=r)
+        assert np.array_equal(count_all, _get_embedded(signal, delay, dimension, r, approximate=True)[1])
+        assert np.array_equal(count1, _get_embedded(signal, delay, dimension, r, approximate=False)[1])
+        assert np.array_equal(count2, _get_embedded(signal, delay, dimension + 1, r, approximate=True)[1])
+
+
+def test_complexity_fuzzy_blocks():
+    signal = np.cumsum(np.random.RandomState(42).normal(0, 1, 600))
+
+    fuzzyen = nk.entropy_fuzzy(signal, block_size=600)
+    assert nk.entropy_fuzzy(signal, block_size=7) == fuzzyen
+    assert nk.entropy_fuzzy(signal, block_size=100, n_jobs=2) == fuzzyen
+
+
+def test_complexity_multiscale():
+    from neurokit2.complexity.utils import _get_coarsegrained_cumulative, _get_coarsegrained_rolling
+
+    signal = np.round(np.cumsum(np.random.RandomState(42).normal(0, 5, 1000)))
+    for i, rows in _get_coarsegrained_cumulative(signal, scale_factors=[1, 2, 7], rolling=True):
+        assert np.array_equal(np.array(rows), _get_coarsegrained_rolling(signal, [1, 2, 7][i]))
+
+    for kwargs in [{}, {"composite": True}, {"refined": True}]:
+        mse = nk.entropy_multiscale(signal, scale=8, **kwargs)
+        assert nk.entropy_multiscale(signal, scale=8, n_jobs=2, **kwargs) == mse
+
+
+def test_complexity_correlation_blocks():
+    from neurokit2.complexity.fractal_correlation import _fractal_correlation_count
+
+    embedded = nk.complexity_embedding(np.random.RandomState(42).normal(0, 1, 300), delay=1, dimension=3)
+    dist = np.sqrt(np.sum((embedded[:, np.newaxis, :] - embedded[np.newaxis, :, :]) ** 2, axis=2))
+    r_vals = np.array([1.5, 0.1, 0.5, 1.0, 3.0])
+    count = np.array([np.sum(dist[np.triu_indices(len(dist), k=1)] < r) for r in r_vals])
+    for block_size in [1, 7, 300]:
+        assert np.array_equal(_fractal_correlation_count(embedded, r_vals, block_size=block_size), count)
+
+
+def test_complexity_dfa_trends():
+    from neurokit2.complexity.fractal_dfa import _fractal_dfa_getwindow, _fractal_dfa_trends
+
+    signal = np.cumsum(np.random.RandomState(42).normal(0, 1, 301))
+    for window, overlap in [(4, True), (17, True), (16, False)]:
+        segments = _fractal_dfa_getwindow(signal, len(signal), window, overlap)
+        starts = np.arange(0, len(signal) - window, window // 2) if overlap else np.arange(len(segments)) * window
+        assert np.array_equal(segments, np.array([signal[i : i + window] for i in starts]))
+
+        x = np.arange(window)
+        trends = np.array([np.polyval(np.polyfit(x, segment, 1), x) for segment in segments])
+        assert np.allclose(_fractal_dfa_trends(segments, window, order=1), trends)
+
+
 # =============================================================================
 # Comparison against R
 # =============================================================================
@@ -2,6 +2,7 @@
 import biosppy
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import pytest
 
 import neurokit2 as nk
@@ -26,6 +27,54 @@ def test_ecg_simulate():
     )
 
 
+def test_ecg_simulate_batch(tmp_path):
+
+    ecg, info = nk.ecg_simulate_batch(n=4, duration=20, sampling_rate=250, heart_rate_std=10, random_state=42)
+    assert ecg.shape == (4, 5000)
+    assert np.allclose(np.min(ecg, axis=1), -0.4, atol=0.1)
+
+    # Each subject has its own heart rate
+    for i in range(len(ecg)):
+        _, rpeaks = nk.ecg_peaks(nk.ecg_clean(ecg[i], sampling_rate=250), sampling_rate=250)
+        rate = nk.signal_rate(rpeaks["ECG_R_Peaks"], sampling_rate=250)
+        assert np.allclose(np.mean(rate), info["Heart_Rate"][i], atol=2)
+
+    # Reproducible, and independent of the number of processes
+    ecg2, info2 = nk.ecg_simulate_batch(
+        n=4, duration=20, sampling_rate=250, heart_rate_std=10, random_state=42, n_jobs=2, filename=tmp_path / "ecg.npy"
+    )
+    assert np.array_equal(info["Random_State"], info2["Random_State"])
+    assert np.allclose(ecg, ecg2, atol=1e-6)
+    assert np.allclose(np.load(tmp_path / "ecg.npy"), ecg, atol=1e-6)
+
+
+def test_ecg_simulate_batch_workers(monkeypatch):
+    import concurrent.futures
+    import importlib
+    import os
+
+    ecg, _ = nk.ecg_simulate_batch(n=8, duration=5, sampling_rate=250, random_state=42)
+    ecg2, _ = nk.ecg_simulate_batch(n=8, duration=5, sampling_rate=250, random_state=42, n_jobs=-1)
+    assert np.allclose(ecg, ecg2)
+
+    # As many workers as CPUs, with at least one chunk each (counted with threads instead of processes)
+    module = importlib.import_module("neurokit2.ecg.ecg_simulate")
+    simulate = module._ecg_simulate_batch
+    chunks = []
+
+    def spy(*args):
+        chunks.append(len(args[-1]))
+        return simulate(*args)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor)
+    monkeypatch.setattr(module, "_ecg_simulate_batch", spy)
+    for n_jobs in [-1, None]:
+        chunks.clear()
+        nk.ecg_simulate_batch(n=8, duration=5, sampling_rate=250, random_state=42, n_jobs=n_jobs)
+        assert chunks == [2, 2, 2, 2]
+
+
 def test_ecg_clean():
 
     sampling_rate = 1000
@@ -86,6 +135,101 @@ def test_ecg_process():
     ecg = nk.ecg_simulate(sampling_rate=sampling_rate, noise=noise)
     signals, info = nk.ecg_process(ecg, sampling_rate=sampling_rate, method="neurokit")
 
+    # Only run some steps
+    signals_steps, info_steps = nk.ecg_process(ecg, sampling_rate=sampling_rate, steps=["peaks", "rate"])
+    assert list(signals_steps.columns) == ["ECG_Raw", "ECG_Clean", "ECG_Rate", "ECG_R_Peaks"]
+    assert np.array_equal(info_steps["ECG_R_Peaks"], info["ECG_R_Peaks"])
+    assert np.allclose(signals_steps["ECG_Rate"], signals["ECG_Rate"])
+
+    # Dependencies are run but not added to the signals (only to the info)
+    signals_steps, info_steps = nk.ecg_process(ecg, sampling_rate=sampling_rate, steps=["phase"])
+    assert "ECG_Phase_Atrial" in signals_steps.columns
+    assert "ECG_R_Peaks" not in signals_steps.columns
+    assert "ECG_T_Peaks" not in signals_steps.columns
+    assert info_steps.keys() == info.keys()
+    assert np.array_equal(info_steps["ECG_T_Peaks"], info["ECG_T_Peaks"], equal_nan=True)
+
+    with pytest.raises(ValueError):
+        nk.ecg_process(ecg, sampling_rate=sampling_rate, steps=["unknown"])
+
+
+def test_ecg_process_chunked(tmp_path):
+
+    sampling_rate = 250
+
+    ecg = nk.ecg_simulate(duration=120, sampling_rate=sampling_rate, heart_rate=70, random_state=3)
+    signals, info = nk.ecg_process(ecg, sampling_rate=sampling_rate)
+    signals_chunked, info_chunked = nk.ecg_process(ecg, sampling_rate=sampling_rate, chunk_size=30, overlap=5)
+
+    assert signals_chunked.shape == signals.shape
+    assert list(signals_chunked.columns) == list(signals.columns)
+    assert np.array_equal(np.where(signals_chunked["ECG_R_Peaks"])[0], info_chunked["ECG_R_Peaks"])
+    # Same beats, up to a few samples
+    assert len(info_chunked["ECG_R_Peaks"]) == len(info["ECG_R_Peaks"])
+    assert np.all(np.abs(info_chunked["ECG_R_Peaks"] - info["ECG_R_Peaks"]) <= 0.01 * sampling_rate)
+    # Same waves of each heartbeat
+    assert sorted(info_chunked.keys()) == sorted(info.keys())
+    for key in ["ECG_P_Peaks", "ECG_Q_Peaks", "ECG_S_Peaks", "ECG_T_Peaks", "ECG_P_Onsets", "ECG_T_Offsets"]:
+        assert len(info_chunked[key]) == len(info_chunked["ECG_R_Peaks"])
+        assert np.allclose(info_chunked[key], info[key], atol=0.01 * sampling_rate, equal_nan=True)
+
+    # Stream the chunks to disk
+    path = str(tmp_path / "ecg.csv")
+    signals_disk, info_disk = nk.ecg_process(
+        ecg, sampling_rate=sampling_rate, chunk_size=30, overlap=5, path=path
+    )
+    assert signals_disk is None
+    assert np.array_equal(info_disk["ECG_R_Peaks"], info_chunked["ECG_R_Peaks"])
+    assert np.allclose(pd.read_csv(path)["ECG_Clean"], signals_chunked["ECG_Clean"])
+
+    # A length that is not a multiple of the chunks (the short last chunk is merged into the previous one)
+    ecg = ecg[: 61 * sampling_rate]
+    for overlap, steps in [(0, None), (2, ["phase"]), (5, None)]:
+        signals, info = nk.ecg_process(
+            ecg, sampling_rate=sampling_rate, chunk_size=30, overlap=overlap, steps=steps
+        )
+        assert len(signals) == len(ecg)
+        assert len(info["ECG_R_Peaks"]) > 60
+
+
+def test_ecg_process_chunked_duplicates(monkeypatch):
+    import importlib
+
+    sampling_rate = 250
+    ecg = nk.ecg_simulate(duration=60, sampling_rate=sampling_rate, heart_rate=70, random_state=3)
+    _, info = nk.ecg_process(ecg, sampling_rate=sampling_rate)
+    # Chunks ending just after an R-peak
+    end = info["ECG_R_Peaks"][20] + 10
+
+    # The beat at the end of the first chunk is detected again at the start of the second one
+    module = importlib.import_module("neurokit2.ecg.ecg_process")
+    process = module._ecg_process
+    calls = []
+
+    def spy(ecg_signal, **kwargs):
+        signals, info = process(ecg_signal, **kwargs)
+        calls.append(len(ecg_signal))
+        if len(calls) > 1:
+            keys = ["ECG_P_Peaks", "ECG_Q_Peaks", "ECG_R_Peaks", "ECG_S_Peaks", "ECG_T_Peaks"]
+            beat = {key: sampling_rate + i + 1 for i, key in enumerate(keys)}  # Right after the overlap
+            for key in info:
+                info[key] = np.insert(np.asarray(info[key], dtype=float), 0, beat.get(key, np.nan))
+                if key in beat:
+                    signals.loc[beat[key], key] = 1
+            info["ECG_R_Peaks"] = info["ECG_R_Peaks"].astype(int)
+        return signals, info
+
+    monkeypatch.setattr(module, "_ecg_process", spy)
+    signals, info_chunked = nk.ecg_process(ecg, sampling_rate=sampling_rate, chunk_size=end / sampling_rate, overlap=1)
+
+    # The duplicated beat is dropped, as well as its waves
+    assert len(calls) > 2
+    assert len(info_chunked["ECG_R_Peaks"]) == len(info["ECG_R_Peaks"])
+    assert np.all(np.abs(info_chunked["ECG_R_Peaks"] - info["ECG_R_Peaks"]) <= 0.01 * sampling_rate)
+    assert len(info_chunked["ECG_P_Peaks"]) == len(info["ECG_R_Peaks"])
+    for i, key in enumerate(["ECG_P_Peaks", "ECG_Q_Peaks", "ECG_R_Peaks", "ECG_S_Peaks", "ECG_T_Peaks"]):
+        assert signals[key].iloc[end + i + 1] == 0
+
 
 def test_ecg_plot():
 
@@ -168,6 +312,51 @@ def test_ecg_findpeaks():
     info_martinez = nk.ecg_findpeaks(ecg_cleaned, method="martinez2003")
     assert np.allclose(info_martinez["ECG_R_Peaks"].size, 69, atol=1)
 
+    # Test promac method, sequentially and in parallel
+    info_promac = nk.ecg_findpeaks(ecg_cleaned, method="promac")
+    assert np.allclose(info_promac["ECG_R_Peaks"].size, 69, atol=1)
+    info_promac_parallel = nk.ecg_findpeaks(ecg_cleaned, method="promac", n_jobs=2)
+    assert np.array_equal(info_promac["ECG_R_Peaks"], info_promac_parallel["ECG_R_Peaks"])
+
+    # The intermediates shared by promac are used or ignored by each detector
+    import importlib
+
+    module = importlib.import_module("neurokit2.ecg.ecg_findpeaks")
+    shared = {"abs_signal": np.abs(ecg_cleaned)}
+    for method in ["elgendi", "gamboa", "hamilton"]:
+        detector = getattr(module, "_ecg_findpeaks_" + method)
+        assert np.array_equal(detector(ecg_cleaned, sampling_rate, shared=shared), detector(ecg_cleaned, sampling_rate))
+
+
+def test_ecg_peaks_stream():
+
+    sampling_rate = 250
+
+    ecg = nk.ecg_simulate(duration=60, sampling_rate=sampling_rate, noise=0.1, random_state=42)
+    ecg = nk.signal_distort(ecg, sampling_rate=sampling_rate, noise_amplitude=0.2, random_state=42)
+    packets = np.split(ecg, np.sort(np.random.RandomState(42).choice(len(ecg), size=200, replace=False)))
+
+    for method in ["pantompkins1985", "elgendi2010"]:
+        cleaned = nk.ecg_clean(ecg, sampling_rate=sampling_rate, method=method)
+        batch = nk.ecg_findpeaks(cleaned, sampling_rate=sampling_rate, method=method)["ECG_R_Peaks"]
+
+        # Same peaks regardless of the packet boundaries
+        stream = nk.ECGPeakStream(sampling_rate=sampling_rate, method=method)
+        rpeaks = np.concatenate([stream.push(packet) for packet in packets])
+        assert np.array_equal(rpeaks, batch)
+
+        stream.reset()
+        rpeaks = np.concatenate([stream.push(packet) for packet in np.array_split(ecg, 240)])
+        assert np.array_equal(rpeaks, batch)
+
+        # Already cleaned signal
+        stream = nk.ECGPeakStream(sampling_rate=sampling_rate, method=method, clean=False)
+        rpeaks = np.concatenate([stream.push(packet) for packet in np.array_split(cleaned, 240)])
+        assert np.array_equal(rpeaks, batch)
+
+    with pytest.raises(ValueError):
+        nk.ECGPeakStream(sampling_rate=sampling_rate, method="neurokit")
+
 
 def test_ecg_eventrelated():
 
@@ -244,6 +433,102 @@ def test_ecg_delineate():
     assert np.allclose(len(waves_cwt["ECG_T_Onsets"]), 22, atol=1)
     assert np.allclose(len(waves_cwt["ECG_T_Offsets"]), 22, atol=1)
 
+    # Wavelet transform computed around the beats only
+    _, waves_windowed = nk.ecg_delineate(ecg, rpeaks, sampling_rate=sampling_rate, method="cwt", windowed=True)
+    for key in waves_cwt:
+        assert np.allclose(
+            np.array(waves_windowed[key], dtype=float), np.array(waves_cwt[key], dtype=float), equal_nan=True
+        )
+
+
+def test_ecg_quality():
+
+    sampling_rate = 500
+
+    ecg = nk.ecg_simulate(duration=60, sampling_rate=sampling_rate, noise=0.1, random_state=42)
+    ecg_cleaned = nk.ecg_clean(ecg, sampling_rate=sampling_rate)
+    rpeaks = nk.ecg_peaks(ecg_cleaned, sampling_rate=sampling_rate)[1]["ECG_R_Peaks"]
+
+    quality = nk.ecg_quality(ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate)
+    assert len(quality) == len(ecg_cleaned)
+    assert np.allclose(quality[rpeaks].max(), 1)
+
+    # Same distances as with a DataFrame of heartbeats
+    heartbeats = nk.epochs_to_df(nk.ecg_segment(ecg_cleaned, rpeaks, sampling_rate=sampling_rate))
+    heartbeats = heartbeats.pivot(index="Label", columns="Time", values="Signal")
+    heartbeats.index = heartbeats.index.astype(int)
+    heartbeats = heartbeats.sort_index().dropna()
+    dist = nk.rescale(np.abs(nk.distance(heartbeats, method="mean")), to=[0, 1])
+    assert np.allclose(quality[rpeaks[heartbeats.index - 1]], 1 - dist)
+
+    # Rolling average heartbeat
+    quality_rolling = nk.ecg_quality(ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate, window=10)
+    assert len(quality_rolling) == len(ecg_cleaned)
+    assert np.all((quality_rolling[rpeaks] > -1e-10) & (quality_rolling[rpeaks] < 1 + 1e-10))
+
+    with pytest.raises(ValueError):
+        nk.ecg_quality(ecg_cleaned, rpeaks=rpeaks, sampling_rate=sampling_rate, window=1)
+
+    # Independent of the offset of the signal
+    quality_offset = nk.ecg_quality(ecg_cleaned + 1e6, rpeaks=rpeaks, sampling_rate=sampling_rate, window=10)
+    assert np.allclose(quality_offset, quality_rolling, atol=1e-6)
+
+
+def test_ecg_quality_distance_rolling():
+    from neurokit2.ecg.ecg_quality import _ecg_quality_distance_rolling
+
+    heartbeats = np.random.RandomState(42).normal(0, 1, size=(23, 40)) + 1e6
+    for window in [2, 5, 30]:
+        expected = np.zeros(len(heartbeats))
+        for i in range(1, len(heartbeats)):
+            previous = heartbeats[max(i - window + 1, 0) : i + 1]
+            expected[i] = np.mean((heartbeats[i] - previous.mean(axis=0)) / previous.std(axis=0, ddof=1))
+        expected[0] = expected[1]
+        dist = _ecg_quality_distance_rolling(heartbeats, np.arange(len(heartbeats)), window=window)
+        assert np.allclose(dist, expected)
+
+
+def test_ecg_leads():
+
+    sampling_rate = 500
+
+    ecg = nk.ecg_simulate(duration=30, sampling_rate=sampling_rate, heart_rate=70, random_state=42)
+    rng = np.random.RandomState(42)
+    leads = pd.DataFrame(
+        {lead: ecg * gain + rng.normal(0, 0.05, len(ecg)) for lead, gain in zip(["I", "aVR", "V1"], [1, -0.6, 0.4])}
+    )
+
+    # Cleaning all leads at once is the same as cleaning each lead
+    cleaned = nk.ecg_clean(leads, sampling_rate=sampling_rate)
+    assert list(cleaned.columns) == ["I", "aVR", "V1"]
+    for lead in leads:
+        assert np.allclose(cleaned[lead], nk.ecg_clean(leads[lead], sampling_rate=sampling_rate))
+    assert np.allclose(nk.ecg_clean(leads.values, sampling_rate=sampling_rate), cleaned.values)
+    assert nk.ecg_clean(leads[["I"]].values, sampling_rate=sampling_rate).shape == (len(leads), 1)
+
+    # R-peaks detected on all leads (including the inverted one)
+    signals, info = nk.ecg_peaks(cleaned, sampling_rate=sampling_rate)
+    _, info_lead = nk.ecg_peaks(cleaned["I"], sampling_rate=sampling_rate)
+    assert len(signals) == len(cleaned)
+    assert len(info["ECG_R_Peaks"]) == len(info_lead["ECG_R_Peaks"])
+    assert np.max(np.abs(info["ECG_R_Peaks"] - info_lead["ECG_R_Peaks"])) <= 0.01 * sampling_rate
+
+    # Each lead is delineated around the same R-peaks
+    signals, waves = nk.ecg_delineate(cleaned, info, sampling_rate=sampling_rate)
+    assert list(waves.keys()) == ["I", "aVR", "V1"]
+    assert "ECG_T_Peaks_aVR" in signals.columns
+    _, waves_lead = nk.ecg_delineate(cleaned["V1"].values, info, sampling_rate=sampling_rate)
+    assert np.array_equal(waves["V1"]["ECG_T_Peaks"], waves_lead["ECG_T_Peaks"], equal_nan=True)
+
+    # An inverted lead is delineated as the upright one
+    inverted = pd.DataFrame({"I": cleaned["I"], "aVR": -cleaned["I"]})
+    for method in ["peak", "cwt", "dwt"]:
+        signals, waves = nk.ecg_delineate(inverted, info, sampling_rate=sampling_rate, method=method)
+        assert np.array_equal(signals.filter(like="_aVR").values, signals.filter(like="_I").values)
+    # Waves that are all missing give empty columns
+    signals, _ = nk.ecg_delineate(-cleaned["I"].values, info, sampling_rate=sampling_rate)
+    assert len(signals) == len(cleaned)
+
 
 def test_ecg_intervalrelated():
 
@@ -85,3 +85,28 @@ Difference:
     # helper_plot(attribute, ecg_characteristics, test_data)
     assert diff.std() < 0.1 * test_data["sampling_rate"], report
     assert diff.mean() < 0.1 * test_data["sampling_rate"], report
+
+
+def test_ecg_delineate_dwt_analysis_sampling_rate(test_data):
+    # The signal (4000 Hz) is analysed at its own sampling rate by default
+    waves = run_test_func(test_data)
+    _, waves_resampled = nk.ecg_delineate(
+        test_data["ecg"], test_data["rpeaks"], test_data["sampling_rate"], method="dwt", analysis_sampling_rate=2000
+    )
+    for key in waves:
+        diff = waves[key] - np.array(waves_resampled[key], dtype=float)
+        diff = diff[~np.isnan(diff)]
+        assert np.median(np.abs(diff)) < MAX_SIGNAL_DIFF * test_data["sampling_rate"]
+
+
+def test_ecg_delineate_dwt_high_sampling_rate(test_data):
+    # At 16 kHz, the scales needed are not computed: the signal is resampled to 2000 Hz
+    ecg = nk.signal_resample(test_data["ecg"], sampling_rate=4000, desired_sampling_rate=16000)
+    _, waves = nk.ecg_delineate(ecg, test_data["rpeaks"] * 4, sampling_rate=16000, method="dwt")
+    _, waves_resampled = nk.ecg_delineate(
+        test_data["ecg"], test_data["rpeaks"], test_data["sampling_rate"], method="dwt", analysis_sampling_rate=2000
+    )
+    for key in waves:
+        diff = np.array(waves[key], dtype=float) / 4 - np.array(waves_resampled[key], dtype=float)
+        diff = diff[~np.isnan(diff)]
+        assert np.median(np.abs(diff)) < MAX_SIGNAL_DIFF * test_data["sampling_rate"]
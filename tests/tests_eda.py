@@ -114,6 +114,10 @@ def test_eda_process():
     recovery = np.where(signals["SCR_Recovery"] == 1)[0]
     assert peaks.shape == onsets.shape == recovery.shape == (5,)
 
+    signals, info = nk.eda_process(eda, sampling_rate=250, steps=["phasic"])
+    assert list(signals.columns) == ["EDA_Raw", "EDA_Clean", "EDA_Tonic", "EDA_Phasic"]
+    assert info == {}
+
 
 def test_eda_plot():
 
@@ -78,6 +78,115 @@ def test_hrv():
                in columns)
 
 
+def test_hrv_windowed():
+    rri = np.random.RandomState(42).normal(800, 50, 1000)
+    peaks = np.cumsum(rri).astype(int) + 1000
+
+    hrv = nk.hrv_windowed(peaks, sampling_rate=1000, window=120, step=15)
+    assert hrv.index[0] == peaks[0] / 1000
+    assert np.allclose(np.diff(hrv.index), 15)
+    assert hrv.index[-1] + 120 <= peaks[-1] / 1000
+
+    # Time domain indices are those of the peaks within each window
+    for i in [0, len(hrv) // 2, len(hrv) - 1]:
+        start = hrv.index[i] * 1000
+        window = peaks[(peaks >= start) & (peaks < start + 120 * 1000)]
+        hrv_time = nk.hrv_time(window, sampling_rate=1000)
+        assert np.allclose(hrv[hrv_time.columns].iloc[i].values, hrv_time.values[0])
+
+    # Frequency domain indices are those of the interpolated R-R intervals within each window
+    rri_interpolated = nk.signal_interpolate(peaks[1:] / 1000, np.diff(peaks), x_new=hrv.index[3] + np.arange(480) / 4)
+    power = nk.signal_power(
+        rri_interpolated,
+        frequency_band=[(0.04, 0.15), (0.15, 0.4)],
+        sampling_rate=4,
+        max_frequency=0.5,
+    )
+    assert np.allclose(hrv[["HRV_LF", "HRV_HF"]].iloc[3].values, power.values[0])
+    assert np.isnan(hrv["HRV_VLF"]).all()
+
+    # Windows that do not start on the interpolated samples are rounded to the closest one
+    hrv_step = nk.hrv_windowed(peaks, sampling_rate=1000, window=120, step=14.9)
+    start = hrv_step.index[0] + np.round((hrv_step.index[3] - hrv_step.index[0]) * 4) / 4
+    rri_interpolated = nk.signal_interpolate(peaks[1:] / 1000, np.diff(peaks), x_new=start + np.arange(480) / 4)
+    power = nk.signal_power(
+        rri_interpolated,
+        frequency_band=[(0.04, 0.15), (0.15, 0.4)],
+        sampling_rate=4,
+        max_frequency=0.5,
+    )
+    assert np.allclose(hrv_step[["HRV_LF", "HRV_HF"]].iloc[3].values, power.values[0])
+
+    # Lomb-Scargle periodogram of the R-R intervals (not interpolated)
+    hrv_lomb = nk.hrv_windowed(peaks, sampling_rate=1000, window=120, step=15, psd_method="lomb")
+    pd.testing.assert_frame_equal(hrv_lomb[hrv_time.columns], hrv[hrv_time.columns])
+    assert np.all(hrv_lomb[["HRV_LF", "HRV_HF"]] > 0)
+
+    with pytest.raises(ValueError, match=r"NeuroKit error: hrv_windowed\(\)"):
+        nk.hrv_windowed(peaks, sampling_rate=1000, window=1000)
+
+
+def test_hrv_windowed_gap():
+    # Gap (without any beat) longer than the window
+    rri = np.random.RandomState(42).normal(800, 50, 600)
+    rri[300] += 400 * 1000
+    peaks = np.cumsum(rri).astype(int)
+
+    hrv = nk.hrv_windowed(peaks, sampling_rate=1000, window=60, step=10, psd_method="lomb")
+    empty = hrv["HRV_MeanNN"].isna()
+    assert empty.any() and not empty.all()
+    assert hrv.loc[empty, "HRV_HF"].isna().all()
+    assert np.all(hrv.loc[~empty, "HRV_HF"] > 0)
+
+    # The R-R intervals interpolated across the gap are not used either
+    hrv = nk.hrv_windowed(peaks, sampling_rate=1000, window=60, step=10)
+    assert hrv.loc[empty.values, ["HRV_LF", "HRV_HF", "HRV_LFHF", "HRV_LnHF"]].isna().all().all()
+    assert np.all(hrv.loc[~empty.values, "HRV_HF"] > 0)
+
+
+def test_hrv_context():
+    ecg = nk.ecg_simulate(duration=120, sampling_rate=250, heart_rate=70, random_state=42)
+    _, peaks = nk.ecg_peaks(ecg, sampling_rate=250)
+
+    context = nk.hrv_context(peaks, sampling_rate=250)
+    assert nk.hrv_context(context) is context
+    assert np.array_equal(context.rri, np.diff(peaks["ECG_R_Peaks"]) / 250 * 1000)
+
+    # The sampling rate of the context is used
+    pd.testing.assert_frame_equal(nk.hrv(context), nk.hrv(peaks, sampling_rate=250))
+
+    # The interpolated R-R intervals and their PSD are computed once
+    rri, _ = context.rri_interpolated()
+    assert context.rri_interpolated()[0] is rri
+    assert not rri.flags.writeable
+    nk.hrv_frequency(context, psd_method="burg")
+    assert len(context._psd) == 2
+
+
+def test_hrv_batch():
+    peaks = {}
+    for i in range(3):
+        rri = np.random.RandomState(i).normal(800, 50, 150)
+        peaks["Participant_" + str(i)] = np.cumsum(rri).astype(int)
+    peaks["Failed"] = np.array([0, 800])
+
+    hrv = nk.hrv_batch(peaks, sampling_rate=1000, chunksize=2)
+    assert list(hrv.index) == list(peaks.keys())
+    for key in ["Participant_0", "Participant_2"]:
+        expected = nk.hrv(peaks[key], sampling_rate=1000)
+        assert np.allclose(hrv.loc[key, expected.columns].values.astype(float), expected.values[0], equal_nan=True)
+    assert hrv.loc["Participant_0", "Error"] == "None"
+    assert hrv.loc["Failed", "Error"] != "None"
+    assert np.isnan(hrv.loc["Failed", "HRV_MeanNN"])
+
+    # Process pool
+    hrv_parallel = nk.hrv_batch(peaks, sampling_rate=1000, n_jobs=2)
+    pd.testing.assert_frame_equal(hrv, hrv_parallel)
+
+    with pytest.raises(Exception):
+        nk.hrv_batch(peaks, sampling_rate=1000, errors="raise")
+
+
 def test_hrv_rsa():
     data = nk.data("bio_eventrelated_100hz")
     ecg_signals, info = nk.ecg_process(data["ECG"], sampling_rate=100)
@@ -117,6 +226,26 @@ def test_hrv_rsa():
         nk.hrv_rsa(ecg_signals, rsp_signals, rpeaks=info, sampling_rate=100, continuous=False)
 
 
+def test_hrv_rsa_p2t_pb():
+    from neurokit2.hrv.hrv_rsa import _hrv_rsa_p2t, _hrv_rsa_pb
+
+    # Cycles with 4, 1 (no RSA), 3 and 0 (no RSA) R-R intervals
+    rpeaks = np.array([0, 100, 220, 310, 400, 500, 590, 700, 800])
+    onsets = np.array([0, 401, 500, 800, 850])
+    rsa = _hrv_rsa_p2t(onsets, rpeaks, sampling_rate=100)
+    assert np.allclose(rsa["RSA_P2T_Mean"], np.mean([1.2 - 0.9, 1.1 - 0.9]))
+    assert rsa["RSA_P2T_NoRSA"] == 2
+
+    # Porges-Bohrer: the 100 s at 2 Hz make 3 epochs of 60 samples and a last one of 20
+    ecg_period = nk.signal_simulate(duration=100, sampling_rate=100, frequency=0.25) * 50 + 1000
+    resampled = nk.signal_resample(ecg_period, sampling_rate=100, desired_sampling_rate=2)
+    trend = nk.signal_filter(resampled, sampling_rate=2, lowcut=0.095, method="savgol", order=3, window_size=21)
+    filtered = nk.signal_filter(resampled - trend, sampling_rate=2, lowcut=0.12, highcut=0.40)
+    variance = [np.var(filtered[i : i + 60], ddof=1) for i in range(0, 200, 60)]
+    rsa = _hrv_rsa_pb(ecg_period, sampling_rate=100)
+    assert np.allclose(rsa["RSA_PorgesBohrer"], np.mean(np.log(np.array(variance) / 1000)))
+
+
 def test_hrv_nonlinear_fragmentation():
     # https://github.com/neuropsychology/NeuroKit/issues/344
     from neurokit2.hrv.hrv_nonlinear import _hrv_nonlinear_fragmentation
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import importlib
+import subprocess
+import sys
+
+import neurokit2 as nk
+
+
+def _run_fresh(code):
+    """Run code in a fresh interpreter (so that nothing is already imported) and return its output."""
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+
+
+def test_import_lazy():
+
+    # Importing the package should not load any dependency
+    code = """
+import sys
+import neurokit2
+print(*[m for m in ["numpy", "pandas", "scipy", "sklearn", "matplotlib"] if m in sys.modules])
+"""
+    assert _run_fresh(code) == []
+
+    # Accessing a function should only load what it needs
+    code = """
+import sys
+import neurokit2 as nk
+nk.ecg_peaks
+print(*[m for m in ["sklearn", "matplotlib"] if m in sys.modules])
+"""
+    assert _run_fresh(code) == []
+
+
+def test_import_time():
+
+    # Regressions are measured relative to the dependencies, in the same environment: importing the
+    # package (best of 3 fresh interpreters) should be faster than importing numpy alone
+    code = """
+import time
+start = time.perf_counter()
+import {}
+print(time.perf_counter() - start)
+"""
+    lazy = min(float(_run_fresh(code.format("neurokit2"))[0]) for _ in range(3))
+    numpy = min(float(_run_fresh(code.format("numpy"))[0]) for _ in range(3))
+    assert lazy < numpy
+
+
+def test_import_exports():
+
+    # The generated export table must be in sync with the submodules
+    for name in nk.__all__:
+        assert callable(getattr(nk, name))
+    for submodule in nk._exports.SUBMODULES:
+        for name in importlib.import_module("neurokit2." + submodule).__all__:
+            assert name in nk.__all__
+
+    # Functions are not shadowed by their homonymous submodules
+    import neurokit2.hrv.hrv  # pylint: disable=W0611,C0415
+    import neurokit2.ecg.ecg_peaks  # pylint: disable=W0611,C0415
+
+    assert callable(nk.hrv)
+    assert callable(nk.ecg.ecg_peaks)
+    assert nk.ecg_rate is nk.signal_rate
@@ -42,6 +42,11 @@ def test_ppg_simulate(duration, sampling_rate, heart_rate, freq_modulation):
     signals, _ = nk.ppg_process(ppg, sampling_rate=sampling_rate)
     assert np.allclose(signals["PPG_Rate"].mean(), heart_rate, atol=1)
 
+    signals_rate, info_rate = nk.ppg_process(ppg, sampling_rate=sampling_rate, steps=["rate"])
+    assert list(signals_rate.columns) == ["PPG_Raw", "PPG_Clean", "PPG_Rate"]
+    assert "PPG_Peaks" in info_rate
+    assert np.allclose(signals_rate["PPG_Rate"], signals["PPG_Rate"])
+
     # Ensure that the heart rate fluctuates in the requested range.
     groundtruth_range = freq_modulation * heart_rate
     observed_range = np.percentile(signals['PPG_Rate'], 90) - np.percentile(signals['PPG_Rate'], 10)
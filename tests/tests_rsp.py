@@ -121,6 +121,10 @@ def test_rsp_process():
         in signals.columns.values
     )
 
+    signals, info = nk.rsp_process(rsp, sampling_rate=1000, steps=["rate"])
+    assert list(signals.columns) == ["RSP_Raw", "RSP_Clean", "RSP_Rate"]
+    assert "RSP_Peaks" in info
+
 
 def test_rsp_plot():
 
@@ -7,6 +7,7 @@ import pytest
 import scipy.signal
 
 import neurokit2 as nk
+from neurokit2.signal.signal_psd import _signal_psd_lomb_fast
 
 # =============================================================================
 # Signal
@@ -308,6 +309,30 @@ def test_signal_psd(recwarn):
     assert recwarn.pop(nk.misc.NeuroKitWarning)
 
 
+def test_signal_psd_lomb():
+    signal = nk.signal_simulate(duration=10, frequency=5) + 0.5 * nk.signal_simulate(duration=10, frequency=20)
+    psd = nk.signal_psd(signal, sampling_rate=1000, method="lomb", min_frequency=1)
+    assert np.isclose(psd["Frequency"][psd["Power"].idxmax()], 5, atol=0.05)
+    assert np.isclose(psd["Power"][np.abs(psd["Frequency"] - 20) < 0.05].max(), 0.25, atol=0.01)
+
+    # Unevenly sampled signals (floating-mean periodogram, i.e., the reduction of the residual sum of
+    # squares of the least-squares fit of a sinusoid and an intercept)
+    rng = np.random.RandomState(42)
+    t = np.cumsum(rng.uniform(0.6, 1, size=(2, 200)), axis=1)
+    y = np.sin(2 * np.pi * 0.1 * t) + rng.normal(0, 0.5, size=t.shape) + 800
+    y[1, 150:] = np.nan  # Signals of different lengths
+    frequency = 0.01 + 0.001 * np.arange(400)
+    power = _signal_psd_lomb_fast(t, y, 0.01, 0.001, 400)
+
+    for i, n in enumerate([200, 150]):
+        expected = np.zeros(len(frequency))
+        for j, f in enumerate(frequency):
+            X = np.column_stack([np.ones(n), np.cos(2 * np.pi * f * t[i, :n]), np.sin(2 * np.pi * f * t[i, :n])])
+            rss = np.linalg.lstsq(X, y[i, :n], rcond=None)[1][0]
+            expected[j] = 0.5 * (np.sum((y[i, :n] - np.mean(y[i, :n])) ** 2) - rss)
+        assert np.allclose(power[i], expected, rtol=0, atol=1e-4 * np.max(expected))
+
+
 def test_signal_distort():
     signal = nk.signal_simulate(duration=10, frequency=0.5, sampling_rate=10)
 
@@ -223,3 +223,19 @@ def test_missed_correction_wrapper(peaks_correct, peaks_missed, iterative, rmssd
     rmssd_diff_corrected = np.abs(rmssd_correct - rmssd_corrected)
 
     assert int(rmssd_diff_uncorrected - rmssd_diff_corrected) == rmssd_diff
+
+
+@pytest.mark.parametrize("peaks_misaligned", [4], indirect=["peaks_misaligned"])
+def test_find_artifacts_previous(peaks_misaligned, peaks_extra):
+
+    # Thresholds updated from other peaks are the same as if they were computed from scratch.
+    for previous_peaks in [peaks_misaligned, peaks_extra]:
+        artifacts, subspaces = _find_artifacts(previous_peaks, sampling_rate=1)
+        peaks = _correct_artifacts(artifacts, previous_peaks)
+
+        artifacts_full, subspaces_full = _find_artifacts(peaks, sampling_rate=1)
+        artifacts_updated, subspaces_updated = _find_artifacts(peaks, sampling_rate=1, previous=subspaces)
+
+        assert artifacts_full == artifacts_updated
+        for key in ["drrs", "mrrs", "s12", "s22"]:
+            assert np.array_equal(subspaces_full[key], subspaces_updated[key], equal_nan=True)